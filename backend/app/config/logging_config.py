@@ -0,0 +1,134 @@
+"""
+Logging Configuration
+Structured (JSON) logs written off the request path:
+
+- every logger hands its records to a QueueHandler, which only enqueues
+- a QueueListener thread per process formats them and does the actual I/O
+- records carry the request_id and user_id of the request that logged them
+  (ContextVars set by AccessLogMiddleware)
+
+LOG_FORMAT=json|text, LOG_LEVEL, LOG_FILE (optional, in addition to stdout).
+DB_ECHO=true sends SQLAlchemy statements through the same queue.
+
+Usage:
+    from app.config.logging_config import configure_logging
+    configure_logging()
+"""
+
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+import copy
+import json
+import logging
+import os
+import queue
+import sys
+
+from app.config.settings import get_settings
+
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+user_id_var: ContextVar[Optional[int]] = ContextVar("user_id", default=None)
+
+# Attributes every LogRecord has; anything else was passed through `extra=`
+_STANDARD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+class ContextQueueHandler(QueueHandler):
+    """
+    Enqueues records stamped with the current request context
+    The message and traceback are rendered here, in the caller's thread, so
+    the listener never touches request objects or argument values.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.msg = record.message
+        record.args = None
+        record.exc_info = None
+        if getattr(record, "request_id", None) is None:
+            record.request_id = request_id_var.get()
+        if getattr(record, "user_id", None) is None:
+            record.user_id = user_id_var.get()
+        return record
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line: timestamp, level, logger, message, context and extras"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _STANDARD_ATTRS and value is not None:
+                entry[key] = value
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+TEXT_FORMAT = "%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s"
+
+_queue = queue.SimpleQueue()
+_listener: Optional[QueueListener] = None
+_listener_pid: Optional[int] = None
+
+
+def _output_handlers(settings) -> list[logging.Handler]:
+    formatter = JSONFormatter() if settings.log_format.lower() == "json" else logging.Formatter(TEXT_FORMAT)
+    handlers = [logging.StreamHandler(sys.stdout)]
+    if settings.log_file:
+        handlers.append(logging.FileHandler(settings.log_file))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    return handlers
+
+
+def configure_logging():
+    """
+    Route the root logger through the queue and (re)start this process's listener
+    Safe to call repeatedly; after a fork the child gets its own listener thread.
+    """
+    global _listener, _listener_pid
+    settings = get_settings()
+
+    root = logging.getLogger()
+    if not any(isinstance(handler, ContextQueueHandler) for handler in root.handlers):
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        root.addHandler(ContextQueueHandler(_queue))
+        root.setLevel(settings.log_level.upper())
+        if settings.db_echo:
+            logging.getLogger("sqlalchemy.engine").setLevel(logging.INFO)
+
+    # Servers install their own handlers when they start (possibly after the app was built):
+    # uvicorn's access log is replaced by AccessLogMiddleware, its error log joins the queue
+    logging.getLogger("uvicorn.access").disabled = True
+    for name in ("uvicorn", "uvicorn.error", "gunicorn.error"):
+        logging.getLogger(name).handlers.clear()
+        logging.getLogger(name).propagate = True
+
+    if _listener_pid != os.getpid():
+        # A listener copied by fork has no thread behind it; start a fresh one
+        _listener = QueueListener(_queue, *_output_handlers(settings), respect_handler_level=True)
+        _listener.start()
+        _listener_pid = os.getpid()
+
+
+def stop_logging():
+    """Flush queued records and stop the listener thread"""
+    global _listener, _listener_pid
+    if _listener is not None and _listener_pid == os.getpid():
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+    _listener = None
+    _listener_pid = None
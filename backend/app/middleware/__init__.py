@@ -0,0 +1,2 @@
+# Middleware module
+# Pure ASGI middleware registered in main.py
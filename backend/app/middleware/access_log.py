@@ -0,0 +1,109 @@
+"""
+Access Log Middleware
+One structured log record per request: request_id, method, path, route
+template, status, latency, response size and user_id.
+
+- The request ID comes from an incoming X-Request-ID header (when it looks
+  sane) or is generated, and is echoed back on the response
+- request_id / user_id are stored in ContextVars, so every record logged
+  while handling the request carries them
+- High-volume routes are sampled (ACCESS_LOG_SAMPLE_RULES); slow requests
+  and 5xx responses are always logged
+"""
+
+from typing import Optional
+import logging
+import random
+import re
+import time
+import uuid
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from app.config.logging_config import request_id_var, user_id_var
+from app.config.settings import get_settings
+from app.routes.auth import user_id_from_authorization
+
+logger = logging.getLogger("shareit.access")
+
+_REQUEST_ID = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+
+def parse_sample_rules(raw: str) -> list[tuple[str, float]]:
+    """"/a=0.1,/b=0" -> [("/a", 0.1), ("/b", 0.0)] (path prefixes, longest first)"""
+    rules = []
+    for part in raw.split(","):
+        if "=" not in part:
+            continue
+        path, rate = part.rsplit("=", 1)
+        rules.append((path.strip(), min(max(float(rate), 0.0), 1.0)))
+    return sorted(rules, key=lambda rule: len(rule[0]), reverse=True)
+
+
+class AccessLogMiddleware:
+    """Assigns request IDs and logs each completed request"""
+
+    def __init__(self, app):
+        self.app = app
+        settings = get_settings()
+        self.enabled = settings.access_log_enabled
+        self.default_rate = settings.access_log_sample_rate
+        self.rules = parse_sample_rules(settings.access_log_sample_rules)
+        self.slow_ms = settings.access_log_slow_ms
+
+    def _sample_rate(self, path: str) -> float:
+        for prefix, rate in self.rules:
+            if path.startswith(prefix):
+                return rate
+        return self.default_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        incoming = headers.get("x-request-id", "")
+        request_id = incoming if _REQUEST_ID.match(incoming) else uuid.uuid4().hex
+        user_id: Optional[int] = user_id_from_authorization(headers.get("authorization"))
+        request_token = request_id_var.set(request_id)
+        user_token = user_id_var.set(user_id)
+
+        started = time.perf_counter()
+        status_code = 500
+        response_bytes = 0
+
+        async def wrapped(message):
+            nonlocal status_code, response_bytes
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message)["X-Request-ID"] = request_id
+            elif message["type"] == "http.response.body":
+                response_bytes += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, wrapped)
+        finally:
+            if self.enabled:
+                latency_ms = (time.perf_counter() - started) * 1000
+                always = status_code >= 500 or latency_ms >= self.slow_ms
+                rate = self._sample_rate(scope["path"])
+                if always or rate >= 1.0 or random.random() < rate:
+                    route = scope.get("route")  # Set by the router once a route matched
+                    client = scope.get("client")
+                    logger.info(
+                        "%s %s %s", scope["method"], scope["path"], status_code,
+                        extra={
+                            "method": scope["method"],
+                            "path": scope["path"],
+                            "route": getattr(route, "path", None),
+                            "status": status_code,
+                            "latency_ms": round(latency_ms, 2),
+                            "bytes": response_bytes,
+                            "client_ip": client[0] if client else None,
+                            "sample_rate": rate if not always else 1.0,
+                        },
+                    )
+            request_id_var.reset(request_token)
+            user_id_var.reset(user_token)
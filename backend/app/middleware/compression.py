@@ -0,0 +1,183 @@
+"""
+Response Compression Middleware
+gzip or brotli (preferred when the `brotli` package is installed and the
+client accepts it) for responses above a size threshold.
+
+- Single-body responses smaller than COMPRESSION_MIN_SIZE are sent as-is
+- Streaming responses are compressed chunk by chunk, with a flush after
+  each chunk so clients receive data as soon as it is produced
+- Paths in COMPRESSION_EXCLUDE_PATHS (default /uploads) and already
+  compressed content types (images, archives, ...) are never touched
+"""
+
+from typing import Optional
+import zlib
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from app.config.settings import get_settings
+
+try:
+    import brotli
+except ImportError:  # brotli is optional, gzip is always available
+    brotli = None
+
+settings = get_settings()
+COMPRESSION_ENABLED = settings.compression_enabled
+COMPRESSION_MIN_SIZE = settings.compression_min_size
+COMPRESSION_GZIP_LEVEL = settings.compression_gzip_level
+COMPRESSION_BROTLI_QUALITY = settings.compression_brotli_quality
+COMPRESSION_EXCLUDE_PATHS = tuple(
+    path.strip() for path in settings.compression_exclude_paths.split(",") if path.strip()
+)
+
+# Content types that are already compressed
+INCOMPRESSIBLE_TYPES = ("image/", "video/", "audio/", "application/zip", "application/gzip", "font/woff")
+
+
+class GzipStream:
+    """Incremental gzip encoder"""
+
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # 31 = gzip container
+
+    def chunk(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush()
+
+
+class BrotliStream:
+    """Incremental brotli encoder"""
+
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def chunk(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.process(data) + self._compressor.finish()
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick "br" or "gzip" from an Accept-Encoding header, None for identity"""
+    accepted = {}
+    for part in accept_encoding.lower().split(","):
+        token, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if token:
+            accepted[token] = quality
+
+    wildcard = accepted.get("*", 0.0)
+    if brotli is not None and accepted.get("br", wildcard) > 0:
+        return "br"
+    if accepted.get("gzip", wildcard) > 0:
+        return "gzip"
+    return None
+
+
+def new_stream(encoding: str):
+    if encoding == "br":
+        return BrotliStream(COMPRESSION_BROTLI_QUALITY)
+    return GzipStream(COMPRESSION_GZIP_LEVEL)
+
+
+class CompressionMiddleware:
+    """Compress HTTP responses according to the client's Accept-Encoding"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if (
+            not COMPRESSION_ENABLED
+            or scope["type"] != "http"
+            or scope["path"].startswith(COMPRESSION_EXCLUDE_PATHS)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = CompressionResponder(send, encoding)
+        await self.app(scope, receive, responder.send)
+
+
+class CompressionResponder:
+    """Per-request `send` wrapper deciding whether and how to compress"""
+
+    def __init__(self, send, encoding: str):
+        self._send = send
+        self.encoding = encoding
+        self.start_message = None
+        self.stream = None  # Set once we are compressing a streamed body
+        self.passthrough = False
+
+    def _compressible(self) -> bool:
+        headers = Headers(raw=self.start_message["headers"])
+        if "content-encoding" in headers or self.start_message["status"] in (204, 304):
+            return False
+        content_type = headers.get("content-type", "")
+        return not content_type.startswith(INCOMPRESSIBLE_TYPES)
+
+    def _mark_encoded(self, content_length: Optional[int]):
+        headers = MutableHeaders(scope=self.start_message)
+        headers["content-encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        if content_length is None:
+            del headers["content-length"]
+        else:
+            headers["content-length"] = str(content_length)
+
+    async def send(self, message):
+        if self.passthrough:
+            await self._send(message)
+            return
+
+        if message["type"] == "http.response.start":
+            self.start_message = message
+            return
+
+        if message["type"] != "http.response.body":
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.stream is not None:
+            # Continuing a streamed body
+            data = self.stream.chunk(body) if more_body else self.stream.finish(body)
+            await self._send({"type": "http.response.body", "body": data, "more_body": more_body})
+            return
+
+        # First body message - decide what to do with this response
+        if not self._compressible() or (not more_body and len(body) < COMPRESSION_MIN_SIZE):
+            self.passthrough = True
+            await self._send(self.start_message)
+            await self._send(message)
+            return
+
+        stream = new_stream(self.encoding)
+        if not more_body:
+            data = stream.finish(body)
+            self._mark_encoded(len(data))
+            await self._send(self.start_message)
+            await self._send({"type": "http.response.body", "body": data})
+            return
+
+        self.stream = stream
+        self._mark_encoded(None)
+        await self._send(self.start_message)
+        await self._send({"type": "http.response.body", "body": stream.chunk(body), "more_body": True})
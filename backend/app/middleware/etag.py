@@ -0,0 +1,190 @@
+"""
+ETag / Conditional GET Middleware
+
+Two ways of producing a validator for GET requests:
+
+1. Versioned routes (VERSIONED_ROUTES): the ETag is derived from per-user
+   version counters (app.services.versioning). If the client's
+   If-None-Match matches, a 304 is sent without calling the route at all.
+   Only when the counters see every write (Redis, or a single worker);
+   otherwise these routes use 2.
+2. Every other GET: the response body is hashed and a 304 replaces the body
+   when it matches. This saves bandwidth but still runs the route.
+   Streamed responses (no Content-Length, e.g. StreamingResponse) are passed
+   through untouched, so CompressionMiddleware can compress them chunk by chunk.
+
+ETags are weak (W/) so they stay valid across gzip/brotli encodings.
+"""
+
+from typing import Optional
+import hashlib
+import re
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from app.config.settings import get_settings
+
+from app.routes.auth import user_id_from_authorization
+from app.services.versioning import (
+    version_store,
+    validators_enabled,
+    ALL_ITEMS_KEY,
+    bookings_key,
+    wallet_key,
+    lender_items_version_key,
+)
+
+ETAG_ENABLED = get_settings().etag_enabled
+ETAG_MAX_BODY_BYTES = get_settings().etag_max_body_bytes  # Larger bodies are not hashed
+
+
+# (path pattern, needs auth, match + user_id -> version keys)
+VERSIONED_ROUTES = [
+    (re.compile(r"^/bookings/?$"), True, lambda m, uid: [bookings_key(uid), ALL_ITEMS_KEY]),
+    (re.compile(r"^/bookings/pending/?$"), True, lambda m, uid: [bookings_key(uid), ALL_ITEMS_KEY]),
+    (re.compile(r"^/wallet/balance/?$"), True, lambda m, uid: [wallet_key(uid)]),
+    (re.compile(r"^/items/lender/(\d+)/?$"), False, lambda m, uid: [lender_items_version_key(int(m.group(1)))]),
+]
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against our ETag"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    ours = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == ours:
+            return True
+    return False
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=12).hexdigest()
+
+
+class ETagMiddleware:
+    """Adds ETags to GET responses and answers matching If-None-Match with 304"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if not ETAG_ENABLED or scope["type"] != "http" or scope["method"] not in ("GET", "HEAD"):
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        if_none_match = headers.get("if-none-match")
+
+        versioned = self._versioned_etag(scope["path"], headers)
+        if versioned is not None:
+            etag, cache_control = versioned
+            if _etag_matches(if_none_match, etag):
+                await self._send_not_modified(send, etag, cache_control)
+                return
+            await self.app(scope, receive, self._tagging_send(send, etag, cache_control))
+            return
+
+        if scope["method"] == "HEAD":
+            await self.app(scope, receive, send)  # No body to hash
+            return
+        await self._hash_response(scope, receive, send, if_none_match)
+
+    def _versioned_etag(self, path: str, headers: Headers):
+        """
+        ETag for a versioned route, or None if the path isn't versioned, the
+        token is invalid or counters aren't shared by all workers
+        """
+        if not validators_enabled():
+            return None
+        for pattern, needs_auth, resolve in VERSIONED_ROUTES:
+            match = pattern.match(path)
+            if not match:
+                continue
+            user_id = user_id_from_authorization(headers.get("authorization"))
+            if needs_auth and user_id is None:
+                return None  # Let the route produce its 401
+            keys = resolve(match, user_id)
+            versions = version_store.get_many(keys)
+            fingerprint = ";".join(f"{key}={version}" for key, version in zip(keys, versions))
+            etag = f'W/"{version_store.epoch}-{_digest(fingerprint.encode())}"'
+            return etag, "private, no-cache" if needs_auth else "no-cache"
+        return None
+
+    @staticmethod
+    async def _send_not_modified(send, etag: str, cache_control: Optional[str] = None):
+        headers = [(b"etag", etag.encode("latin-1"))]
+        if cache_control:
+            headers.append((b"cache-control", cache_control.encode("latin-1")))
+        await send({"type": "http.response.start", "status": 304, "headers": headers})
+        await send({"type": "http.response.body", "body": b""})
+
+    @staticmethod
+    def _tagging_send(send, etag: str, cache_control: str):
+        """Wrap `send` so a 200 response carries the versioned ETag"""
+        async def wrapped(message):
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                response_headers = MutableHeaders(scope=message)
+                response_headers["etag"] = etag
+                response_headers.setdefault("cache-control", cache_control)
+                response_headers.add_vary_header("Authorization")
+            await send(message)
+        return wrapped
+
+    async def _hash_response(self, scope, receive, send, if_none_match: Optional[str]):
+        """Buffer a small 200 response of known length, tag it with a body hash and turn matches into 304"""
+        start_message = None
+        chunks = []
+        size = 0
+        passthrough = False
+
+        async def wrapped(message):
+            nonlocal start_message, size, passthrough
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                response_headers = Headers(raw=message["headers"])
+                if message["status"] != 200 or "etag" in response_headers:
+                    passthrough = True  # Errors and responses that manage their own ETag (StaticFiles)
+                    await send(message)
+                    return
+                if "content-length" not in response_headers:
+                    passthrough = True  # Streamed: buffering would defeat chunked compression
+                    await send(message)
+                    return
+                start_message = message
+                return
+
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            chunks.append(body)
+            size += len(body)
+
+            if message.get("more_body", False):
+                if size > ETAG_MAX_BODY_BYTES:
+                    # Too big to hold on to - stream the rest without an ETag
+                    passthrough = True
+                    await send(start_message)
+                    await send({"type": "http.response.body", "body": b"".join(chunks), "more_body": True})
+                return
+
+            full_body = b"".join(chunks)
+            etag = f'W/"{_digest(full_body)}"'
+            if _etag_matches(if_none_match, etag):
+                await self._send_not_modified(send, etag)
+                return
+            MutableHeaders(scope=start_message)["etag"] = etag
+            await send(start_message)
+            await send({"type": "http.response.body", "body": full_body})
+
+        await self.app(scope, receive, wrapped)
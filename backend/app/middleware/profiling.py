@@ -0,0 +1,101 @@
+"""
+SQL Profiling Middleware
+Off by default. With SQL_PROFILING=header only requests sending
+`X-Profile-SQL: 1` with an admin's bearer token are profiled (the header is
+ignored for anyone else, so timings and query counts don't leak);
+SQL_PROFILING=all profiles every request.
+
+Profiled responses carry a Server-Timing header with the SQL time and
+statement count. Requests slower than SQL_SLOW_REQUEST_MS are logged with
+their statements and an EXPLAIN of the slowest one, and show up under
+/admin/profiling.
+"""
+
+import time
+
+from fastapi.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+
+from app.config.database import SessionLocal
+from app.config.settings import get_settings
+from app.models.user import RoleEnum, User
+from app.routes.auth import user_id_from_authorization
+from app.services.profiling import (
+    RequestProfile,
+    current_profile,
+    explain,
+    install,
+    log_slow_request,
+    profile_store,
+)
+
+PROFILE_HEADER = "x-profile-sql"
+
+
+def _is_admin(user_id: int) -> bool:
+    """Same check as require_admin (app/routes/admin.py), outside a request's session"""
+    db = SessionLocal()
+    try:
+        return db.query(User.role).filter(User.user_id == user_id).scalar() == RoleEnum.ADMIN
+    finally:
+        db.close()
+
+
+class SQLProfilingMiddleware:
+    """Attaches a RequestProfile to profiled requests and records the outcome"""
+
+    def __init__(self, app):
+        self.app = app
+        settings = get_settings()
+        self.mode = settings.sql_profiling.lower()
+        self.slow_ms = settings.sql_slow_request_ms
+        if self.mode != "off":
+            install()
+
+    async def _wanted(self, scope) -> bool:
+        if self.mode == "all":
+            return True
+        if self.mode == "header":
+            headers = Headers(scope=scope)
+            if headers.get(PROFILE_HEADER, "").lower() not in ("1", "true", "yes"):
+                return False
+            user_id = user_id_from_authorization(headers.get("authorization"))
+            return user_id is not None and await run_in_threadpool(_is_admin, user_id)
+        return False
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not await self._wanted(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile(method=scope["method"], path=scope["path"])
+        token = current_profile.set(profile)
+        status_code = 500
+
+        async def wrapped(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                # Statements run before the response starts, so the totals are final here
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Server-Timing",
+                    f'db;dur={profile.sql_ms:.2f};desc="{len(profile.queries)} queries"',
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, wrapped)
+        finally:
+            current_profile.reset(token)
+            duration_ms = (time.perf_counter() - profile.started_at) * 1000
+            route = scope.get("route")  # Set by the router once a route matched
+            profile.route = getattr(route, "path", None)
+
+            slow = duration_ms >= self.slow_ms
+            plan = None
+            if slow and profile.queries:
+                plan = await run_in_threadpool(explain, profile.slowest())
+            entry = profile_store.record(profile, duration_ms, status_code, slow, plan)
+            if entry is not None:
+                log_slow_request(entry)
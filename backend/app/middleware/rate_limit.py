@@ -0,0 +1,199 @@
+"""
+Rate Limiting Middleware
+Token-bucket limits per route, keyed by the caller's user_id (from the
+bearer token) or client IP. A request that finds its bucket empty gets a
+429 with Retry-After and never reaches the route (or argon2).
+
+Backends:
+- memory: per-process buckets (each worker enforces the limit separately)
+- redis: buckets shared by every worker, updated atomically by a Lua script
+
+Rules default to DEFAULT_RULES; RATE_LIMIT_RULES may hold a JSON list of
+{"method", "path", "rate", "per", "burst", "key"} objects to replace them.
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+import json
+import math
+import re
+import threading
+import time
+
+from fastapi.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+
+from app.config.settings import get_settings
+from app.routes.auth import user_id_from_authorization
+
+
+@dataclass
+class RateLimitRule:
+    """`rate` requests per `per` seconds, bursts of up to `burst`"""
+    method: str
+    path: str  # Regex matched against the full request path
+    rate: float
+    per: float = 60.0
+    burst: Optional[int] = None  # Defaults to `rate`
+    key: str = "user_or_ip"  # user_or_ip | ip
+
+    def __post_init__(self):
+        self.method = self.method.upper()
+        self.pattern = re.compile(self.path)
+        self.refill_per_second = self.rate / self.per
+        self.capacity = self.burst if self.burst is not None else max(int(self.rate), 1)
+        self.name = f"{self.method}:{self.path}"
+
+
+DEFAULT_RULES = [
+    RateLimitRule("POST", r"^/auth/login/?$", rate=10, per=60, burst=5, key="ip"),
+    RateLimitRule("POST", r"^/auth/register/?$", rate=5, per=60, burst=3, key="ip"),
+    RateLimitRule("POST", r"^/api/uploads/images/?$", rate=30, per=60, burst=10),
+    RateLimitRule("POST", r"^/bookings/?$", rate=30, per=60, burst=10),
+]
+
+
+class MemoryBucketStore:
+    """Buckets in process memory"""
+
+    def __init__(self, max_keys: int = 100_000):
+        self._buckets = {}  # key -> (tokens, updated_at)
+        self._lock = threading.Lock()
+        self.max_keys = max_keys
+
+    def take(self, key: str, rule: RateLimitRule) -> tuple[bool, float, float]:
+        """Try to take one token. Returns (allowed, tokens left, seconds until a token is available)"""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (rule.capacity, now))
+            tokens = min(rule.capacity, tokens + (now - updated_at) * rule.refill_per_second)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_keys:
+                self._prune(now)
+        retry_after = 0.0 if allowed else (1 - tokens) / rule.refill_per_second
+        return allowed, tokens, retry_after
+
+    def _prune(self, now: float):
+        """Drop buckets idle for an hour - they are full again and hold no state worth keeping"""
+        self._buckets = {
+            key: (tokens, updated_at)
+            for key, (tokens, updated_at) in self._buckets.items()
+            if now - updated_at < 3600
+        }
+
+
+TOKEN_BUCKET_LUA = """
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local refill = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * refill)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / refill) + 1)
+return {allowed, tostring(tokens)}
+"""
+
+
+class RedisBucketStore:
+    """Buckets shared through a Redis-protocol server"""
+
+    def __init__(self, url: Optional[str] = None, client=None, namespace: str = "shareit:ratelimit:"):
+        if client is None:
+            try:
+                import redis
+            except ImportError as e:
+                raise RuntimeError("RATE_LIMIT_BACKEND=redis requires the 'redis' package") from e
+            client = redis.Redis.from_url(url or "redis://localhost:6379/0")
+        self.client = client
+        self.namespace = namespace
+        self._script = client.register_script(TOKEN_BUCKET_LUA)
+
+    def take(self, key: str, rule: RateLimitRule) -> tuple[bool, float, float]:
+        allowed, tokens = self._script(
+            keys=[self.namespace + key],
+            args=[rule.refill_per_second, rule.capacity, time.time()],
+        )
+        tokens = float(tokens)
+        retry_after = 0.0 if allowed else (1 - tokens) / rule.refill_per_second
+        return bool(allowed), tokens, retry_after
+
+
+def load_rules(raw: str) -> list[RateLimitRule]:
+    if not raw.strip():
+        return DEFAULT_RULES
+    return [RateLimitRule(**rule) for rule in json.loads(raw)]
+
+
+class RateLimitMiddleware:
+    """Applies the first matching rule to each request"""
+
+    def __init__(self, app):
+        self.app = app
+        settings = get_settings()
+        self.enabled = settings.rate_limit_enabled
+        self.rules = load_rules(settings.rate_limit_rules)
+        self.trust_forwarded = settings.rate_limit_trust_forwarded
+        self.shared = settings.rate_limit_backend.lower() == "redis"
+        self.store = RedisBucketStore(url=settings.redis_url) if self.shared else MemoryBucketStore()
+
+    def _match(self, method: str, path: str) -> Optional[RateLimitRule]:
+        for rule in self.rules:
+            if rule.method == method and rule.pattern.match(path):
+                return rule
+        return None
+
+    def _client_ip(self, scope, headers: Headers) -> str:
+        if self.trust_forwarded:
+            forwarded = headers.get("x-forwarded-for")
+            if forwarded:
+                return forwarded.split(",")[0].strip()
+        client = scope.get("client")
+        return client[0] if client else "unknown"
+
+    async def __call__(self, scope, receive, send):
+        if not self.enabled or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        rule = self._match(scope["method"], scope["path"])
+        if rule is None:
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        user_id = None if rule.key == "ip" else user_id_from_authorization(headers.get("authorization"))
+        identity = f"user:{user_id}" if user_id is not None else f"ip:{self._client_ip(scope, headers)}"
+        bucket_key = f"{rule.name}:{identity}"
+
+        if self.shared:
+            allowed, tokens, retry_after = await run_in_threadpool(self.store.take, bucket_key, rule)
+        else:
+            allowed, tokens, retry_after = self.store.take(bucket_key, rule)
+
+        if allowed:
+            await self.app(scope, receive, send)
+            return
+
+        body = json.dumps({"detail": "Too many requests, please retry later"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(max(1, math.ceil(retry_after))).encode()),
+                (b"x-ratelimit-limit", str(rule.capacity).encode()),
+                (b"x-ratelimit-remaining", b"0"),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
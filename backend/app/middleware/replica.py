@@ -0,0 +1,37 @@
+"""
+Read-Your-Writes Middleware
+After a successful write request (POST/PUT/PATCH/DELETE) by an
+authenticated user, their reads are pinned to the primary database for a
+few seconds so replica lag never hides their own changes.
+"""
+
+from starlette.datastructures import Headers
+
+from app.config.database import replica_router
+from app.routes.auth import user_id_from_authorization
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+class ReadYourWritesMiddleware:
+    """Records writers with the replica router"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS or not replica_router.engines:
+            await self.app(scope, receive, send)
+            return
+
+        user_id = user_id_from_authorization(Headers(scope=scope).get("authorization"))
+        if user_id is None:
+            await self.app(scope, receive, send)
+            return
+
+        async def wrapped(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                replica_router.note_write(user_id)
+            await send(message)
+
+        await self.app(scope, receive, wrapped)
@@ -0,0 +1,50 @@
+"""
+Tracing Middleware
+Opens a SERVER span per request, continuing the trace from an incoming W3C
+`traceparent` header when there is one. The span is renamed to the matched
+route template ("PATCH /bookings/{booking_id}") once routing has happened,
+and the response carries a `traceresponse` header with the trace context.
+"""
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from app.services.tracing import instrument_sql, parse_traceparent, tracer
+
+
+class TracingMiddleware:
+    """Server span around each HTTP request"""
+
+    def __init__(self, app):
+        self.app = app
+        instrument_sql()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not tracer.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        remote = parse_traceparent(headers.get("traceparent"))
+        attributes = {
+            "http.method": scope["method"],
+            "http.target": scope["path"],
+            "http.scheme": scope.get("scheme", "http"),
+        }
+
+        with tracer.start_as_current_span(f"{scope['method']} {scope['path']}", kind="SERVER",
+                                          attributes=attributes, parent=remote) as span:
+            async def wrapped(message):
+                if message["type"] == "http.response.start":
+                    span.set_attribute("http.status_code", message["status"])
+                    if message["status"] >= 500:
+                        span.set_status("ERROR")
+                    MutableHeaders(scope=message)["traceresponse"] = span.get_span_context().traceparent()
+                await send(message)
+
+            try:
+                await self.app(scope, receive, wrapped)
+            finally:
+                route = scope.get("route")  # Set by the router once a route matched
+                if route is not None:
+                    span.update_name(f"{scope['method']} {route.path}")
+                    span.set_attribute("http.route", route.path)
@@ -0,0 +1,160 @@
+"""
+Schema Migrations
+Small Alembic-style migration runner. Schema changes live in numbered
+modules under app/migrations/versions/ and are applied by `manage.py migrate`,
+never at application startup.
+
+Each version module defines:
+    revision       - "0001", "0002", ... (applied in order)
+    description    - one line shown by `manage.py migrate history`
+    transactional  - False for steps that can't run in a transaction
+                     (CREATE INDEX CONCURRENTLY); they run in autocommit mode
+    upgrade(conn)  - performs the change
+
+Applied revisions are recorded in the schema_migrations table.
+"""
+
+from datetime import datetime
+from types import ModuleType
+from typing import Optional
+import importlib
+import pkgutil
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+from app.migrations import versions
+
+MIGRATIONS_TABLE = "schema_migrations"
+ADVISORY_LOCK_ID = 72_410_031  # Serializes concurrent `migrate upgrade` runs on PostgreSQL
+
+
+def load_migrations() -> list[ModuleType]:
+    """Import every version module, sorted by revision"""
+    modules = [
+        importlib.import_module(f"{versions.__name__}.{info.name}")
+        for info in pkgutil.iter_modules(versions.__path__)
+        if not info.name.startswith("_")
+    ]
+    modules.sort(key=lambda module: module.revision)
+    revisions = [module.revision for module in modules]
+    if len(set(revisions)) != len(revisions):
+        raise RuntimeError(f"Duplicate migration revisions: {revisions}")
+    return modules
+
+
+def _ensure_table(conn: Connection):
+    conn.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {MIGRATIONS_TABLE} ("
+        "version VARCHAR(32) PRIMARY KEY, "
+        "applied_at TIMESTAMP NOT NULL)"
+    ))
+
+
+def applied_revisions(engine: Engine) -> set:
+    """Revisions already recorded in schema_migrations"""
+    with engine.begin() as conn:
+        _ensure_table(conn)
+        return {row[0] for row in conn.execute(text(f"SELECT version FROM {MIGRATIONS_TABLE}"))}
+
+
+def _record(conn: Connection, revision: str):
+    conn.execute(
+        text(f"INSERT INTO {MIGRATIONS_TABLE} (version, applied_at) VALUES (:version, :applied_at)"),
+        {"version": revision, "applied_at": datetime.utcnow()},
+    )
+
+
+def upgrade(engine: Engine, target: Optional[str] = None, log=print) -> list[str]:
+    """
+    Apply pending migrations up to and including `target` (default: latest)
+
+    Returns:
+        Revisions applied by this call
+    """
+    applied_now = []
+    with engine.connect() as lock_conn:
+        is_postgres = engine.dialect.name == "postgresql"
+        if is_postgres:
+            lock_conn.execute(text("SELECT pg_advisory_lock(:id)"), {"id": ADVISORY_LOCK_ID})
+            lock_conn.commit()
+        try:
+            done = applied_revisions(engine)
+            for migration in load_migrations():
+                if target is not None and migration.revision > target:
+                    break
+                if migration.revision in done:
+                    continue
+
+                log(f"Applying {migration.revision}: {migration.description}")
+                if getattr(migration, "transactional", True):
+                    with engine.begin() as conn:
+                        migration.upgrade(conn)
+                        _record(conn, migration.revision)
+                else:
+                    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+                        migration.upgrade(conn)
+                        _record(conn, migration.revision)
+                applied_now.append(migration.revision)
+        finally:
+            if is_postgres:
+                lock_conn.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": ADVISORY_LOCK_ID})
+                lock_conn.commit()
+    return applied_now
+
+
+def pending_revisions(engine: Engine) -> list[str]:
+    done = applied_revisions(engine)
+    return [migration.revision for migration in load_migrations() if migration.revision not in done]
+
+
+# ============ Helpers for version modules ============
+
+def create_index(
+    conn: Connection,
+    name: str,
+    table: str,
+    columns: list[str],
+    where: Optional[str] = None,
+    unique: bool = False,
+    concurrently: bool = True,
+):
+    """
+    Create an index without blocking writes on PostgreSQL
+
+    Uses CREATE INDEX CONCURRENTLY there (the calling migration must set
+    transactional = False). A previous failed concurrent build leaves an
+    INVALID index behind, which is dropped and rebuilt. Other databases get
+    a plain CREATE INDEX IF NOT EXISTS.
+    """
+    is_postgres = conn.dialect.name == "postgresql"
+    concurrently = concurrently and is_postgres
+
+    if is_postgres:
+        invalid = conn.execute(text(
+            "SELECT 1 FROM pg_class c JOIN pg_index i ON i.indexrelid = c.oid "
+            "WHERE c.relname = :name AND NOT i.indisvalid"
+        ), {"name": name}).first()
+        if invalid:
+            conn.execute(text(f"DROP INDEX {'CONCURRENTLY ' if concurrently else ''}IF EXISTS {name}"))
+
+    stmt = (
+        f"CREATE {'UNIQUE ' if unique else ''}INDEX {'CONCURRENTLY ' if concurrently else ''}"
+        f"IF NOT EXISTS {name} ON {table} ({', '.join(columns)})"
+    )
+    if where:
+        stmt += f" WHERE {where}"
+    conn.execute(text(stmt))
+
+
+def add_column(conn: Connection, table: str, column: str, ddl: str):
+    """
+    ALTER TABLE ... ADD COLUMN, skipped when the column already exists
+    `ddl` is the column type and options, e.g. "TIMESTAMP NULL". Adding a
+    nullable column without a default is a metadata-only change on PostgreSQL.
+    """
+    from sqlalchemy import inspect
+
+    existing = {col["name"] for col in inspect(conn).get_columns(table)}
+    if column not in existing:
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
@@ -0,0 +1,2 @@
+# Migration versions
+# One module per revision, named v<revision>_<slug>.py
@@ -0,0 +1,107 @@
+"""
+0001 - Initial schema
+Snapshot of the tables that main.py used to create with Base.metadata.create_all.
+Tables that already exist are left untouched, so databases created before
+migrations were introduced are adopted as-is.
+"""
+
+from datetime import datetime
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0001"
+description = "Initial schema (users, wallet, items, bookings, transactions, disputes)"
+transactional = True
+
+metadata = sa.MetaData()
+
+role_enum = sa.Enum("BORROWER", "LENDER", "ADMIN", name="roleenum")
+item_status_enum = sa.Enum("AVAILABLE", "RENTED", "DISPUTE", "INACTIVE", name="itemstatusenum")
+booking_status_enum = sa.Enum(
+    "PENDING", "ACCEPTED", "REJECTED", "AWAITING_PICKUP", "PICKED_UP", "RETURN_PENDING", "RETURNED",
+    name="bookingstatusenum",
+)
+tx_type_enum = sa.Enum("DEPOSIT", "REFUND", "PENALTY", "WITHDRAWAL", "TOPUP", "EARNING", name="transactiontypeenum")
+dispute_status_enum = sa.Enum("OPEN", "RESOLVED", "REJECTED", name="disputestatusenum")
+
+users = sa.Table(
+    "users", metadata,
+    sa.Column("user_id", sa.Integer, primary_key=True, index=True),
+    sa.Column("full_name", sa.String(100), nullable=False),
+    sa.Column("email", sa.String(120), unique=True, index=True, nullable=False),
+    sa.Column("password_hash", sa.String, nullable=False),
+    sa.Column("phone", sa.String(20), nullable=True),
+    sa.Column("address", sa.String(150), nullable=True),
+    sa.Column("role", role_enum, nullable=False),
+    sa.Column("created_at", sa.DateTime, default=datetime.utcnow),
+)
+
+wallet = sa.Table(
+    "wallet", metadata,
+    sa.Column("wallet_id", sa.Integer, primary_key=True, index=True),
+    sa.Column("user_id", sa.Integer, sa.ForeignKey("users.user_id"), nullable=False, unique=True, index=True),
+    sa.Column("balance", sa.Numeric(10, 2), nullable=False),
+    sa.Column("created_at", sa.DateTime),
+)
+
+items = sa.Table(
+    "items", metadata,
+    sa.Column("item_id", sa.Integer, primary_key=True, index=True),
+    sa.Column("lender_id", sa.Integer, sa.ForeignKey("users.user_id"), nullable=False, index=True),
+    sa.Column("title", sa.String(120), nullable=False),
+    sa.Column("description", sa.Text, nullable=True),
+    sa.Column("condition", sa.String(20), nullable=False),
+    sa.Column("estimated_price", sa.Numeric(10, 2), nullable=False),
+    sa.Column("min_days", sa.Integer, nullable=False),
+    sa.Column("max_days", sa.Integer, nullable=False),
+    sa.Column("daily_deposit", sa.Numeric(10, 2), nullable=False),
+    sa.Column("images", postgresql.ARRAY(sa.String).with_variant(sa.JSON, "sqlite"), nullable=True),
+    sa.Column("location", sa.String(150), nullable=True),
+    sa.Column("is_active", sa.Boolean, index=True),
+    sa.Column("status", item_status_enum, index=True),
+    sa.Column("created_at", sa.DateTime),
+)
+
+bookings = sa.Table(
+    "bookings", metadata,
+    sa.Column("booking_id", sa.Integer, primary_key=True, index=True),
+    sa.Column("item_id", sa.Integer, sa.ForeignKey("items.item_id"), nullable=False, index=True),
+    sa.Column("borrower_id", sa.Integer, sa.ForeignKey("users.user_id"), nullable=False, index=True),
+    sa.Column("lender_id", sa.Integer, sa.ForeignKey("users.user_id"), nullable=False, index=True),
+    sa.Column("start_date", sa.Date, nullable=False),
+    sa.Column("end_date", sa.Date, nullable=False),
+    sa.Column("total_deposit", sa.Numeric(10, 2), nullable=False),
+    sa.Column("status", booking_status_enum, index=True),
+    sa.Column("reason", sa.String(255), nullable=True),
+    sa.Column("created_at", sa.DateTime),
+)
+
+transactions = sa.Table(
+    "transactions", metadata,
+    sa.Column("tx_id", sa.Integer, primary_key=True, index=True),
+    sa.Column("user_id", sa.Integer, sa.ForeignKey("users.user_id"), nullable=False, index=True),
+    sa.Column("wallet_id", sa.Integer, sa.ForeignKey("wallet.wallet_id"), nullable=True, index=True),
+    sa.Column("booking_id", sa.Integer, sa.ForeignKey("bookings.booking_id"), nullable=True, index=True),
+    sa.Column("amount", sa.Numeric(10, 2), nullable=False),
+    sa.Column("tx_type", tx_type_enum, nullable=False),
+    sa.Column("description", sa.String(255), nullable=True),
+    sa.Column("created_at", sa.DateTime, index=True),
+)
+
+disputes = sa.Table(
+    "disputes", metadata,
+    sa.Column("dispute_id", sa.Integer, primary_key=True, index=True),
+    sa.Column("booking_id", sa.Integer, sa.ForeignKey("bookings.booking_id"), nullable=False, unique=True, index=True),
+    sa.Column("raised_by", sa.Integer, sa.ForeignKey("users.user_id"), nullable=False, index=True),
+    sa.Column("description", sa.Text, nullable=False),
+    sa.Column("estimated_cost", sa.Numeric(10, 2), nullable=True),
+    sa.Column("status", dispute_status_enum, index=True),
+    sa.Column("resolution_notes", sa.Text, nullable=True),
+    sa.Column("created_at", sa.DateTime),
+    sa.Column("resolved_at", sa.DateTime, nullable=True),
+)
+
+
+def upgrade(conn):
+    metadata.create_all(conn, checkfirst=True)
@@ -0,0 +1,19 @@
+"""
+0002 - Composite indexes for the hot read paths
+Built with CREATE INDEX CONCURRENTLY so existing tables stay writable.
+"""
+
+from app.migrations import create_index
+
+revision = "0002"
+description = "Composite indexes for pending bookings, wallet history and lender items"
+transactional = False
+
+
+def upgrade(conn):
+    # GET /bookings/pending: lender's bookings filtered by status
+    create_index(conn, "ix_bookings_lender_status", "bookings", ["lender_id", "status"])
+    # GET /wallet/balance and /wallet/transactions: newest transactions of a wallet
+    create_index(conn, "ix_transactions_wallet_created", "transactions", ["wallet_id", "created_at DESC"])
+    # GET /items/lender/{lender_id}: a lender's active items
+    create_index(conn, "ix_items_lender_active", "items", ["lender_id", "is_active"])
@@ -0,0 +1,21 @@
+"""
+0003 - Partial index for the admin dispute queue
+Only OPEN disputes are indexed, so the index stays small as disputes are resolved.
+"""
+
+from app.migrations import create_index
+
+revision = "0003"
+description = "Partial index on open disputes ordered by age"
+transactional = False
+
+
+def upgrade(conn):
+    # GET /admin/disputes: open disputes, oldest first, keyset-paginated on (created_at, dispute_id)
+    create_index(
+        conn,
+        "ix_disputes_open_created",
+        "disputes",
+        ["created_at", "dispute_id"],
+        where="status = 'OPEN'",
+    )
@@ -0,0 +1,16 @@
+"""
+0004 - Dispute settlement columns
+settled_at marks disputes whose money has been moved by the settlement engine;
+penalty_amount is the part of the deposit awarded to the lender.
+"""
+
+from app.migrations import add_column
+
+revision = "0004"
+description = "Add disputes.settled_at and disputes.penalty_amount"
+transactional = True
+
+
+def upgrade(conn):
+    add_column(conn, "disputes", "settled_at", "TIMESTAMP NULL")
+    add_column(conn, "disputes", "penalty_amount", "NUMERIC(10, 2) NULL")
@@ -0,0 +1,52 @@
+"""
+0005 - lender_stats table
+Denormalized per-lender counters, backfilled here from the existing rows.
+From then on the routes keep them up to date (app/services/lender_stats.py).
+"""
+
+from datetime import datetime
+
+import sqlalchemy as sa
+
+revision = "0005"
+description = "Create and backfill lender_stats"
+transactional = True
+
+metadata = sa.MetaData()
+
+users = sa.Table("users", metadata, sa.Column("user_id", sa.Integer, primary_key=True))
+
+lender_stats = sa.Table(
+    "lender_stats", metadata,
+    sa.Column("lender_id", sa.Integer, sa.ForeignKey("users.user_id", ondelete="CASCADE"), primary_key=True),
+    sa.Column("item_count", sa.Integer, nullable=False, server_default="0"),
+    sa.Column("active_item_count", sa.Integer, nullable=False, server_default="0"),
+    sa.Column("rental_count", sa.Integer, nullable=False, server_default="0"),
+    sa.Column("completed_rental_count", sa.Integer, nullable=False, server_default="0"),
+    sa.Column("total_earnings", sa.Numeric(14, 2), nullable=False, server_default="0"),
+    sa.Column("dispute_count", sa.Integer, nullable=False, server_default="0"),
+    sa.Column("updated_at", sa.DateTime),
+)
+
+BACKFILL = """
+INSERT INTO lender_stats (lender_id, item_count, active_item_count, rental_count,
+                          completed_rental_count, total_earnings, dispute_count, updated_at)
+SELECT u.user_id,
+       (SELECT COUNT(*) FROM items i WHERE i.lender_id = u.user_id),
+       (SELECT COUNT(*) FROM items i WHERE i.lender_id = u.user_id AND i.is_active = :active),
+       (SELECT COUNT(*) FROM bookings b WHERE b.lender_id = u.user_id
+           AND b.status IN ('ACCEPTED', 'AWAITING_PICKUP', 'PICKED_UP', 'RETURN_PENDING', 'RETURNED')),
+       (SELECT COUNT(*) FROM bookings b WHERE b.lender_id = u.user_id AND b.status = 'RETURNED'),
+       COALESCE((SELECT SUM(t.amount) FROM transactions t WHERE t.user_id = u.user_id AND t.tx_type = 'EARNING'), 0),
+       (SELECT COUNT(*) FROM disputes d JOIN bookings b ON b.booking_id = d.booking_id WHERE b.lender_id = u.user_id),
+       :now
+FROM users u
+WHERE EXISTS (SELECT 1 FROM items i WHERE i.lender_id = u.user_id)
+   OR EXISTS (SELECT 1 FROM bookings b WHERE b.lender_id = u.user_id)
+"""
+
+
+def upgrade(conn):
+    lender_stats.create(conn, checkfirst=True)
+    conn.execute(sa.text("DELETE FROM lender_stats"))
+    conn.execute(sa.text(BACKFILL), {"active": True, "now": datetime.utcnow()})
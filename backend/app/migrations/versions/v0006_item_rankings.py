@@ -0,0 +1,38 @@
+"""
+0006 - Item rankings and recommendations
+Filled by `python manage.py rankings rebuild` (empty until the first run).
+"""
+
+import sqlalchemy as sa
+
+revision = "0006"
+description = "Create item_rankings and item_recommendations"
+transactional = True
+
+metadata = sa.MetaData()
+
+items = sa.Table("items", metadata, sa.Column("item_id", sa.Integer, primary_key=True))
+
+item_rankings = sa.Table(
+    "item_rankings", metadata,
+    sa.Column("item_id", sa.Integer, sa.ForeignKey("items.item_id", ondelete="CASCADE"), primary_key=True),
+    sa.Column("score", sa.Float, nullable=False),
+    sa.Column("recent_bookings", sa.Integer, nullable=False),
+    sa.Column("acceptance_rate", sa.Float, nullable=False),
+    sa.Column("computed_at", sa.DateTime),
+)
+sa.Index("ix_item_rankings_score", item_rankings.c.score.desc())
+
+item_recommendations = sa.Table(
+    "item_recommendations", metadata,
+    sa.Column("item_id", sa.Integer, sa.ForeignKey("items.item_id", ondelete="CASCADE"), primary_key=True),
+    sa.Column("rank", sa.Integer, primary_key=True),
+    sa.Column("recommended_item_id", sa.Integer, sa.ForeignKey("items.item_id", ondelete="CASCADE"), nullable=False),
+    sa.Column("score", sa.Float, nullable=False),
+    sa.Column("computed_at", sa.DateTime),
+)
+
+
+def upgrade(conn):
+    item_rankings.create(conn, checkfirst=True)
+    item_recommendations.create(conn, checkfirst=True)
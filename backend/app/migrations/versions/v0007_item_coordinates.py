@@ -0,0 +1,20 @@
+"""
+0007 - Item coordinates
+Optional latitude/longitude on items plus a geohash column indexed for
+proximity search. Existing items keep NULL coordinates and stay out of the
+(partial) index until their lender sets a position.
+"""
+
+from app.migrations import add_column, create_index
+
+revision = "0007"
+description = "Add items.latitude, items.longitude and geohash index"
+transactional = False
+
+
+def upgrade(conn):
+    add_column(conn, "items", "latitude", "DOUBLE PRECISION NULL")
+    add_column(conn, "items", "longitude", "DOUBLE PRECISION NULL")
+    add_column(conn, "items", "geohash", "VARCHAR(12) NULL")
+    # GET /items/nearby: one range scan per covering geohash cell
+    create_index(conn, "ix_items_geohash", "items", ["geohash"], where="geohash IS NOT NULL")
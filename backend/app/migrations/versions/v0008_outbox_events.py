@@ -0,0 +1,40 @@
+"""
+0008 - Transactional outbox
+Events are inserted alongside booking changes and drained by the outbox worker.
+The partial index only holds pending events, so it stays small however many
+delivered events are kept around.
+"""
+
+import sqlalchemy as sa
+
+revision = "0008"
+description = "Create outbox_events"
+transactional = True
+
+metadata = sa.MetaData()
+
+outbox_events = sa.Table(
+    "outbox_events", metadata,
+    sa.Column("event_id", sa.Integer, primary_key=True),
+    sa.Column("event_type", sa.String(50), nullable=False),
+    sa.Column("aggregate_id", sa.Integer),
+    sa.Column("payload", sa.JSON, nullable=False),
+    sa.Column("status", sa.String(10), nullable=False, server_default="pending"),
+    sa.Column("attempts", sa.Integer, nullable=False, server_default="0"),
+    sa.Column("available_at", sa.DateTime, nullable=False),
+    sa.Column("last_error", sa.Text),
+    sa.Column("created_at", sa.DateTime),
+    sa.Column("processed_at", sa.DateTime),
+)
+sa.Index(
+    "ix_outbox_events_pending",
+    outbox_events.c.available_at,
+    outbox_events.c.event_id,
+    postgresql_where=outbox_events.c.status == "pending",
+    sqlite_where=outbox_events.c.status == "pending",
+)
+
+
+def upgrade(conn):
+    # New, empty table: a plain CREATE INDEX (with the table) doesn't block anyone
+    outbox_events.create(conn, checkfirst=True)
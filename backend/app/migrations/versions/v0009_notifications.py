@@ -0,0 +1,42 @@
+"""
+0009 - Notification queue
+Rows are queued by the outbox handlers for booking events and delivered in
+per-user digests. The partial index only holds undelivered rows.
+"""
+
+import sqlalchemy as sa
+
+revision = "0009"
+description = "Create notifications"
+transactional = True
+
+metadata = sa.MetaData()
+
+users = sa.Table("users", metadata, sa.Column("user_id", sa.Integer, primary_key=True))
+
+notifications = sa.Table(
+    "notifications", metadata,
+    sa.Column("notification_id", sa.Integer, primary_key=True),
+    sa.Column("user_id", sa.Integer, sa.ForeignKey("users.user_id", ondelete="CASCADE"), nullable=False),
+    sa.Column("kind", sa.String(40), nullable=False),
+    sa.Column("payload", sa.JSON, nullable=False),
+    sa.Column("status", sa.String(10), nullable=False, server_default="pending"),
+    sa.Column("attempts", sa.Integer, nullable=False, server_default="0"),
+    sa.Column("send_after", sa.DateTime, nullable=False),
+    sa.Column("claimed_at", sa.DateTime),
+    sa.Column("last_error", sa.Text),
+    sa.Column("created_at", sa.DateTime),
+    sa.Column("sent_at", sa.DateTime),
+)
+sa.Index(
+    "ix_notifications_queue",
+    notifications.c.status,
+    notifications.c.send_after,
+    notifications.c.user_id,
+    postgresql_where=notifications.c.status.in_(["pending", "sending"]),
+    sqlite_where=notifications.c.status.in_(["pending", "sending"]),
+)
+
+
+def upgrade(conn):
+    notifications.create(conn, checkfirst=True)
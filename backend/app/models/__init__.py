@@ -6,5 +6,12 @@ from app.models.item import Item
 from app.models.booking import Booking
 from app.models.transaction import Transaction
 from app.models.dispute import Dispute
+from app.models.lender_stats import LenderStats
+from app.models.ranking import ItemRanking, ItemRecommendation
+from app.models.outbox import OutboxEvent
+from app.models.notification import Notification
 
-__all__ = ["User", "Wallet", "Item", "Booking", "Transaction", "Dispute"]
+__all__ = [
+    "User", "Wallet", "Item", "Booking", "Transaction", "Dispute", "LenderStats",
+    "ItemRanking", "ItemRecommendation", "OutboxEvent", "Notification",
+]
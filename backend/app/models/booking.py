@@ -3,7 +3,7 @@ Booking Model (Database Table)
 Represents a borrow request from borrower to lender
 """
 
-from sqlalchemy import Column, Integer, Date, Numeric, String, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, Integer, Date, Numeric, String, DateTime, ForeignKey, Enum, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
@@ -56,3 +56,7 @@ class Booking(Base):
 
     def __repr__(self):
         return f"<Booking {self.booking_id}: Item {self.item_id} - {self.status}>"
+
+
+# Composite index for a lender's bookings by status (migration 0002)
+Index("ix_bookings_lender_status", Booking.lender_id, Booking.status)
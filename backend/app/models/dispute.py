@@ -4,7 +4,7 @@ Records disputes between borrowers and lenders
 Admins review and resolve these
 """
 
-from sqlalchemy import Column, Integer, Text, Numeric, String, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, Integer, Text, Numeric, String, DateTime, ForeignKey, Enum, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
@@ -37,6 +37,10 @@ class Dispute(Base):
     status = Column(Enum(DisputeStatusEnum), default=DisputeStatusEnum.OPEN, index=True)
     resolution_notes = Column(Text, nullable=True)  # Admin's decision and notes
 
+    # Settlement (migration 0004)
+    penalty_amount = Column(Numeric(10, 2), nullable=True)  # Part of the deposit awarded to the lender
+    settled_at = Column(DateTime, nullable=True)  # When deposits/penalties were applied to the wallets
+
     # Timestamps
     created_at = Column(DateTime, default=datetime.utcnow)
     resolved_at = Column(DateTime, nullable=True)  # When admin resolved it
@@ -47,3 +51,13 @@ class Dispute(Base):
 
     def __repr__(self):
         return f"<Dispute {self.dispute_id}: {self.status}>"
+
+
+# Partial index for the admin review queue: open disputes, oldest first (migration 0003)
+Index(
+    "ix_disputes_open_created",
+    Dispute.created_at,
+    Dispute.dispute_id,
+    postgresql_where=Dispute.status == DisputeStatusEnum.OPEN,
+    sqlite_where=Dispute.status == DisputeStatusEnum.OPEN,
+)
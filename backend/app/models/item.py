@@ -3,7 +3,7 @@ Item Model (Database Table)
 Represents items that lenders offer for borrowing
 """
 
-from sqlalchemy import Column, Integer, String, Text, Numeric, Boolean, DateTime, ForeignKey, ARRAY, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, Text, Numeric, Float, Boolean, DateTime, ForeignKey, ARRAY, JSON, Index, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from enum import Enum
@@ -40,8 +40,11 @@ class Item(Base):
     daily_deposit = Column(Numeric(10, 2), nullable=False)  # Deposit per day
 
     # Images and Location
-    images = Column(ARRAY(String), nullable=True)  # Array of image URLs
+    images = Column(ARRAY(String).with_variant(JSON, "sqlite"), nullable=True)  # Array of image URLs (JSON on SQLite)
     location = Column(String(150), nullable=True)  # City or area
+    latitude = Column(Float, nullable=True)  # Optional coordinates for GET /items/nearby
+    longitude = Column(Float, nullable=True)
+    geohash = Column(String(12), nullable=True)  # Derived from latitude/longitude (app/services/geo.py)
 
     # Availability
     is_active = Column(Boolean, default=True, index=True)  # Can be borrowed or disabled
@@ -56,3 +59,15 @@ class Item(Base):
 
     def __repr__(self):
         return f"<Item {self.item_id}: {self.title}>"
+
+
+# A lender's active items (migration 0002)
+Index("ix_items_lender_active", Item.lender_id, Item.is_active)
+
+# Geohash prefix range scans for GET /items/nearby (migration 0007)
+Index(
+    "ix_items_geohash",
+    Item.geohash,
+    postgresql_where=Item.geohash.isnot(None),
+    sqlite_where=Item.geohash.isnot(None),
+)
@@ -0,0 +1,41 @@
+"""
+Lender Stats Model (Database Table)
+Denormalized per-lender counters for dashboards and trust signals
+Kept up to date incrementally by app/services/lender_stats.py in the same
+transactions that change items, bookings, earnings and disputes
+"""
+
+from sqlalchemy import Column, Integer, Numeric, DateTime, ForeignKey
+from datetime import datetime
+from app.config.database import Base
+
+
+class LenderStats(Base):
+    """
+    Lender stats table - one row per lender (created on first change)
+    """
+    __tablename__ = "lender_stats"
+
+    lender_id = Column(Integer, ForeignKey("users.user_id", ondelete="CASCADE"), primary_key=True)
+
+    # Items
+    item_count = Column(Integer, nullable=False, default=0)  # Every item listed
+    active_item_count = Column(Integer, nullable=False, default=0)  # Items not disabled
+
+    # Rentals
+    rental_count = Column(Integer, nullable=False, default=0)  # Bookings accepted (deposit paid)
+    completed_rental_count = Column(Integer, nullable=False, default=0)  # Bookings returned
+    total_earnings = Column(Numeric(14, 2), nullable=False, default=0)  # Sum of EARNING transactions
+
+    # Disputes
+    dispute_count = Column(Integer, nullable=False, default=0)  # Disputes on the lender's bookings
+
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+    @property
+    def dispute_rate(self) -> float:
+        """Disputes per accepted rental"""
+        return round(self.dispute_count / self.rental_count, 4) if self.rental_count else 0.0
+
+    def __repr__(self):
+        return f"<LenderStats {self.lender_id}: {self.item_count} items, {self.rental_count} rentals>"
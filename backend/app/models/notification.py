@@ -0,0 +1,52 @@
+"""
+Notification Model (Database Table)
+Persistent queue of user notifications, coalesced into per-user digests and
+delivered by the notification dispatcher (app/services/notifications.py)
+"""
+
+from sqlalchemy import Column, Integer, String, Text, DateTime, JSON, ForeignKey, Index
+from datetime import datetime
+from app.config.database import Base
+
+PENDING = "pending"
+SENDING = "sending"  # Claimed by a dispatcher; reclaimed if it stays here past the lease
+SENT = "sent"
+FAILED = "failed"  # Gave up after NOTIFICATIONS_MAX_ATTEMPTS
+
+
+class Notification(Base):
+    """
+    Notification table - one row per thing a user should hear about
+    Rows of the same user that are pending together go out as one message.
+    """
+    __tablename__ = "notifications"
+
+    notification_id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.user_id", ondelete="CASCADE"), nullable=False)
+    kind = Column(String(40), nullable=False)  # booking_requested | booking_accepted | booking_rejected
+    payload = Column(JSON, nullable=False)  # What the message shows, captured when queued
+
+    # Delivery state
+    status = Column(String(10), nullable=False, default=PENDING)
+    attempts = Column(Integer, nullable=False, default=0)
+    send_after = Column(DateTime, nullable=False, default=datetime.utcnow)  # End of the digest window / retry backoff
+    claimed_at = Column(DateTime, nullable=True)
+    last_error = Column(Text, nullable=True)
+
+    # Timestamps
+    created_at = Column(DateTime, default=datetime.utcnow)
+    sent_at = Column(DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<Notification {self.notification_id}: {self.kind} -> {self.user_id} ({self.status})>"
+
+
+# The dispatcher's queue: undelivered rows by due time (migration 0009)
+Index(
+    "ix_notifications_queue",
+    Notification.status,
+    Notification.send_after,
+    Notification.user_id,
+    postgresql_where=Notification.status.in_([PENDING, SENDING]),
+    sqlite_where=Notification.status.in_([PENDING, SENDING]),
+)
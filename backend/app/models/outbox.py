@@ -0,0 +1,49 @@
+"""
+Outbox Model (Database Table)
+Events written in the same transaction as the change that caused them and
+delivered afterwards by the outbox worker (app/services/outbox.py)
+"""
+
+from sqlalchemy import Column, Integer, String, Text, DateTime, JSON, Index
+from datetime import datetime
+from app.config.database import Base
+
+PENDING = "pending"
+DONE = "done"
+FAILED = "failed"  # Gave up after OUTBOX_MAX_ATTEMPTS
+
+
+class OutboxEvent(Base):
+    """
+    Outbox table - one row per event, delivered at least once to every handler
+    subscribed to its event_type
+    """
+    __tablename__ = "outbox_events"
+
+    event_id = Column(Integer, primary_key=True)
+    event_type = Column(String(50), nullable=False)  # e.g. "booking.created"
+    aggregate_id = Column(Integer, nullable=True)  # Row the event is about (booking_id, ...)
+    payload = Column(JSON, nullable=False)
+
+    # Delivery state
+    status = Column(String(10), nullable=False, default=PENDING)  # pending | done | failed
+    attempts = Column(Integer, nullable=False, default=0)
+    available_at = Column(DateTime, nullable=False, default=datetime.utcnow)  # Not picked up before this (retry backoff)
+    last_error = Column(Text, nullable=True)
+
+    # Timestamps
+    created_at = Column(DateTime, default=datetime.utcnow)
+    processed_at = Column(DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<OutboxEvent {self.event_id}: {self.event_type} ({self.status})>"
+
+
+# The worker's poll: pending events that are due, oldest first (migration 0008)
+Index(
+    "ix_outbox_events_pending",
+    OutboxEvent.available_at,
+    OutboxEvent.event_id,
+    postgresql_where=OutboxEvent.status == PENDING,
+    sqlite_where=OutboxEvent.status == PENDING,
+)
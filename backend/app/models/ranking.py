@@ -0,0 +1,45 @@
+"""
+Ranking Models (Database Tables)
+Precomputed item popularity and "also booked" recommendations
+Rewritten wholesale by the batch job in app/services/recommendations.py
+"""
+
+from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey, Index
+from datetime import datetime
+from app.config.database import Base
+
+
+class ItemRanking(Base):
+    """
+    Item popularity - one row per item booked within the ranking window
+    """
+    __tablename__ = "item_rankings"
+
+    item_id = Column(Integer, ForeignKey("items.item_id", ondelete="CASCADE"), primary_key=True)
+    score = Column(Float, nullable=False)  # Higher = more popular
+    recent_bookings = Column(Integer, nullable=False)  # Bookings in the window
+    acceptance_rate = Column(Float, nullable=False)  # Smoothed share of decided bookings accepted
+    computed_at = Column(DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<ItemRanking {self.item_id}: {self.score:.3f}>"
+
+
+class ItemRecommendation(Base):
+    """
+    "Borrowers who booked X also booked Y" - top-N neighbours per item
+    """
+    __tablename__ = "item_recommendations"
+
+    item_id = Column(Integer, ForeignKey("items.item_id", ondelete="CASCADE"), primary_key=True)
+    rank = Column(Integer, primary_key=True)  # 1 = strongest
+    recommended_item_id = Column(Integer, ForeignKey("items.item_id", ondelete="CASCADE"), nullable=False)
+    score = Column(Float, nullable=False)  # Cosine similarity of the two items' borrower sets
+    computed_at = Column(DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<ItemRecommendation {self.item_id} -> {self.recommended_item_id}>"
+
+
+# GET /items/popular reads the top of this index (migration 0006)
+Index("ix_item_rankings_score", ItemRanking.score.desc())
@@ -3,7 +3,7 @@ Transaction Model (Database Table)
 Records all financial transactions (deposits, refunds, penalties)
 """
 
-from sqlalchemy import Column, Integer, Numeric, String, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, Integer, Numeric, String, DateTime, ForeignKey, Enum, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
@@ -47,3 +47,7 @@ class Transaction(Base):
 
     def __repr__(self):
         return f"<Transaction {self.tx_id}: {self.tx_type} ${self.amount}>"
+
+
+# Newest-first history of a wallet (migration 0002)
+Index("ix_transactions_wallet_created", Transaction.wallet_id, Transaction.created_at.desc())
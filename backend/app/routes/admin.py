@@ -0,0 +1,431 @@
+"""
+Admin Routes
+Endpoints for administrators: the dispute review queue, SQL profiling,
+item cache, request coalescing, outbox and notification stats
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, status, Header, Query
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Session, joinedload
+from datetime import datetime
+from decimal import Decimal
+from typing import Optional
+import base64
+
+from app.config.database import get_db, get_read_db
+from app.config.settings import get_settings
+from app.models.booking import Booking
+from app.models.dispute import Dispute, DisputeStatusEnum
+from app.models.user import User, RoleEnum
+from app.routes.auth import verify_token
+from app.schemas.dispute import (
+    DisputeQueueEntry,
+    DisputeQueuePage,
+    DisputeSettle,
+    DisputeSettleBatch,
+    DisputeSettleBatchResponse,
+    SettlementResponse,
+)
+from app.services import notifications, outbox, singleflight
+from app.services.cache import item_cache
+from app.services.profiling import profile_store
+from app.services.settlement import (
+    SettlementDecision,
+    SettlementError,
+    settle_many,
+    settle_one,
+    unsettled_decisions,
+)
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+ORDER_FIELDS = ("total_ms", "avg_ms", "max_ms", "count", "slow", "avg_queries")
+
+
+# ============ Helper Functions ============
+
+def get_current_user_id(authorization: str = Header(None)):
+    """Extract user ID from Bearer token"""
+    if not authorization:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
+
+    try:
+        scheme, token = authorization.split()
+        if scheme.lower() != "bearer":
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid auth scheme")
+        user_id = verify_token(token)
+        return int(user_id)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token format")
+    except HTTPException:
+        raise
+    except Exception:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+
+
+def require_admin(
+    current_user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db),
+) -> int:
+    """Allow only users with the ADMIN role; returns their user ID"""
+    role = db.query(User.role).filter(User.user_id == current_user_id).scalar()
+    if role != RoleEnum.ADMIN:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
+    return current_user_id
+
+
+def encode_cursor(created_at: datetime, dispute_id: int) -> str:
+    """Opaque keyset cursor for the position after (created_at, dispute_id)"""
+    raw = f"{created_at.isoformat()}|{dispute_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, dispute_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(dispute_id)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def queue_entry(dispute: Dispute) -> DisputeQueueEntry:
+    """Dispute plus its (already loaded) booking, item and parties"""
+    booking = dispute.booking
+    return DisputeQueueEntry(
+        dispute_id=dispute.dispute_id,
+        booking_id=dispute.booking_id,
+        raised_by=dispute.raised_by,
+        description=dispute.description,
+        estimated_cost=dispute.estimated_cost,
+        status=dispute.status,
+        resolution_notes=dispute.resolution_notes,
+        created_at=dispute.created_at,
+        resolved_at=dispute.resolved_at,
+        booking={
+            "booking_id": booking.booking_id,
+            "status": booking.status,
+            "start_date": booking.start_date,
+            "end_date": booking.end_date,
+            "total_deposit": booking.total_deposit,
+            "item_id": booking.item_id,
+            "item_title": booking.item.title if booking.item else None,
+        },
+        borrower=booking.borrower,
+        lender=booking.lender,
+    )
+
+
+def settlement_decision(dispute_id: int, body: DisputeSettle) -> SettlementDecision:
+    """Validate request fields into a SettlementDecision"""
+    outcome = None
+    if body.status is not None:
+        try:
+            outcome = DisputeStatusEnum(body.status.lower())
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid status: {body.status}")
+    return SettlementDecision(
+        dispute_id=dispute_id,
+        status=outcome,
+        penalty_amount=Decimal(str(body.penalty_amount)) if body.penalty_amount is not None else None,
+        resolution_notes=body.resolution_notes,
+    )
+
+
+# ============ Dispute Queue ============
+
+@router.get("/disputes", response_model=DisputeQueuePage)
+def dispute_queue(
+    status_filter: DisputeStatusEnum = Query(DisputeStatusEnum.OPEN, alias="status"),
+    min_cost: Optional[float] = Query(None, ge=0),
+    max_cost: Optional[float] = Query(None, ge=0),
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    admin_id: int = Depends(require_admin),
+    db: Session = Depends(get_read_db),
+):
+    """
+    Disputes awaiting review, oldest first, with booking, item and both parties
+
+    Args:
+        status_filter: Dispute status to list (default: open)
+        min_cost: Only disputes claiming at least this much
+        max_cost: Only disputes claiming at most this much
+        cursor: next_cursor from the previous page
+        limit: Page size
+        admin_id: Current admin's ID from token
+        db: Database session
+
+    Returns:
+        DisputeQueuePage with the disputes and the cursor for the next page
+    """
+    # One SELECT: every relationship here is many-to-one, so joinedload can't multiply rows
+    query = (
+        db.query(Dispute)
+        .options(
+            joinedload(Dispute.booking).joinedload(Booking.item),
+            joinedload(Dispute.booking).joinedload(Booking.borrower),
+            joinedload(Dispute.booking).joinedload(Booking.lender),
+        )
+        .filter(Dispute.status == status_filter)
+    )
+    if min_cost is not None:
+        query = query.filter(Dispute.estimated_cost >= min_cost)
+    if max_cost is not None:
+        query = query.filter(Dispute.estimated_cost <= max_cost)
+    if cursor:
+        # Keyset pagination: for open disputes this walks ix_disputes_open_created
+        query = query.filter(tuple_(Dispute.created_at, Dispute.dispute_id) > decode_cursor(cursor))
+
+    disputes = query.order_by(Dispute.created_at, Dispute.dispute_id).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(disputes) > limit:
+        disputes = disputes[:limit]
+        last = disputes[-1]
+        next_cursor = encode_cursor(last.created_at, last.dispute_id)
+
+    return DisputeQueuePage(disputes=[queue_entry(d) for d in disputes], next_cursor=next_cursor)
+
+
+# ============ Dispute Settlement ============
+
+@router.post("/disputes/settle", response_model=DisputeSettleBatchResponse)
+def settle_disputes(
+    batch: DisputeSettleBatch,
+    admin_id: int = Depends(require_admin),
+    db: Session = Depends(get_db),
+):
+    """
+    Settle many disputes in one call (weekly sweep)
+
+    Args:
+        batch: Explicit decisions and/or include_unsettled to pick up every
+               resolved/rejected dispute whose money hasn't moved yet;
+               max_disputes can lower, never raise, SETTLE_MAX_DISPUTES
+        admin_id: Current admin's ID from token
+        db: Database session
+
+    Returns:
+        Per-dispute results; failures don't stop the rest of the batch
+    """
+    max_disputes = get_settings().settle_max_disputes
+    if batch.max_disputes is not None:
+        max_disputes = min(batch.max_disputes, max_disputes)
+    decisions = [settlement_decision(d.dispute_id, d) for d in batch.decisions]
+    if len(decisions) > max_disputes:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {max_disputes} disputes per call"
+        )
+    if batch.include_unsettled:
+        explicit = {d.dispute_id for d in decisions}
+        room = max_disputes - len(decisions)
+        decisions += [d for d in unsettled_decisions(db, room + len(explicit)) if d.dispute_id not in explicit][:room]
+
+    results = settle_many(db, decisions)
+    settled = sum(1 for r in results if r.settled)
+    return DisputeSettleBatchResponse(
+        settled=settled,
+        failed=len(results) - settled,
+        results=[SettlementResponse.model_validate(r) for r in results],
+    )
+
+
+@router.post("/disputes/{dispute_id}/settle", response_model=SettlementResponse)
+def settle_dispute(
+    dispute_id: int,
+    body: DisputeSettle,
+    admin_id: int = Depends(require_admin),
+    db: Session = Depends(get_db),
+):
+    """
+    Settle one dispute: apply the outcome to both wallets, close the booking
+    and free the item, all in one locked transaction
+
+    Args:
+        dispute_id: Dispute ID
+        body: Outcome, optional penalty override and notes
+        admin_id: Current admin's ID from token
+        db: Database session
+
+    Returns:
+        SettlementResponse with the penalty kept and the amount refunded
+    """
+    try:
+        result = settle_one(db, settlement_decision(dispute_id, body))
+    except SettlementError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    return SettlementResponse.model_validate(result)
+
+
+# ============ SQL Profiling ============
+
+@router.get("/profiling/routes")
+def slow_routes(
+    limit: int = Query(20, ge=1, le=200),
+    order_by: str = Query("total_ms", enum=list(ORDER_FIELDS)),
+    admin_id: int = Depends(require_admin),
+):
+    """
+    Profiled routes, slowest first
+
+    Args:
+        limit: Number of routes to return
+        order_by: Field to sort by (total_ms, avg_ms, max_ms, count, slow, avg_queries)
+        admin_id: Current admin's ID from token
+
+    Returns:
+        List of per-route timing and query-count totals
+    """
+    return profile_store.top_routes(limit, order_by)
+
+
+@router.get("/profiling/queries")
+def slow_queries(
+    limit: int = Query(20, ge=1, le=200),
+    order_by: str = Query("total_ms", enum=list(ORDER_FIELDS[:4])),
+    admin_id: int = Depends(require_admin),
+):
+    """
+    Statements executed by profiled requests, slowest first
+
+    Args:
+        limit: Number of statements to return
+        order_by: Field to sort by (total_ms, avg_ms, max_ms, count)
+        admin_id: Current admin's ID from token
+
+    Returns:
+        List of per-statement timing totals
+    """
+    return profile_store.top_statements(limit, order_by)
+
+
+@router.get("/profiling/slow-requests")
+def slow_requests(
+    limit: int = Query(20, ge=1, le=50),
+    admin_id: int = Depends(require_admin),
+):
+    """
+    Most recent requests over the slow threshold
+
+    Args:
+        limit: Number of requests to return
+        admin_id: Current admin's ID from token
+
+    Returns:
+        Requests with their statement list and an EXPLAIN of the slowest statement
+    """
+    return profile_store.recent_slow(limit)
+
+
+@router.delete("/profiling")
+def reset_profiling(admin_id: int = Depends(require_admin)):
+    """
+    Clear collected profiling stats
+
+    Args:
+        admin_id: Current admin's ID from token
+
+    Returns:
+        Success message
+    """
+    profile_store.reset()
+    return {"message": "Profiling stats cleared"}
+
+
+# ============ Item Cache ============
+
+@router.get("/cache")
+def cache_stats(admin_id: int = Depends(require_admin)):
+    """
+    Hit/miss counters for the public item cache
+
+    Args:
+        admin_id: Current admin's ID from token
+
+    Returns:
+        Hits, misses, hit ratio, backend and TTL (plus entries for the memory backend)
+    """
+    return item_cache.stats()
+
+
+# ============ Request Coalescing ============
+
+@router.get("/singleflight")
+def singleflight_stats(admin_id: int = Depends(require_admin)):
+    """
+    Single-flight counters for this worker process
+
+    Args:
+        admin_id: Current admin's ID from token
+
+    Returns:
+        Per group: calls, queries executed, calls coalesced onto an in-flight
+        query, errors, the largest number of waiters on one query and flights
+        currently running
+    """
+    return singleflight.stats()
+
+
+@router.delete("/singleflight")
+def reset_singleflight(admin_id: int = Depends(require_admin)):
+    """
+    Reset single-flight counters
+
+    Args:
+        admin_id: Current admin's ID from token
+
+    Returns:
+        Success message
+    """
+    for group in singleflight.GROUPS:
+        group.reset()
+    return {"message": "Single-flight stats cleared"}
+
+
+# ============ Outbox ============
+
+@router.get("/outbox")
+def outbox_stats(
+    admin_id: int = Depends(require_admin),
+    db: Session = Depends(get_db),
+):
+    """
+    Outbox backlog and this process's worker counters
+
+    Args:
+        admin_id: Current admin's ID from token
+        db: Database session
+
+    Returns:
+        Events per status, age of the oldest pending event and worker counters
+    """
+    return {
+        "backlog": outbox.backlog(db),
+        "worker": outbox.worker.stats() if outbox.worker is not None else {"running": False},
+    }
+
+
+# ============ Notifications ============
+
+@router.get("/notifications")
+def notification_stats(
+    admin_id: int = Depends(require_admin),
+    db: Session = Depends(get_db),
+):
+    """
+    Notification queue and this process's dispatcher counters
+
+    Args:
+        admin_id: Current admin's ID from token
+        db: Database session
+
+    Returns:
+        Notifications per status, age of the oldest pending one and dispatcher
+        counters (coalesced = notifications folded into another message)
+    """
+    return {
+        "queue": notifications.queue_status(db),
+        "dispatcher": notifications.dispatcher.stats() if notifications.dispatcher is not None else {"running": False},
+    }
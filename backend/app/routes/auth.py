@@ -3,32 +3,46 @@ Authentication Routes
 Handles user registration, login, and JWT token management
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
-from jose import JWTError, jwt
-from passlib.context import CryptContext
-import os
-from dotenv import load_dotenv
+from functools import lru_cache
+from typing import Optional
 
-from app.config.database import get_db
+from app.config.database import get_db, get_read_db
+from app.config.settings import get_settings
+from app.models.item import Item
 from app.models.user import User
 from app.models.wallet import Wallet
-from app.schemas.user import UserRegister, UserLogin, UserResponse, TokenResponse
-
-load_dotenv()
+from app.schemas.user import UserRegister, UserLogin, UserResponse, UserBatchResponse, TokenResponse
+from app.services.versioning import bump, lender_items_version_key, ALL_ITEMS_KEY
+from app.services import lender_stats
+from app.services.batch import parse_ids, fetch_by_ids
+from app.services.cache import invalidate_items
+from app.services.serialization import schema_columns
+from app.services.tracing import tracer
 
 # Create router for auth endpoints
 router = APIRouter(prefix="/auth", tags=["authentication"])
 
-# Password hashing context
-# Using argon2 which is more secure and doesn't have bcrypt's 72-byte limit
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
-
 # JWT settings from environment variables
-SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-in-production")
-ALGORITHM = os.getenv("ALGORITHM", "HS256")
-ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
+settings = get_settings()
+SECRET_KEY = settings.secret_key
+ALGORITHM = settings.algorithm
+ACCESS_TOKEN_EXPIRE_MINUTES = settings.access_token_expire_minutes
+
+USER_COLUMNS = schema_columns(User, UserResponse)
+
+
+@lru_cache
+def get_pwd_context():
+    """
+    Password hashing context, built on first use
+    Using argon2 which is more secure and doesn't have bcrypt's 72-byte limit.
+    passlib (and python-jose below) are imported lazily to keep worker startup fast.
+    """
+    from passlib.context import CryptContext
+    return CryptContext(schemes=["argon2"], deprecated="auto")
 
 
 # ============ Password Hashing Functions ============
@@ -43,7 +57,8 @@ def hash_password(password: str) -> str:
     Returns:
         Hashed password (never stores plain text!)
     """
-    return pwd_context.hash(password)
+    with tracer.start_as_current_span("argon2.hash"):
+        return get_pwd_context().hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -57,7 +72,8 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     Returns:
         True if password matches, False otherwise
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    with tracer.start_as_current_span("argon2.verify"):
+        return get_pwd_context().verify(plain_password, hashed_password)
 
 
 # ============ JWT Token Functions ============
@@ -73,6 +89,8 @@ def create_access_token(data: dict, expires_delta: timedelta = None) -> str:
     Returns:
         JWT token string
     """
+    from jose import jwt
+
     to_encode = data.copy()
     
     if expires_delta:
@@ -100,8 +118,11 @@ def verify_token(token: str):
     Raises:
         HTTPException if token is invalid
     """
+    from jose import JWTError, jwt
+
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        with tracer.start_as_current_span("jwt.decode", attributes={"jwt.algorithm": ALGORITHM}):
+            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         user_id: str = payload.get("sub")
         if user_id is None:
             raise HTTPException(
@@ -116,6 +137,27 @@ def verify_token(token: str):
         )
 
 
+def user_id_from_authorization(authorization: Optional[str]) -> Optional[int]:
+    """
+    Best-effort user ID from an Authorization header (used by middleware)
+    
+    Args:
+        authorization: Raw "Bearer <token>" header value
+    
+    Returns:
+        User ID, or None if the header is missing or the token is invalid
+    """
+    if not authorization:
+        return None
+    try:
+        scheme, token = authorization.split()
+        if scheme.lower() != "bearer":
+            return None
+        return int(verify_token(token))
+    except (ValueError, HTTPException):
+        return None
+
+
 # ============ Routes ============
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
@@ -209,7 +251,7 @@ def login(user: UserLogin, db: Session = Depends(get_db)):
 # ============ User Management Endpoints ============
 
 @router.get("/users", response_model=list[UserResponse])
-def get_all_users(db: Session = Depends(get_db)):
+def get_all_users(db: Session = Depends(get_read_db)):
     """
     Get all users (admin only)
     """
@@ -217,8 +259,18 @@ def get_all_users(db: Session = Depends(get_db)):
     return users
 
 
+@router.get("/users/batch", response_model=UserBatchResponse)
+def get_users_batch(ids: list[str] = Query(...), db: Session = Depends(get_read_db)):
+    """
+    Get many users by ID with one query
+    IDs may be comma separated and/or repeated (?ids=3,1&ids=7); duplicates are returned once.
+    """
+    rows, missing = fetch_by_ids(db, USER_COLUMNS, User.user_id, parse_ids(ids))
+    return {"users": rows, "missing": missing}
+
+
 @router.get("/users/{user_id}", response_model=UserResponse)
-def get_user(user_id: int, db: Session = Depends(get_db)):
+def get_user(user_id: int, db: Session = Depends(get_read_db)):
     """
     Get a specific user by ID
     """
@@ -237,6 +289,11 @@ def delete_user(user_id: int, db: Session = Depends(get_db)):
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
     
+    # The user's items are deleted with them - remember which, to drop their cached details
+    item_ids = [item_id for (item_id,) in db.query(Item.item_id).filter(Item.lender_id == user_id)]
+    lender_stats.forget(db, user_id)
     db.delete(user)
     db.commit()
+    invalidate_items(user_id, item_ids)
+    bump(lender_items_version_key(user_id), ALL_ITEMS_KEY)
     return {"message": "User deleted successfully"}
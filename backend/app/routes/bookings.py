@@ -4,11 +4,12 @@ Handles booking requests, management, and status updates
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status, Header
-from sqlalchemy.orm import Session
+from pydantic import TypeAdapter
+from sqlalchemy.orm import Session, aliased
 from datetime import datetime, timedelta
 from decimal import Decimal
 
-from app.config.database import get_db
+from app.config.database import get_db, get_read_db
 from app.models.booking import Booking, BookingStatusEnum
 from app.models.item import Item, ItemStatusEnum
 from app.models.user import User
@@ -20,9 +21,30 @@ from app.schemas.booking import (
     BookingDecision,
 )
 from app.routes.auth import verify_token
+from app.services import booking_events, lender_stats, outbox
+from app.services.cache import invalidate_item
+from app.services.serialization import schema_columns, json_response
+from app.services.singleflight import booking_reads
+from app.services.versioning import bump, bookings_key, wallet_key, lender_items_version_key
 
 router = APIRouter(prefix="/bookings", tags=["bookings"])
 
+# Projection used by the list endpoints: one joined query instead of three lookups per booking
+Lender = aliased(User)
+Borrower = aliased(User)
+BOOKING_COLUMNS = schema_columns(
+    Booking,
+    BookingResponse,
+    item_title=Item.title,
+    item_location=Item.location,
+    lender_name=Lender.full_name,
+    borrower_name=Borrower.full_name,
+)
+booking_list_adapter = TypeAdapter(list[BookingResponse])
+
+# Rentals the borrower can hand back (RETURN_PENDING)
+RETURNABLE_STATUSES = (BookingStatusEnum.ACCEPTED, BookingStatusEnum.AWAITING_PICKUP, BookingStatusEnum.PICKED_UP)
+
 
 # ============ Helper Functions ============
 
@@ -45,6 +67,36 @@ def get_current_user_id(authorization: str = Header(None)):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=f"Invalid token: {str(e)}")
 
 
+def query_booking_rows(db: Session):
+    """Base query returning BookingResponse-shaped rows with item and user names joined in"""
+    return (
+        db.query(*BOOKING_COLUMNS)
+        .outerjoin(Item, Item.item_id == Booking.item_id)
+        .outerjoin(Lender, Lender.user_id == Booking.lender_id)
+        .outerjoin(Borrower, Borrower.user_id == Booking.borrower_id)
+    )
+
+
+def lock_item_and_wallets(db: Session, booking: Booking):
+    """
+    Lock the booking's item, then both wallets in wallet_id order - the order
+    dispute settlement uses (after the booking), so the two never deadlock
+
+    Returns:
+        (item or None, borrower wallet or None, lender wallet or None)
+    """
+    item = db.query(Item).filter(Item.item_id == booking.item_id).with_for_update().first()
+    wallets = {
+        wallet.user_id: wallet
+        for wallet in db.query(Wallet)
+        .filter(Wallet.user_id.in_([booking.borrower_id, booking.lender_id]))
+        .order_by(Wallet.wallet_id)
+        .with_for_update()
+        .all()
+    }
+    return item, wallets.get(booking.borrower_id), wallets.get(booking.lender_id)
+
+
 # ============ Routes ============
 
 @router.post("/", response_model=BookingResponse, status_code=status.HTTP_201_CREATED)
@@ -99,8 +151,12 @@ def create_booking(
     )
     
     db.add(new_booking)
+    db.flush()
+    booking_events.booking_created(db, new_booking)
     db.commit()
     db.refresh(new_booking)
+    outbox.notify()
+    bump(bookings_key(new_booking.borrower_id), bookings_key(new_booking.lender_id))
 
     # Do NOT deduct wallet at creation; lender confirmation will perform deduction
     
@@ -143,46 +199,12 @@ def get_user_bookings(
     Returns:
         List of BookingResponse
     """
-    # Get bookings where user is borrower or lender
-    bookings = db.query(Booking).filter(
+    # Get bookings where user is borrower or lender, enriched with item and user details
+    rows = query_booking_rows(db).filter(
         (Booking.borrower_id == current_user_id) | (Booking.lender_id == current_user_id)
     ).all()
     
-    # Enrich with item and user details
-    result = []
-    for booking in bookings:
-        booking_dict = {
-            'booking_id': booking.booking_id,
-            'item_id': booking.item_id,
-            'borrower_id': booking.borrower_id,
-            'lender_id': booking.lender_id,
-            'start_date': booking.start_date,
-            'end_date': booking.end_date,
-            'total_deposit': booking.total_deposit,
-            'status': booking.status.value,
-            'reason': booking.reason,
-            'created_at': booking.created_at,
-        }
-        
-        # Add item details
-        item = db.query(Item).filter(Item.item_id == booking.item_id).first()
-        if item:
-            booking_dict['item_title'] = item.title
-            booking_dict['item_location'] = item.location
-        
-        # Add lender details
-        lender = db.query(User).filter(User.user_id == booking.lender_id).first()
-        if lender:
-            booking_dict['lender_name'] = lender.full_name
-        
-        # Add borrower details
-        borrower = db.query(User).filter(User.user_id == booking.borrower_id).first()
-        if borrower:
-            booking_dict['borrower_name'] = borrower.full_name
-        
-        result.append(booking_dict)
-    
-    return result
+    return json_response(booking_list_adapter, rows)
 
 
 @router.get("/pending", response_model=list[BookingResponse])
@@ -200,46 +222,31 @@ def get_pending_bookings(
     Returns:
         List of pending BookingResponse
     """
-    bookings = db.query(Booking).filter(
+    rows = query_booking_rows(db).filter(
         Booking.lender_id == current_user_id,
         Booking.status == BookingStatusEnum.PENDING
     ).all()
     
-    # Enrich with item and user details
-    result = []
-    for booking in bookings:
-        booking_dict = {
-            'booking_id': booking.booking_id,
-            'item_id': booking.item_id,
-            'borrower_id': booking.borrower_id,
-            'lender_id': booking.lender_id,
-            'start_date': booking.start_date,
-            'end_date': booking.end_date,
-            'total_deposit': booking.total_deposit,
-            'status': booking.status.value,
-            'reason': booking.reason,
-            'created_at': booking.created_at,
-        }
-        
-        # Add item details
-        item = db.query(Item).filter(Item.item_id == booking.item_id).first()
-        if item:
-            booking_dict['item_title'] = item.title
-            booking_dict['item_location'] = item.location
-        
-        # Add borrower details
-        borrower = db.query(User).filter(User.user_id == booking.borrower_id).first()
-        if borrower:
-            booking_dict['borrower_name'] = borrower.full_name
-        
-        # Add lender details
-        lender = db.query(User).filter(User.user_id == booking.lender_id).first()
-        if lender:
-            booking_dict['lender_name'] = lender.full_name
-        
-        result.append(booking_dict)
-    
-    return result
+    return json_response(booking_list_adapter, rows)
+
+
+@router.get("/active-items")
+def get_active_items(db: Session = Depends(get_read_db)):
+    """
+    Return a mapping of item_id -> days_left for all accepted bookings
+    that have not yet reached their end_date (i.e., currently rented).
+    Every client polls this, so concurrent calls share one query (single-flight).
+    """
+    today = datetime.utcnow().date()
+
+    def load():
+        active = db.query(Booking.item_id, Booking.end_date).filter(
+            Booking.status == BookingStatusEnum.ACCEPTED,
+            Booking.end_date >= today
+        ).all()
+        return {"active": {item_id: max(0, (end_date - today).days) for item_id, end_date in active}}
+
+    return booking_reads.do(f"bookings:active-items:{today.isoformat()}", load)
 
 
 @router.get("/{booking_id}", response_model=BookingResponse)
@@ -270,24 +277,6 @@ def get_booking(
     return booking
 
 
-@router.get("/active-items")
-def get_active_items(db: Session = Depends(get_db)):
-    """
-    Return a mapping of item_id -> days_left for all accepted bookings
-    that have not yet reached their end_date (i.e., currently rented).
-    """
-    today = datetime.utcnow().date()
-    active = db.query(Booking).filter(
-        Booking.status == BookingStatusEnum.ACCEPTED,
-        Booking.end_date >= today
-    ).all()
-    result = {}
-    for b in active:
-        days_left = (b.end_date - today).days
-        result[b.item_id] = max(0, days_left)
-    return {"active": result}
-
-
 @router.patch("/{booking_id}", response_model=BookingResponse)
 def update_booking_status(
     booking_id: int,
@@ -307,7 +296,9 @@ def update_booking_status(
     Returns:
         Updated BookingResponse
     """
-    booking = db.query(Booking).filter(Booking.booking_id == booking_id).first()
+    # Lock the booking so a concurrent update or dispute settlement waits, then
+    # sees the status this one leaves (and fails its own status checks)
+    booking = db.query(Booking).filter(Booking.booking_id == booking_id).with_for_update().first()
     if not booking:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Booking not found")
     
@@ -328,9 +319,16 @@ def update_booking_status(
         if booking.lender_id != current_user_id:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only lender can accept/reject")
         
+        if booking.status != BookingStatusEnum.PENDING:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Only pending bookings can be accepted or rejected (booking is {booking.status.value})"
+            )
+        
         # If booking is accepted, deduct deposit from borrower's wallet
         if new_status == BookingStatusEnum.ACCEPTED:
-            borrower_wallet = db.query(Wallet).filter(Wallet.user_id == booking.borrower_id).first()
+            item, borrower_wallet, lender_wallet = lock_item_and_wallets(db, booking)
+            item_title = item.title if item else 'Unknown'
             if not borrower_wallet:
                 raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Borrower wallet not found")
             
@@ -351,19 +349,17 @@ def update_booking_status(
                 booking_id=booking.booking_id,
                 tx_type=TransactionTypeEnum.DEPOSIT,
                 amount=Decimal(str(booking.total_deposit)),
-                description=f"Deposit locked for item '{db.query(Item).filter(Item.item_id == booking.item_id).first().title if booking.item_id else 'Unknown'}'",
+                description=f"Deposit locked for item '{item_title}'",
             )
             db.add(deposit_transaction)
             
             # Credit deposit to lender's wallet
-            lender_wallet = db.query(Wallet).filter(Wallet.user_id == booking.lender_id).first()
             if not lender_wallet:
                 raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Lender wallet not found")
             
             lender_wallet.balance = lender_wallet.balance + Decimal(str(booking.total_deposit))
             
             # Create earning transaction for lender
-            item_title = db.query(Item).filter(Item.item_id == booking.item_id).first().title if booking.item_id else 'Unknown'
             earning_transaction = Transaction(
                 user_id=booking.lender_id,
                 wallet_id=lender_wallet.wallet_id,
@@ -373,9 +369,11 @@ def update_booking_status(
                 description=f"Earning from renting '{item_title}'",
             )
             db.add(earning_transaction)
+            lender_stats.record(
+                db, booking.lender_id, rental_count=1, total_earnings=Decimal(str(booking.total_deposit))
+            )
             
             # Set item status to rented
-            item = db.query(Item).filter(Item.item_id == booking.item_id).first()
             if item:
                 item.status = ItemStatusEnum.RENTED
     
@@ -384,6 +382,13 @@ def update_booking_status(
         if booking.borrower_id != current_user_id:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only borrower can initiate return")
         
+        # Only an ongoing rental can be returned (not e.g. one a dispute settlement already closed)
+        if booking.status not in RETURNABLE_STATUSES:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Only ongoing rentals can be returned (booking is {booking.status.value})"
+            )
+        
         # Check if there's an open dispute - if yes, can't mark as returned
         from app.models.dispute import Dispute, DisputeStatusEnum
         open_dispute = db.query(Dispute).filter(
@@ -413,7 +418,7 @@ def update_booking_status(
             )
         
         # Refund deposit to borrower's wallet
-        borrower_wallet = db.query(Wallet).filter(Wallet.user_id == booking.borrower_id).first()
+        item, borrower_wallet, _ = lock_item_and_wallets(db, booking)
         if borrower_wallet:
             borrower_wallet.balance = borrower_wallet.balance + Decimal(str(booking.total_deposit))
             
@@ -423,21 +428,39 @@ def update_booking_status(
                 wallet_id=borrower_wallet.wallet_id,
                 tx_type=TransactionTypeEnum.REFUND,
                 amount=Decimal(str(booking.total_deposit)),
-                description=f"Deposit refund for item '{db.query(Item).filter(Item.item_id == booking.item_id).first().title if booking.item_id else 'Unknown'}'",
+                description=f"Deposit refund for item '{item.title if item else 'Unknown'}'",
             )
             db.add(refund_transaction)
         
         # Set item status back to available
-        item = db.query(Item).filter(Item.item_id == booking.item_id).first()
         if item:
             item.status = ItemStatusEnum.AVAILABLE
+        lender_stats.record(db, booking.lender_id, completed_rental_count=1)
     
+    previous_status = booking.status
     booking.status = new_status
     if decision.reason:
         booking.reason = decision.reason
+    # Side effects (notifications) run in the outbox worker after commit
+    booking_events.booking_status_changed(db, booking, previous_status)
     
     db.commit()
     db.refresh(booking)
+    outbox.notify()
+    
+    # Record what changed for conditional GETs
+    changed = [bookings_key(booking.borrower_id), bookings_key(booking.lender_id)]
+    if new_status == BookingStatusEnum.ACCEPTED:
+        changed += [wallet_key(booking.borrower_id), wallet_key(booking.lender_id)]
+    if new_status == BookingStatusEnum.RETURNED:
+        changed.append(wallet_key(booking.borrower_id))
+    
+    # Accepting and confirming a return change Item.status - drop cached payloads
+    # before bumping, so the new ETag is never stamped on a pre-write payload
+    if new_status in (BookingStatusEnum.ACCEPTED, BookingStatusEnum.RETURNED):
+        invalidate_item(booking.lender_id, booking.item_id)
+        changed.append(lender_items_version_key(booking.lender_id))
+    bump(*changed)
     
     # Enrich response with item and user details
     item = db.query(Item).filter(Item.item_id == booking.item_id).first()
@@ -0,0 +1,178 @@
+"""
+Dashboard Routes
+Everything the dashboard page shows in one round trip, built from
+projection queries (only the rendered columns, no ORM entities).
+Read from the primary: the page refetches right after accepting, rejecting
+or returning, and a lagging replica would show the pre-write state.
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, status, Header, Query
+from sqlalchemy import case, or_, and_
+from sqlalchemy.orm import Session, aliased
+from typing import Optional
+
+from app.config.database import get_db
+from app.models.booking import Booking, BookingStatusEnum
+from app.models.item import Item
+from app.models.user import User
+from app.models.wallet import Wallet
+from app.routes.auth import verify_token
+from app.schemas.dashboard import DashboardResponse
+
+router = APIRouter(prefix="/dashboard", tags=["dashboard"])
+
+SECTIONS = ("wallet", "items", "pending", "rentals", "lended")
+ONGOING_STATUSES = (BookingStatusEnum.ACCEPTED, BookingStatusEnum.RETURN_PENDING)
+
+Lender = aliased(User)
+Borrower = aliased(User)
+
+
+# ============ Helper Functions ============
+
+def get_current_user_id(authorization: str = Header(None)):
+    """Extract user ID from Bearer token"""
+    if not authorization:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
+
+    try:
+        scheme, token = authorization.split()
+        if scheme.lower() != "bearer":
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid auth scheme")
+        user_id = verify_token(token)
+        return int(user_id)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token format")
+    except HTTPException:
+        raise
+    except Exception:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+
+
+def parse_sections(sections: Optional[str]) -> set[str]:
+    if not sections:
+        return set(SECTIONS)
+    wanted = {name.strip() for name in sections.split(",") if name.strip()}
+    unknown = wanted - set(SECTIONS)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown sections: {', '.join(sorted(unknown))} (expected {', '.join(SECTIONS)})"
+        )
+    return wanted
+
+
+def dashboard_items(db: Session, user_id: int) -> list[dict]:
+    rows = (
+        db.query(Item.item_id, Item.title, Item.images, Item.daily_deposit, Item.is_active, Item.status)
+        .filter(Item.lender_id == user_id)
+        .order_by(Item.created_at.desc())
+        .all()
+    )
+    return [
+        {
+            "item_id": row.item_id,
+            "title": row.title,
+            "image": row.images[0] if row.images else None,
+            "daily_deposit": row.daily_deposit,
+            "is_active": bool(row.is_active),
+            "status": row.status.value if row.status else None,
+        }
+        for row in rows
+    ]
+
+
+def dashboard_bookings(db: Session, user_id: int, wanted: set[str]) -> dict:
+    """Pending requests, rentals and lended bookings from a single query"""
+    conditions = []
+    if "pending" in wanted:
+        conditions.append(and_(Booking.lender_id == user_id, Booking.status == BookingStatusEnum.PENDING))
+    if "lended" in wanted:
+        conditions.append(and_(Booking.lender_id == user_id, Booking.status.in_(ONGOING_STATUSES)))
+    if "rentals" in wanted:
+        conditions.append(and_(Booking.borrower_id == user_id, Booking.status.in_(ONGOING_STATUSES)))
+    if not conditions:
+        return {}
+
+    as_lender = Booking.lender_id == user_id
+    rows = (
+        db.query(
+            Booking.booking_id,
+            Booking.item_id,
+            Item.title.label("item_title"),
+            case((as_lender, Booking.borrower_id), else_=Booking.lender_id).label("counterpart_id"),
+            case((as_lender, Borrower.full_name), else_=Lender.full_name).label("counterpart_name"),
+            Booking.start_date,
+            Booking.end_date,
+            Booking.total_deposit,
+            Booking.status,
+            Booking.lender_id,
+        )
+        .outerjoin(Item, Item.item_id == Booking.item_id)
+        .outerjoin(Lender, Lender.user_id == Booking.lender_id)
+        .outerjoin(Borrower, Borrower.user_id == Booking.borrower_id)
+        .filter(or_(*conditions))
+        .order_by(Booking.created_at.desc())
+        .all()
+    )
+
+    result = {name: [] for name in ("pending", "rentals", "lended") if name in wanted}
+    for row in rows:
+        if row.lender_id == user_id:
+            section = "pending" if row.status == BookingStatusEnum.PENDING else "lended"
+        else:
+            section = "rentals"
+        if section in result:
+            result[section].append({
+                "booking_id": row.booking_id,
+                "item_id": row.item_id,
+                "item_title": row.item_title,
+                "counterpart_id": row.counterpart_id,
+                "counterpart_name": row.counterpart_name,
+                "start_date": row.start_date,
+                "end_date": row.end_date,
+                "total_deposit": row.total_deposit,
+                "status": row.status.value,
+            })
+    return result
+
+
+# ============ Routes ============
+
+@router.get("", response_model=DashboardResponse)
+def get_dashboard(
+    sections: Optional[str] = Query(None, description="Comma separated: " + ",".join(SECTIONS)),
+    current_user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db),
+):
+    """
+    Dashboard data for the current user in one request
+    Refresh only what an action changed with ?sections=, e.g. pending,lended
+    after accepting a booking.
+
+    Args:
+        sections: Sections to return (default: all)
+        current_user_id: Current user's ID from token
+        db: Database session
+
+    Returns:
+        DashboardResponse; sections not requested are null
+    """
+    wanted = parse_sections(sections)
+    response = {}
+
+    if "wallet" in wanted:
+        balance = db.query(Wallet.balance).filter(Wallet.user_id == current_user_id).scalar()
+        response["wallet_balance"] = balance if balance is not None else 0
+    if "items" in wanted:
+        response["items"] = dashboard_items(db, current_user_id)
+
+    bookings = dashboard_bookings(db, current_user_id, wanted)
+    if "pending" in bookings:
+        response["pending_requests"] = bookings["pending"]
+    if "rentals" in bookings:
+        response["rentals"] = bookings["rentals"]
+    if "lended" in bookings:
+        response["lended"] = bookings["lended"]
+
+    return response
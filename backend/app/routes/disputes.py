@@ -4,7 +4,7 @@ Handles dispute creation, resolution, and management
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status, Header
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, contains_eager, joinedload
 from datetime import datetime
 
 from app.config.database import get_db
@@ -16,6 +16,7 @@ from app.schemas.dispute import (
     DisputeResponse,
 )
 from app.routes.auth import verify_token
+from app.services import lender_stats
 
 router = APIRouter(prefix="/disputes", tags=["disputes"])
 
@@ -88,6 +89,7 @@ def create_dispute(
     )
     
     db.add(new_dispute)
+    lender_stats.record(db, booking.lender_id, dispute_count=1)
     db.commit()
     db.refresh(new_dispute)
     
@@ -110,7 +112,8 @@ def get_user_disputes(
         List of DisputeResponse
     """
     # Get disputes on bookings where user is borrower or lender
-    disputes = db.query(Dispute).join(Booking).filter(
+    # The join already fetches the booking, so populate dispute.booking from it too
+    disputes = db.query(Dispute).join(Booking).options(contains_eager(Dispute.booking)).filter(
         (Booking.borrower_id == current_user_id) | (Booking.lender_id == current_user_id)
     ).all()
     
@@ -134,7 +137,9 @@ def get_dispute(
     Returns:
         DisputeResponse
     """
-    dispute = db.query(Dispute).filter(Dispute.dispute_id == dispute_id).first()
+    dispute = db.query(Dispute).options(joinedload(Dispute.booking)).filter(
+        Dispute.dispute_id == dispute_id
+    ).first()
     if not dispute:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Dispute not found")
     
@@ -165,7 +170,9 @@ def resolve_dispute(
     Returns:
         Updated DisputeResponse
     """
-    dispute = db.query(Dispute).filter(Dispute.dispute_id == dispute_id).first()
+    dispute = db.query(Dispute).options(joinedload(Dispute.booking)).filter(
+        Dispute.dispute_id == dispute_id
+    ).first()
     if not dispute:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Dispute not found")
     
@@ -201,7 +208,9 @@ def delete_dispute(
     Returns:
         Success message
     """
-    dispute = db.query(Dispute).filter(Dispute.dispute_id == dispute_id).first()
+    dispute = db.query(Dispute).options(joinedload(Dispute.booking)).filter(
+        Dispute.dispute_id == dispute_id
+    ).first()
     if not dispute:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Dispute not found")
     
@@ -217,6 +226,7 @@ def delete_dispute(
             detail="Only open disputes can be deleted"
         )
     
+    lender_stats.record(db, booking.lender_id, dispute_count=-1)
     db.delete(dispute)
     db.commit()
     
@@ -3,18 +3,66 @@ Items Routes
 Handles item creation, listing, updating, and deletion
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Header
+from fastapi import APIRouter, Depends, HTTPException, status, Header, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import insert, or_
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 from datetime import datetime
+from tempfile import SpooledTemporaryFile
+from typing import Optional
+import base64
+import csv
+import heapq
+import io
 
-from app.config.database import get_db
-from app.models.item import Item
+from app.config.database import get_db, get_read_db
+from app.config.settings import get_settings
+from app.models.item import Item, ItemStatusEnum
+from app.models.ranking import ItemRanking, ItemRecommendation
 from app.models.user import User
-from app.schemas.item import ItemCreate, ItemUpdate, ItemResponse
+from app.schemas.item import (
+    ItemCreate,
+    ItemUpdate,
+    ItemResponse,
+    ItemBulkResponse,
+    ItemBatchResponse,
+    NearbyItem,
+    NearbyItemPage,
+)
+from app.schemas.lender_stats import LenderStatsResponse
 from app.routes.auth import verify_token
+from app.services.cache import (
+    item_cache,
+    item_list_key,
+    item_detail_key,
+    lender_items_key,
+    popular_items_key,
+    item_recommendations_key,
+    invalidate_item,
+)
+from app.services import geo, lender_stats
+from app.services.batch import parse_ids, fetch_by_ids
+from app.services.serialization import schema_columns
+from app.services.singleflight import item_reads
+from app.services.versioning import bump, lender_items_version_key, ALL_ITEMS_KEY
 
 router = APIRouter(prefix="/items", tags=["items"])
 
+# Bulk import settings
+BULK_BATCH_SIZE = get_settings().bulk_items_batch_size  # Rows per INSERT round trip
+BULK_MAX_ROWS = get_settings().bulk_items_max_rows  # Rows accepted per request
+BULK_CSV_SPOOL_BYTES = 1024 * 1024  # CSV uploads larger than this are spooled to disk
+
+# Proximity search
+NEARBY_MAX_RADIUS_KM = get_settings().nearby_max_radius_km
+
+# Serializers for cached payloads - rows come from ITEM_COLUMNS projections
+ITEM_COLUMNS = schema_columns(Item, ItemResponse)
+item_adapter = TypeAdapter(ItemResponse)
+item_list_adapter = TypeAdapter(list[ItemResponse])
+
 
 # ============ Helper Functions ============
 
@@ -35,6 +83,166 @@ def get_current_user_id(authorization: str = Header(None)):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
 
 
+def _format_validation_error(exc: ValidationError) -> str:
+    """Flatten a pydantic ValidationError into a single readable line"""
+    return "; ".join(
+        f"{'.'.join(str(part) for part in err['loc']) or 'row'}: {err['msg']}"
+        for err in exc.errors()
+    )
+
+
+def _iter_csv_rows(text_stream):
+    """
+    Yield CSV rows as dicts ready for ItemCreate validation
+
+    Empty cells are dropped so optional fields fall back to their defaults,
+    and the images column holds URLs separated by "|".
+    """
+    for row in csv.DictReader(text_stream):
+        cleaned = {
+            key.strip(): value.strip()
+            for key, value in row.items()
+            if key and value is not None and value.strip() != ""
+        }
+        if "images" in cleaned:
+            cleaned["images"] = [url.strip() for url in cleaned["images"].split("|") if url.strip()]
+        yield cleaned
+
+
+def _bulk_insert_items(db: Session, lender_id: int, rows) -> dict:
+    """
+    Validate rows with ItemCreate and insert them in batches
+
+    Each batch is a single executemany INSERT ... RETURNING so created IDs come
+    back in upload order. A batch that fails at the database level is rolled
+    back on its own and its rows are reported as errors.
+
+    Args:
+        db: Database session
+        lender_id: Owner of every created item
+        rows: Iterable of raw row dicts
+
+    Returns:
+        Dict matching ItemBulkResponse
+    """
+    item_ids = []
+    errors = []
+    batch = []  # (row_number, values) pairs
+    created_at = datetime.utcnow()
+    stmt = insert(Item).returning(Item.item_id, sort_by_parameter_order=True)
+
+    def flush():
+        try:
+            result = db.execute(stmt, [values for _, values in batch])
+            ids = result.scalars().all()
+            lender_stats.record(db, lender_id, item_count=len(ids), active_item_count=len(ids))
+            db.commit()
+        except SQLAlchemyError as e:
+            db.rollback()
+            reason = f"Database error: {e.__class__.__name__}"
+            errors.extend({"row": row_number, "error": reason} for row_number, _ in batch)
+        else:
+            item_ids.extend(ids)
+        batch.clear()
+
+    for row_number, raw in enumerate(rows, start=1):
+        if row_number > BULK_MAX_ROWS:
+            errors.append({
+                "row": row_number,
+                "error": f"Row limit of {BULK_MAX_ROWS} exceeded; remaining rows were ignored",
+            })
+            break
+
+        try:
+            item = ItemCreate.model_validate(raw)
+        except ValidationError as e:
+            errors.append({"row": row_number, "error": _format_validation_error(e)})
+            continue
+
+        batch.append((row_number, {
+            **item.model_dump(),
+            "geohash": geo.geohash_for(item.latitude, item.longitude),
+            "lender_id": lender_id,
+            "is_active": True,
+            "status": ItemStatusEnum.AVAILABLE,
+            "created_at": created_at,
+        }))
+        if len(batch) >= BULK_BATCH_SIZE:
+            flush()
+
+    if batch:
+        flush()
+
+    if item_ids:
+        invalidate_item(lender_id)
+        bump(lender_items_version_key(lender_id))
+
+    return {"created": len(item_ids), "item_ids": item_ids, "errors": errors}
+
+
+def _cached_json(key: str, load) -> Response:
+    """
+    Serve a JSON payload from the item cache, filling it with `load()` on a miss
+
+    `load` returns the serialized ItemResponse payload as bytes. Concurrent
+    misses for the same key share one `load()` (single-flight).
+    Routes using it read from the primary (get_db): a lagging replica would
+    refill the cache with pre-write data for the whole TTL. Hits never open
+    a connection, so this only costs the misses.
+    """
+    payload = item_cache.get(key)
+    if payload is None:
+        payload = item_reads.do(key, lambda: _load_and_store(key, load))
+    return Response(content=payload, media_type="application/json")
+
+
+def _load_and_store(key: str, load) -> bytes:
+    payload = load()
+    item_cache.set(key, payload)
+    return payload
+
+
+def _encode_nearby_cursor(distance_km: float, item_id: int) -> str:
+    """Opaque cursor for the position after (distance, item_id)"""
+    raw = f"{distance_km!r}|{item_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_nearby_cursor(cursor: str) -> tuple[float, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        distance_km, item_id = raw.rsplit("|", 1)
+        return float(distance_km), int(item_id)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def _nearest_items(db: Session, lat: float, lng: float, radius_km: float, count: int,
+                   after: Optional[tuple[float, int]] = None) -> list[tuple[float, int]]:
+    """
+    (distance_km, item_id) of the `count` nearest active items within the radius
+
+    Candidates come from one geohash range scan per covering cell (ix_items_geohash)
+    narrowed by the bounding box; exact distances are computed here, and the
+    (distance, item_id) order makes `after` a stable keyset position.
+    """
+    min_lat, max_lat, min_lng, max_lng = geo.bounding_box(lat, lng, radius_km)
+    cells = [Item.geohash.between(*geo.prefix_range(cell)) for cell in geo.covering_cells(lat, lng, radius_km)]
+    candidates = db.query(Item.item_id, Item.latitude, Item.longitude).filter(
+        or_(*cells),
+        Item.is_active == True,
+        Item.latitude.between(min_lat, max_lat),
+        Item.longitude.between(min_lng, max_lng),
+    )
+
+    hits = []
+    for item_id, item_lat, item_lng in candidates:
+        distance = geo.haversine_km(lat, lng, item_lat, item_lng)
+        if distance <= radius_km and (after is None or (distance, item_id) > after):
+            hits.append((distance, item_id))
+    return heapq.nsmallest(count, hits)
+
+
 # ============ Routes ============
 
 @router.post("/", response_model=ItemResponse, status_code=status.HTTP_201_CREATED)
@@ -71,16 +279,77 @@ def create_item(
         daily_deposit=item.daily_deposit,
         images=item.images,
         location=item.location,
+        latitude=item.latitude,
+        longitude=item.longitude,
+        geohash=geo.geohash_for(item.latitude, item.longitude),
         is_active=True
     )
     
     db.add(new_item)
+    lender_stats.record(db, current_user_id, item_count=1, active_item_count=1)
     db.commit()
     db.refresh(new_item)
+    invalidate_item(current_user_id)
+    bump(lender_items_version_key(current_user_id))
     
     return new_item
 
 
+@router.post("/bulk", response_model=ItemBulkResponse, status_code=status.HTTP_201_CREATED)
+async def create_items_bulk(
+    request: Request,
+    current_user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db)
+):
+    """
+    Create many items in one request (lender only)
+
+    Accepts either a JSON array of ItemCreate objects (application/json) or a
+    CSV file with a header row (text/csv). CSV bodies are streamed to a spooled
+    temporary file instead of being held in memory.
+
+    Args:
+        request: Raw request, body is a JSON array or CSV
+        current_user_id: Current user's ID from token
+        db: Database session
+
+    Returns:
+        ItemBulkResponse with created item IDs and per-row errors
+    """
+    user = await run_in_threadpool(
+        lambda: db.query(User.user_id).filter(User.user_id == current_user_id).first()
+    )
+    if not user:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+
+    if content_type in ("text/csv", "application/csv"):
+        spool = SpooledTemporaryFile(max_size=BULK_CSV_SPOOL_BYTES, mode="w+b")
+        try:
+            async for chunk in request.stream():
+                spool.write(chunk)
+            spool.seek(0)
+            text_stream = io.TextIOWrapper(spool, encoding="utf-8-sig", newline="")
+            try:
+                return await run_in_threadpool(
+                    _bulk_insert_items, db, current_user_id, _iter_csv_rows(text_stream)
+                )
+            except (csv.Error, UnicodeDecodeError) as e:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid CSV: {e}")
+        finally:
+            spool.close()
+
+    try:
+        payload = await request.json()
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Body must be a JSON array or CSV")
+    if not isinstance(payload, list):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Body must be a JSON array of items")
+
+    return await run_in_threadpool(_bulk_insert_items, db, current_user_id, payload)
+
+
 @router.get("/", response_model=list[ItemResponse])
 def get_all_items(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
     """
@@ -94,8 +363,107 @@ def get_all_items(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)
     Returns:
         List of ItemResponse
     """
-    items = db.query(Item).filter(Item.is_active == True).offset(skip).limit(limit).all()
-    return items
+    def load():
+        rows = db.query(*ITEM_COLUMNS).filter(Item.is_active == True).offset(skip).limit(limit).all()
+        return item_list_adapter.dump_json(item_list_adapter.validate_python(rows, from_attributes=True))
+
+    return _cached_json(item_list_key(skip, limit), load)
+
+
+@router.get("/popular", response_model=list[ItemResponse])
+def get_popular_items(limit: int = Query(20, ge=1, le=100), db: Session = Depends(get_db)):
+    """
+    Most popular active items
+    Reads the precomputed item_rankings table (python manage.py rankings rebuild);
+    falls back to the newest items until rankings have been computed.
+    
+    Args:
+        limit: Number of items to return
+        db: Database session
+    
+    Returns:
+        List of ItemResponse, most popular first
+    """
+    def load():
+        rows = (
+            db.query(*ITEM_COLUMNS)
+            .join(ItemRanking, ItemRanking.item_id == Item.item_id)
+            .filter(Item.is_active == True)
+            .order_by(ItemRanking.score.desc(), Item.item_id)
+            .limit(limit)
+            .all()
+        )
+        if not rows:
+            rows = (
+                db.query(*ITEM_COLUMNS)
+                .filter(Item.is_active == True)
+                .order_by(Item.created_at.desc())
+                .limit(limit)
+                .all()
+            )
+        return item_list_adapter.dump_json(item_list_adapter.validate_python(rows, from_attributes=True))
+
+    return _cached_json(popular_items_key(limit), load)
+
+
+@router.get("/batch", response_model=ItemBatchResponse)
+def get_items_batch(ids: list[str] = Query(...), db: Session = Depends(get_read_db)):
+    """
+    Get many items by ID with one query
+    
+    Args:
+        ids: Item IDs, comma separated and/or repeated (?ids=3,1&ids=7)
+        db: Database session
+    
+    Returns:
+        ItemBatchResponse with the items in request order and the IDs not found
+    """
+    rows, missing = fetch_by_ids(db, ITEM_COLUMNS, Item.item_id, parse_ids(ids))
+    return {"items": rows, "missing": missing}
+
+
+@router.get("/nearby", response_model=NearbyItemPage)
+def get_nearby_items(
+    lat: float = Query(..., ge=-90, le=90),
+    lng: float = Query(..., ge=-180, le=180),
+    radius: float = Query(5.0, gt=0, le=NEARBY_MAX_RADIUS_KM),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_read_db),
+):
+    """
+    Active items within `radius` km of a point, nearest first
+    Only items with coordinates are considered.
+    
+    Args:
+        lat: Latitude of the search point
+        lng: Longitude of the search point
+        radius: Search radius in kilometres
+        limit: Page size
+        cursor: next_cursor from the previous page
+        db: Database session
+    
+    Returns:
+        NearbyItemPage with the items, their distance and the cursor for the next page
+    """
+    after = _decode_nearby_cursor(cursor) if cursor else None
+    nearest = _nearest_items(db, lat, lng, radius, limit + 1, after)
+
+    next_cursor = None
+    if len(nearest) > limit:
+        nearest = nearest[:limit]
+        next_cursor = _encode_nearby_cursor(*nearest[-1])
+
+    rows = {}
+    if nearest:
+        ids = [item_id for _, item_id in nearest]
+        rows = {row.item_id: row for row in db.query(*ITEM_COLUMNS).filter(Item.item_id.in_(ids))}
+    items = [
+        NearbyItem.model_validate({**rows[item_id]._mapping, "distance_km": round(distance, 3)})
+        for distance, item_id in nearest
+        if item_id in rows
+    ]
+    return NearbyItemPage(items=items, next_cursor=next_cursor)
 
 
 @router.get("/lender/{lender_id}", response_model=list[ItemResponse])
@@ -110,11 +478,30 @@ def get_lender_items(lender_id: int, db: Session = Depends(get_db)):
     Returns:
         List of ItemResponse
     """
-    items = db.query(Item).filter(
-        Item.lender_id == lender_id,
-        Item.is_active == True
-    ).all()
-    return items
+    def load():
+        rows = db.query(*ITEM_COLUMNS).filter(
+            Item.lender_id == lender_id,
+            Item.is_active == True
+        ).all()
+        return item_list_adapter.dump_json(item_list_adapter.validate_python(rows, from_attributes=True))
+
+    return _cached_json(lender_items_key(lender_id), load)
+
+
+@router.get("/lender/{lender_id}/stats", response_model=LenderStatsResponse)
+def get_lender_stats(lender_id: int, db: Session = Depends(get_read_db)):
+    """
+    Get a lender's item, rental, earnings and dispute counters
+    Single primary-key read of lender_stats (maintained on every change).
+    
+    Args:
+        lender_id: ID of lender
+        db: Database session
+    
+    Returns:
+        LenderStatsResponse (zeros for lenders with no activity yet)
+    """
+    return lender_stats.get(db, lender_id)
 
 
 @router.get("/{item_id}", response_model=ItemResponse)
@@ -129,10 +516,46 @@ def get_item(item_id: int, db: Session = Depends(get_db)):
     Returns:
         ItemResponse
     """
-    item = db.query(Item).filter(Item.item_id == item_id).first()
-    if not item:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Item not found")
-    return item
+    def load():
+        row = db.query(*ITEM_COLUMNS).filter(Item.item_id == item_id).first()
+        if not row:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Item not found")
+        return item_adapter.dump_json(item_adapter.validate_python(row, from_attributes=True))
+
+    return _cached_json(item_detail_key(item_id), load)
+
+
+@router.get("/{item_id}/recommendations", response_model=list[ItemResponse])
+def get_item_recommendations(
+    item_id: int,
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_db),
+):
+    """
+    Items often booked by the borrowers who booked this one
+    Reads the precomputed item_recommendations table; empty until rankings have
+    been computed or when the item has no rental history.
+    
+    Args:
+        item_id: Item ID
+        limit: Number of items to return
+        db: Database session
+    
+    Returns:
+        List of ItemResponse, strongest recommendation first
+    """
+    def load():
+        rows = (
+            db.query(*ITEM_COLUMNS)
+            .join(ItemRecommendation, ItemRecommendation.recommended_item_id == Item.item_id)
+            .filter(ItemRecommendation.item_id == item_id, Item.is_active == True)
+            .order_by(ItemRecommendation.rank)
+            .limit(limit)
+            .all()
+        )
+        return item_list_adapter.dump_json(item_list_adapter.validate_python(rows, from_attributes=True))
+
+    return _cached_json(item_recommendations_key(item_id, limit), load)
 
 
 @router.patch("/{item_id}", response_model=ItemResponse)
@@ -180,11 +603,20 @@ def update_item(
         item.images = item_update.images
     if item_update.location:
         item.location = item_update.location
+    if item_update.latitude is not None:
+        item.latitude = item_update.latitude
+        item.longitude = item_update.longitude
+        item.geohash = geo.geohash_for(item_update.latitude, item_update.longitude)
     if item_update.is_active is not None:
+        if item_update.is_active != bool(item.is_active):
+            lender_stats.record(db, item.lender_id, active_item_count=1 if item_update.is_active else -1)
         item.is_active = item_update.is_active
     
     db.commit()
     db.refresh(item)
+    invalidate_item(item.lender_id, item.item_id)
+    # Booking lists embed item title/location
+    bump(lender_items_version_key(item.lender_id), ALL_ITEMS_KEY)
     
     return item
 
@@ -214,7 +646,11 @@ def delete_item(
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to delete this item")
     
     # Soft delete - just mark as inactive
+    if item.is_active:
+        lender_stats.record(db, item.lender_id, active_item_count=-1)
     item.is_active = False
     db.commit()
+    invalidate_item(item.lender_id, item.item_id)
+    bump(lender_items_version_key(item.lender_id))
     
     return {"message": "Item deleted successfully"}
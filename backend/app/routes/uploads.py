@@ -8,6 +8,8 @@ from typing import List
 from pathlib import Path
 import uuid
 
+from app.services.tracing import tracer
+
 router = APIRouter(prefix="/api/uploads", tags=["uploads"])
 
 
@@ -46,7 +48,8 @@ async def upload_images(request: Request, files: List[UploadFile] = File(...)):
         dest_path = upload_dir / new_name
         # Save file
         content = await f.read()
-        dest_path.write_bytes(content)
+        with tracer.start_as_current_span("uploads.write", attributes={"file.size": len(content), "file.ext": suffix}):
+            dest_path.write_bytes(content)
 
         base_url = str(request.base_url).rstrip('/')
         saved_urls.append(f"{base_url}/uploads/{new_name}")
@@ -3,17 +3,29 @@ Wallet Routes - Handle wallet balance and topup operations
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status, Header
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 from decimal import Decimal
 
-from app.config.database import get_db
+from app.config.database import get_db, get_read_db
 from app.models.wallet import Wallet
 from app.models.transaction import Transaction, TransactionTypeEnum
 from app.schemas.wallet import WalletBalance, TopupRequest, TransactionResponse
 from app.routes.auth import verify_token
+from app.services.serialization import schema_columns, json_response
+from app.services.versioning import bump, wallet_key
 
 router = APIRouter(prefix="/wallet", tags=["wallet"])
 
+# Projection for the transaction history endpoint
+TRANSACTION_COLUMNS = schema_columns(
+    Transaction,
+    TransactionResponse,
+    transaction_id=Transaction.tx_id,
+    type=Transaction.tx_type,
+)
+transaction_list_adapter = TypeAdapter(list[TransactionResponse])
+
 
 # ============ Helper Functions ============
 
@@ -139,6 +151,7 @@ def topup_wallet(
     db.add(transaction)
     db.commit()
     db.refresh(wallet)
+    bump(wallet_key(current_user_id))
     
     # Return updated balance
     transactions = (
@@ -170,7 +183,7 @@ def topup_wallet(
 @router.get("/transactions", response_model=list[TransactionResponse])
 def get_transactions(
     current_user_id: int = Depends(get_current_user_id),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """
     Get all transactions for the wallet
@@ -190,20 +203,11 @@ def get_transactions(
             detail="Wallet not found"
         )
     
-    transactions = (
-        db.query(Transaction)
+    rows = (
+        db.query(*TRANSACTION_COLUMNS)
         .filter(Transaction.wallet_id == wallet.wallet_id)
         .order_by(Transaction.created_at.desc())
         .all()
     )
     
-    return [
-        TransactionResponse(
-            transaction_id=t.tx_id,
-            type=t.tx_type.value,
-            amount=float(t.amount),
-            description=t.description,
-            created_at=t.created_at,
-        )
-        for t in transactions
-    ]
+    return json_response(transaction_list_adapter, rows)
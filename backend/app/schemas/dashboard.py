@@ -0,0 +1,47 @@
+"""
+Dashboard Schemas
+Only the fields the dashboard page renders
+"""
+
+from pydantic import BaseModel
+from typing import Optional, List
+from datetime import date
+
+
+class DashboardItem(BaseModel):
+    """
+    Schema for one of the user's listed items
+    """
+    item_id: int
+    title: str
+    image: Optional[str] = None  # First photo, if any
+    daily_deposit: float
+    is_active: bool
+    status: Optional[str] = None
+
+
+class DashboardBooking(BaseModel):
+    """
+    Schema for a booking card - `counterpart` is the other party
+    (the lender on rentals, the borrower on pending requests and lended items)
+    """
+    booking_id: int
+    item_id: int
+    item_title: Optional[str] = None
+    counterpart_id: int
+    counterpart_name: Optional[str] = None
+    start_date: date
+    end_date: date
+    total_deposit: float
+    status: str
+
+
+class DashboardResponse(BaseModel):
+    """
+    Schema for GET /dashboard - sections not requested with ?sections= are null
+    """
+    wallet_balance: Optional[float] = None
+    items: Optional[List[DashboardItem]] = None  # Items the user lists (active and inactive)
+    pending_requests: Optional[List[DashboardBooking]] = None  # Pending bookings on the user's items
+    rentals: Optional[List[DashboardBooking]] = None  # User is borrower: accepted / return pending
+    lended: Optional[List[DashboardBooking]] = None  # User is lender: accepted / return pending
@@ -2,9 +2,9 @@
 Dispute Schemas
 """
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional
-from datetime import datetime
+from datetime import date, datetime
 
 
 class DisputeCreate(BaseModel):
@@ -40,3 +40,96 @@ class DisputeResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class DisputeParty(BaseModel):
+    """
+    A user involved in a disputed booking
+    """
+    user_id: int
+    full_name: str
+    email: str
+
+    class Config:
+        from_attributes = True
+
+
+class DisputeBookingSummary(BaseModel):
+    """
+    The disputed booking and its item
+    """
+    booking_id: int
+    status: str
+    start_date: date
+    end_date: date
+    total_deposit: float
+    item_id: int
+    item_title: Optional[str] = None
+
+
+class DisputeQueueEntry(DisputeResponse):
+    """
+    Dispute with everything an admin needs to review it
+    """
+    booking: DisputeBookingSummary
+    borrower: Optional[DisputeParty] = None
+    lender: Optional[DisputeParty] = None
+
+
+class DisputeQueuePage(BaseModel):
+    """
+    One page of the admin dispute queue (oldest first)
+    Pass next_cursor back as `cursor` for the next page; None on the last page.
+    """
+    disputes: list[DisputeQueueEntry]
+    next_cursor: Optional[str] = None
+
+
+class DisputeSettle(BaseModel):
+    """
+    Schema for an admin settling a dispute (moves the deposit/penalty between wallets)
+    """
+    status: Optional[str] = None  # "resolved" or "rejected"; omit to keep the dispute's recorded outcome
+    penalty_amount: Optional[float] = None  # Part of the deposit awarded to the lender; omit for the default
+    resolution_notes: Optional[str] = None
+
+
+class DisputeSettleItem(DisputeSettle):
+    """
+    One dispute in a batch settlement
+    """
+    dispute_id: int
+
+
+class DisputeSettleBatch(BaseModel):
+    """
+    Schema for settling many disputes in one call
+    """
+    decisions: list[DisputeSettleItem] = []
+    include_unsettled: bool = False  # Also settle every resolved/rejected dispute not settled yet
+    max_disputes: Optional[int] = Field(None, ge=1)  # Clamped to SETTLE_MAX_DISPUTES (the default)
+
+
+class SettlementResponse(BaseModel):
+    """
+    Outcome of settling one dispute
+    """
+    dispute_id: int
+    settled: bool
+    status: Optional[str] = None
+    booking_id: Optional[int] = None
+    penalty: float = 0
+    refund: float = 0
+    error: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+
+class DisputeSettleBatchResponse(BaseModel):
+    """
+    Outcome of a batch settlement
+    """
+    settled: int
+    failed: int
+    results: list[SettlementResponse]
@@ -2,7 +2,7 @@
 Item Schemas (Request/Response Models)
 """
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, model_validator
 from typing import Optional, List
 from datetime import datetime
 
@@ -20,6 +20,14 @@ class ItemCreate(BaseModel):
     daily_deposit: float  # Daily deposit amount
     images: Optional[List[str]] = None  # URLs of item photos
     location: str  # City or area
+    latitude: Optional[float] = Field(None, ge=-90, le=90)  # Optional position for proximity search
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
+
+    @model_validator(mode="after")
+    def coordinates_together(self):
+        if (self.latitude is None) != (self.longitude is None):
+            raise ValueError("latitude and longitude must be given together")
+        return self
 
 
 class ItemUpdate(BaseModel):
@@ -35,8 +43,16 @@ class ItemUpdate(BaseModel):
     daily_deposit: Optional[float] = None
     images: Optional[List[str]] = None
     location: Optional[str] = None
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
     is_active: Optional[bool] = None  # Enable/disable item
 
+    @model_validator(mode="after")
+    def coordinates_together(self):
+        if (self.latitude is None) != (self.longitude is None):
+            raise ValueError("latitude and longitude must be given together")
+        return self
+
 
 class ItemResponse(BaseModel):
     """
@@ -53,9 +69,51 @@ class ItemResponse(BaseModel):
     daily_deposit: float
     images: Optional[List[str]]
     location: str
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
     is_active: bool
     status: Optional[str] = "available"  # availability status: available, rented, dispute, inactive
     created_at: datetime
 
     class Config:
         from_attributes = True
+
+
+class ItemBatchResponse(BaseModel):
+    """
+    Schema for GET /items/batch - items in the order their IDs were requested
+    """
+    items: List[ItemResponse]
+    missing: List[int]  # Requested IDs with no item
+
+
+class NearbyItem(ItemResponse):
+    """
+    Schema for an item returned by proximity search
+    """
+    distance_km: float  # Great-circle distance from the search point
+
+
+class NearbyItemPage(BaseModel):
+    """
+    Schema for one page of proximity search results, nearest first
+    """
+    items: List[NearbyItem]
+    next_cursor: Optional[str] = None  # Pass back as ?cursor= for the next page; None on the last page
+
+
+class ItemBulkError(BaseModel):
+    """
+    Schema for a row that could not be imported during bulk creation
+    """
+    row: int  # 1-based position of the row in the uploaded array/CSV
+    error: str  # Why the row was rejected
+
+
+class ItemBulkResponse(BaseModel):
+    """
+    Schema for bulk item creation response
+    """
+    created: int  # Number of items inserted
+    item_ids: List[int]  # IDs of created items, in upload order
+    errors: List[ItemBulkError]  # Rows that were skipped
@@ -0,0 +1,25 @@
+"""
+Lender Stats Schemas
+"""
+
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+
+
+class LenderStatsResponse(BaseModel):
+    """
+    Schema for a lender's dashboard / trust counters
+    """
+    lender_id: int
+    item_count: int  # Items ever listed
+    active_item_count: int  # Items currently listed
+    rental_count: int  # Bookings accepted
+    completed_rental_count: int  # Bookings returned
+    total_earnings: float  # Sum of earnings
+    dispute_count: int  # Disputes on the lender's bookings
+    dispute_rate: float  # Disputes per accepted rental
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
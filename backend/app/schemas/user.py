@@ -4,7 +4,7 @@ These define what data clients send to the API and what the API returns.
 """
 
 from pydantic import BaseModel, EmailStr
-from typing import Optional
+from typing import Optional, List
 from datetime import datetime
 
 
@@ -48,6 +48,14 @@ class UserResponse(BaseModel):
         from_attributes = True  # Can convert SQLAlchemy models to this schema
 
 
+class UserBatchResponse(BaseModel):
+    """
+    Schema for GET /auth/users/batch - users in the order their IDs were requested
+    """
+    users: List[UserResponse]
+    missing: List[int]  # Requested IDs with no user
+
+
 class TokenResponse(BaseModel):
     """
     Schema for login response
@@ -0,0 +1,2 @@
+# Services module
+# Shared infrastructure used by the routes (caching, etc.)
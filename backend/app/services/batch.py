@@ -0,0 +1,68 @@
+"""
+Batch Lookups by ID
+Helpers for the GET .../batch?ids= endpoints: one IN query for a list of
+IDs instead of one request per ID.
+
+IDs may be passed comma separated (?ids=3,1,2), repeated (?ids=3&ids=1) or
+both. Duplicates are coalesced - each ID is fetched and returned once - and
+results follow the order in which IDs were first requested.
+"""
+
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+
+from app.config.settings import get_settings
+
+MAX_ID = 2 ** 31 - 1  # Primary keys are 32-bit INTEGER columns
+
+
+def parse_ids(values: list[str], max_ids: int = None) -> list[int]:
+    """
+    Distinct IDs from the raw ?ids= values, in first-seen order
+
+    Raises:
+        HTTPException 400 for a non-integer or out of range ID (outside
+        1..MAX_ID), no IDs, or more than max_ids distinct IDs
+    """
+    max_ids = max_ids or get_settings().batch_max_ids
+    ids = {}
+    for value in values:
+        for part in value.split(","):
+            part = part.strip()
+            if not part:
+                continue
+            try:
+                parsed = int(part)
+            except ValueError:
+                parsed = None
+            if parsed is None or not 1 <= parsed <= MAX_ID:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid ID: {part!r}")
+            ids[parsed] = None
+    if not ids:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No IDs given")
+    if len(ids) > max_ids:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {max_ids} distinct IDs per request"
+        )
+    return list(ids)
+
+
+def fetch_by_ids(db: Session, columns: list, key_column, ids: list[int]) -> tuple[list, list[int]]:
+    """
+    Rows for `ids` with a single IN query
+
+    Args:
+        db: Database session
+        columns: Column expressions to select (see schema_columns)
+        key_column: Primary key column matched against `ids`
+        ids: Distinct IDs, in the order results should come back
+
+    Returns:
+        (rows in `ids` order, IDs that matched no row)
+    """
+    key = key_column.key
+    by_id = {getattr(row, key): row for row in db.query(*columns).filter(key_column.in_(ids))}
+    found = [by_id[i] for i in ids if i in by_id]
+    missing = [i for i in ids if i not in by_id]
+    return found, missing
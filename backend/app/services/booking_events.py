@@ -0,0 +1,44 @@
+"""
+Booking Events
+Outbox events for booking changes; consumers such as
+app/services/notifications.py subscribe to them.
+
+    booking.created         a borrower requested an item
+    booking.status_changed  accepted / rejected / return requested / returned
+
+Payloads carry IDs and statuses only; handlers load anything else they need.
+Item cache invalidation stays inline in the routes: it must happen before the
+version bump, and every process has to clear its own in-memory cache.
+"""
+
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from app.models.booking import Booking, BookingStatusEnum
+from app.services import outbox
+
+BOOKING_CREATED = "booking.created"
+BOOKING_STATUS_CHANGED = "booking.status_changed"
+
+
+def _payload(booking: Booking, previous_status: Optional[BookingStatusEnum] = None) -> dict:
+    return {
+        "booking_id": booking.booking_id,
+        "item_id": booking.item_id,
+        "borrower_id": booking.borrower_id,
+        "lender_id": booking.lender_id,
+        "status": booking.status.value,
+        "previous_status": previous_status.value if previous_status else None,
+    }
+
+
+def booking_created(db: Session, booking: Booking):
+    """Queue booking.created (call after the booking is flushed, before commit)"""
+    outbox.emit(db, BOOKING_CREATED, _payload(booking), aggregate_id=booking.booking_id)
+
+
+def booking_status_changed(db: Session, booking: Booking, previous_status: BookingStatusEnum):
+    """Queue booking.status_changed in the transaction that changed it"""
+    outbox.emit(db, BOOKING_STATUS_CHANGED, _payload(booking, previous_status), aggregate_id=booking.booking_id)
+
@@ -0,0 +1,232 @@
+"""
+Response Cache
+Pluggable cache for serialized API payloads (JSON bytes).
+
+Backends:
+- MemoryCache: in-process TTL + LRU (default)
+- RedisCache: any server speaking the Redis protocol, or a local stand-in
+  client object exposing get/set/delete/scan_iter (e.g. fakeredis)
+- NullCache: caching disabled
+
+Select with ITEM_CACHE_BACKEND=memory|redis|none.
+"""
+
+from collections import OrderedDict
+from typing import Optional
+import threading
+import time
+
+from app.config.settings import get_settings
+
+
+class CacheBackend:
+    """
+    Base class - keeps hit/miss counters, subclasses implement storage
+    """
+    name = "base"
+
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+        self._stats_lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "sets": 0, "invalidations": 0}
+
+    def _count(self, counter: str, amount: int = 1):
+        with self._stats_lock:
+            self._stats[counter] += amount
+
+    def get(self, key: str) -> Optional[bytes]:
+        value = self._get(key)
+        self._count("hits" if value is not None else "misses")
+        return value
+
+    def set(self, key: str, value: bytes, ttl: Optional[int] = None):
+        self._set(key, value, self.ttl if ttl is None else ttl)
+        self._count("sets")
+
+    def delete(self, *keys: str):
+        if keys:
+            self._delete(keys)
+            self._count("invalidations", len(keys))
+
+    def delete_prefix(self, prefix: str):
+        self._count("invalidations", self._delete_prefix(prefix))
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            stats = dict(self._stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        stats["backend"] = self.name
+        stats["ttl_seconds"] = self.ttl
+        return stats
+
+    # Storage hooks
+    def _get(self, key):
+        raise NotImplementedError
+
+    def _set(self, key, value, ttl):
+        raise NotImplementedError
+
+    def _delete(self, keys):
+        raise NotImplementedError
+
+    def _delete_prefix(self, prefix) -> int:
+        raise NotImplementedError
+
+
+class NullCache(CacheBackend):
+    """Cache that never stores anything"""
+    name = "none"
+
+    def _get(self, key):
+        return None
+
+    def _set(self, key, value, ttl):
+        pass
+
+    def _delete(self, keys):
+        pass
+
+    def _delete_prefix(self, prefix):
+        return 0
+
+
+class MemoryCache(CacheBackend):
+    """
+    In-process cache with per-entry TTL and LRU eviction
+    Each worker process has its own copy, so entries can lag other workers by up to `ttl`.
+    """
+    name = "memory"
+
+    def __init__(self, ttl: int, max_entries: int):
+        super().__init__(ttl)
+        self.max_entries = max_entries
+        self._data = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+
+    def _get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def _set(self, key, value, ttl):
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def _delete(self, keys):
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def _delete_prefix(self, prefix):
+        with self._lock:
+            doomed = [key for key in self._data if key.startswith(prefix)]
+            for key in doomed:
+                del self._data[key]
+        return len(doomed)
+
+    def stats(self) -> dict:
+        stats = super().stats()
+        stats["entries"] = len(self._data)
+        stats["max_entries"] = self.max_entries
+        return stats
+
+
+class RedisCache(CacheBackend):
+    """
+    Cache stored in a Redis-protocol server
+    Pass `client` to plug in a local stand-in; otherwise connects to `url`.
+    """
+    name = "redis"
+
+    def __init__(self, ttl: int, url: Optional[str] = None, client=None, namespace: str = "shareit:"):
+        super().__init__(ttl)
+        if client is None:
+            try:
+                import redis
+            except ImportError as e:
+                raise RuntimeError("ITEM_CACHE_BACKEND=redis requires the 'redis' package") from e
+            client = redis.Redis.from_url(url or "redis://localhost:6379/0")
+        self.client = client
+        self.namespace = namespace
+
+    def _get(self, key):
+        return self.client.get(self.namespace + key)
+
+    def _set(self, key, value, ttl):
+        self.client.set(self.namespace + key, value, ex=ttl)
+
+    def _delete(self, keys):
+        self.client.delete(*(self.namespace + key for key in keys))
+
+    def _delete_prefix(self, prefix):
+        doomed = list(self.client.scan_iter(match=f"{self.namespace}{prefix}*", count=500))
+        if doomed:
+            self.client.delete(*doomed)
+        return len(doomed)
+
+
+def build_cache() -> CacheBackend:
+    """Create the cache backend selected in settings"""
+    settings = get_settings()
+    backend = settings.item_cache_backend.lower()
+    ttl = settings.item_cache_ttl_seconds
+
+    if backend == "none":
+        return NullCache(ttl)
+    if backend == "redis":
+        return RedisCache(ttl, url=settings.redis_url)
+    return MemoryCache(ttl, max_entries=settings.item_cache_max_entries)
+
+
+# Shared cache for public item reads
+item_cache = build_cache()
+
+
+# ============ Item Cache Keys ============
+
+ITEM_LIST_PREFIX = "items:list:"
+
+
+def item_list_key(skip: int, limit: int) -> str:
+    return f"{ITEM_LIST_PREFIX}{skip}:{limit}"
+
+
+def popular_items_key(limit: int) -> str:
+    return f"{ITEM_LIST_PREFIX}popular:{limit}"
+
+
+def item_recommendations_key(item_id: int, limit: int) -> str:
+    return f"{ITEM_LIST_PREFIX}recs:{item_id}:{limit}"
+
+
+def item_detail_key(item_id: int) -> str:
+    return f"items:detail:{item_id}"
+
+
+def lender_items_key(lender_id: int) -> str:
+    return f"items:lender:{lender_id}"
+
+
+def invalidate_item(lender_id: int, item_id: Optional[int] = None):
+    """
+    Drop every cached payload that can contain the given item
+    Call after the change is committed. Omit item_id for newly created items.
+    """
+    invalidate_items(lender_id, [item_id] if item_id is not None else [])
+
+
+def invalidate_items(lender_id: int, item_ids: list[int]):
+    """Same as invalidate_item for several items of one lender (e.g. all of a deleted user's)"""
+    item_cache.delete(lender_items_key(lender_id), *[item_detail_key(item_id) for item_id in item_ids])
+    item_cache.delete_prefix(ITEM_LIST_PREFIX)
@@ -0,0 +1,114 @@
+"""
+Geo Helpers
+Geohash encoding and radius search support for GET /items/nearby.
+
+Items store a 12-character geohash next to latitude/longitude. A geohash
+prefix is a rectangular cell, and every item inside a cell has a geohash
+starting with that prefix, so a plain B-tree index on items.geohash answers
+"items in this cell" as a range scan on any database - no PostGIS needed.
+
+A radius query covers the circle's bounding box with the finest cells that
+need at most MAX_CELLS ranges, scans them, and filters/sorts the candidates
+by exact haversine distance.
+"""
+
+import math
+from typing import Optional
+
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+PRECISION = 12  # Stored geohash length (~4 cm cells)
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE_LAT = math.pi * EARTH_RADIUS_KM / 180
+MAX_CELLS = 16  # Index ranges scanned per radius query
+
+
+def encode(lat: float, lng: float, precision: int = PRECISION) -> str:
+    """Geohash of a point"""
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    value = 0
+    even = True  # Bits alternate longitude, latitude, starting with longitude
+    while len(chars) < precision:
+        interval, coord = (lng_range, lng) if even else (lat_range, lat)
+        mid = (interval[0] + interval[1]) / 2
+        value <<= 1
+        if coord >= mid:
+            value |= 1
+            interval[0] = mid
+        else:
+            interval[1] = mid
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(BASE32[value])
+            bits = 0
+            value = 0
+    return "".join(chars)
+
+
+def geohash_for(lat: Optional[float], lng: Optional[float]) -> Optional[str]:
+    """Geohash to store for an item (None when it has no coordinates)"""
+    if lat is None or lng is None:
+        return None
+    return encode(lat, lng)
+
+
+def cell_size(precision: int) -> tuple[float, float]:
+    """(height, width) in degrees of a geohash cell at this precision"""
+    lng_bits = (5 * precision + 1) // 2
+    lat_bits = 5 * precision // 2
+    return 180.0 / (1 << lat_bits), 360.0 / (1 << lng_bits)
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Great-circle distance between two points in kilometres"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lng2 - lng1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def bounding_box(lat: float, lng: float, radius_km: float) -> tuple[float, float, float, float]:
+    """(min_lat, max_lat, min_lng, max_lng) enclosing the circle (clamped, no antimeridian wrap)"""
+    d_lat = radius_km / KM_PER_DEGREE_LAT
+    cos_lat = math.cos(math.radians(min(abs(lat) + d_lat, 89.9)))
+    d_lng = min(radius_km / (KM_PER_DEGREE_LAT * cos_lat), 180.0)
+    return max(lat - d_lat, -90.0), min(lat + d_lat, 90.0), max(lng - d_lng, -180.0), min(lng + d_lng, 180.0)
+
+
+def covering_cells(lat: float, lng: float, radius_km: float) -> list[str]:
+    """Geohash prefixes whose cells together cover the circle"""
+    min_lat, max_lat, min_lng, max_lng = bounding_box(lat, lng, radius_km)
+
+    # Finest precision that still covers the box with at most MAX_CELLS cells
+    precision = 1
+    for candidate in range(PRECISION, 0, -1):
+        height, width = cell_size(candidate)
+        rows = math.floor((max_lat - min_lat) / height) + 2
+        cols = math.floor((max_lng - min_lng) / width) + 2
+        if rows * cols <= MAX_CELLS:
+            precision = candidate
+            break
+    height, width = cell_size(precision)
+
+    cells = set()
+    row = min_lat
+    while True:
+        col = min_lng
+        while True:
+            cells.add(encode(min(row, max_lat), min(col, max_lng), precision))
+            if col >= max_lng:
+                break
+            col += width
+        if row >= max_lat:
+            break
+        row += height
+    return sorted(cells)
+
+
+def prefix_range(prefix: str) -> tuple[str, str]:
+    """Inclusive (low, high) bounds of every stored geohash starting with `prefix`"""
+    return prefix, prefix + BASE32[-1] * (PRECISION - len(prefix))
@@ -0,0 +1,182 @@
+"""
+Lender Stats
+Incremental maintenance of the lender_stats table.
+
+record(db, lender_id, ...) adds deltas with a single upsert
+(INSERT ... ON CONFLICT DO UPDATE SET col = col + delta) in the caller's
+session, so the counters commit or roll back together with the change that
+caused them. The upsert is atomic, so concurrent requests never lose updates.
+
+rebuild() recomputes every row from items, bookings, transactions and
+disputes (`python manage.py stats rebuild`), for backfills and drift repair.
+
+Usage:
+    from app.services import lender_stats
+    lender_stats.record(db, lender_id, rental_count=1, total_earnings=deposit)
+"""
+
+from datetime import datetime
+from decimal import Decimal
+from typing import Optional
+
+from sqlalchemy import delete, func, insert, select, text, update
+from sqlalchemy.orm import Session
+
+from app.models.booking import Booking, BookingStatusEnum
+from app.models.dispute import Dispute
+from app.models.item import Item
+from app.models.lender_stats import LenderStats
+from app.models.transaction import Transaction, TransactionTypeEnum
+
+COUNTERS = (
+    "item_count",
+    "active_item_count",
+    "rental_count",
+    "completed_rental_count",
+    "total_earnings",
+    "dispute_count",
+)
+# Bookings whose deposit was paid at some point (counted as rentals)
+RENTED_STATUSES = (
+    BookingStatusEnum.ACCEPTED,
+    BookingStatusEnum.AWAITING_PICKUP,
+    BookingStatusEnum.PICKED_UP,
+    BookingStatusEnum.RETURN_PENDING,
+    BookingStatusEnum.RETURNED,
+)
+REBUILD_BATCH = 5000
+
+
+def _upsert_statement(dialect: str, values: dict, deltas: dict):
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        return None
+    stmt = dialect_insert(LenderStats).values(**values)
+    return stmt.on_conflict_do_update(
+        index_elements=[LenderStats.lender_id],
+        set_={
+            **{name: getattr(LenderStats, name) + delta for name, delta in deltas.items()},
+            "updated_at": values["updated_at"],
+        },
+    )
+
+
+def record(db: Session, lender_id: Optional[int], **deltas):
+    """
+    Add deltas to a lender's counters (creating the row on first use)
+    Runs in the caller's transaction - commit as usual afterwards.
+
+    Args:
+        db: Database session
+        lender_id: Lender whose stats changed
+        **deltas: Counter name -> amount to add (may be negative)
+    """
+    deltas = {name: delta for name, delta in deltas.items() if delta}
+    if lender_id is None or not deltas:
+        return
+    unknown = set(deltas) - set(COUNTERS)
+    if unknown:
+        raise ValueError(f"Unknown lender stats counters: {sorted(unknown)}")
+
+    now = datetime.utcnow()
+    values = {name: 0 for name in COUNTERS}
+    values.update(deltas, lender_id=lender_id, updated_at=now)
+
+    stmt = _upsert_statement(db.get_bind().dialect.name, values, deltas)
+    if stmt is not None:
+        db.execute(stmt)
+        return
+
+    # Dialects without ON CONFLICT: update, then insert if there was no row
+    result = db.execute(
+        update(LenderStats)
+        .where(LenderStats.lender_id == lender_id)
+        .values(**{name: getattr(LenderStats, name) + delta for name, delta in deltas.items()}, updated_at=now)
+    )
+    if result.rowcount == 0:
+        db.execute(insert(LenderStats).values(**values))
+
+
+def forget(db: Session, lender_id: int):
+    """Drop a lender's row (user deleted)"""
+    db.execute(delete(LenderStats).where(LenderStats.lender_id == lender_id))
+
+
+def get(db: Session, lender_id: int) -> dict:
+    """Stats for one lender by primary key - zeros when the lender has none yet"""
+    row = db.get(LenderStats, lender_id)
+    if row is None:
+        return {"lender_id": lender_id, **{name: 0 for name in COUNTERS}, "dispute_rate": 0.0, "updated_at": None}
+    return {
+        "lender_id": lender_id,
+        **{name: getattr(row, name) for name in COUNTERS},
+        "dispute_rate": row.dispute_rate,
+        "updated_at": row.updated_at,
+    }
+
+
+def _grouped(db: Session, query, lender_id: Optional[int], lender_column) -> dict:
+    if lender_id is not None:
+        query = query.where(lender_column == lender_id)
+    return {row[0]: row[1] for row in db.execute(query.group_by(lender_column))}
+
+
+def rebuild(db: Session, lender_id: Optional[int] = None) -> int:
+    """
+    Recompute stats from the source tables (all lenders, or just one) and commit
+
+    Returns:
+        Number of lender rows written
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        # Hold off incremental upserts until the rebuilt rows commit, so none are lost in between
+        db.execute(text("LOCK TABLE lender_stats IN EXCLUSIVE MODE"))
+
+    active = _grouped(db, select(Item.lender_id, func.count()).where(Item.is_active.is_(True)),
+                      lender_id, Item.lender_id)
+    items = _grouped(db, select(Item.lender_id, func.count()), lender_id, Item.lender_id)
+    rentals = _grouped(db, select(Booking.lender_id, func.count()).where(Booking.status.in_(RENTED_STATUSES)),
+                       lender_id, Booking.lender_id)
+    completed = _grouped(
+        db, select(Booking.lender_id, func.count()).where(Booking.status == BookingStatusEnum.RETURNED),
+        lender_id, Booking.lender_id,
+    )
+    earnings = _grouped(
+        db, select(Transaction.user_id, func.sum(Transaction.amount))
+        .where(Transaction.tx_type == TransactionTypeEnum.EARNING),
+        lender_id, Transaction.user_id,
+    )
+    disputes = _grouped(db, select(Booking.lender_id, func.count()).join(Dispute, Dispute.booking_id == Booking.booking_id),
+                        lender_id, Booking.lender_id)
+
+    now = datetime.utcnow()
+    lenders = sorted(set(items) | set(rentals) | set(earnings) | set(disputes))
+    rows = [
+        {
+            "lender_id": lender,
+            "item_count": items.get(lender, 0),
+            "active_item_count": active.get(lender, 0),
+            "rental_count": rentals.get(lender, 0),
+            "completed_rental_count": completed.get(lender, 0),
+            "total_earnings": earnings.get(lender) or Decimal("0"),
+            "dispute_count": disputes.get(lender, 0),
+            "updated_at": now,
+        }
+        for lender in lenders
+    ]
+
+    try:
+        if lender_id is None:
+            db.execute(delete(LenderStats))
+        else:
+            forget(db, lender_id)
+        for start in range(0, len(rows), REBUILD_BATCH):
+            db.execute(insert(LenderStats), rows[start:start + REBUILD_BATCH])
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return len(rows)
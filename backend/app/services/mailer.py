@@ -0,0 +1,129 @@
+"""
+Mail Transports
+Pluggable delivery for the notification dispatcher, selected with
+NOTIFICATIONS_TRANSPORT:
+
+- console: log every message (development default)
+- smtp: send through SMTP_HOST:SMTP_PORT, one connection per batch. For local
+  testing run a debugging server that prints what it receives:
+      python -m aiosmtpd -n -l localhost:1025
+- none: drop messages (notifications are still queued and marked sent)
+
+Transports are synchronous and called from the dispatcher's own thread pool.
+"""
+
+from dataclasses import dataclass
+from email.message import EmailMessage
+from typing import Optional
+import logging
+import smtplib
+
+from app.config.settings import get_settings
+
+logger = logging.getLogger("shareit.mail")
+
+
+@dataclass
+class Message:
+    to: str
+    subject: str
+    body: str
+
+
+class Transport:
+    """Base transport: send_many returns one error (None = delivered) per message"""
+
+    name = "base"
+
+    def send_many(self, messages: list[Message]) -> list[Optional[str]]:
+        raise NotImplementedError
+
+
+class NullTransport(Transport):
+    name = "none"
+
+    def send_many(self, messages: list[Message]) -> list[Optional[str]]:
+        return [None] * len(messages)
+
+
+class ConsoleTransport(Transport):
+    name = "console"
+
+    def send_many(self, messages: list[Message]) -> list[Optional[str]]:
+        for message in messages:
+            logger.info("To: %s | Subject: %s\n%s", message.to, message.subject, message.body)
+        return [None] * len(messages)
+
+
+class SMTPTransport(Transport):
+    name = "smtp"
+
+    def __init__(self, host: str, port: int, sender: str, username: Optional[str] = None,
+                 password: Optional[str] = None, starttls: bool = False, timeout: float = 10.0):
+        self.host = host
+        self.port = port
+        self.sender = sender
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.timeout = timeout
+
+    def _build(self, message: Message) -> EmailMessage:
+        email = EmailMessage()
+        email["From"] = self.sender
+        email["To"] = message.to
+        email["Subject"] = message.subject
+        email.set_content(message.body)
+        return email
+
+    def send_many(self, messages: list[Message]) -> list[Optional[str]]:
+        """
+        Send a batch over one connection
+        A connection failure fails the whole batch; a rejected recipient only its message.
+        """
+        try:
+            smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        except (OSError, smtplib.SMTPException) as e:
+            return [f"SMTP connect failed: {e}"] * len(messages)
+
+        errors = []
+        try:
+            if self.starttls:
+                smtp.starttls()
+            if self.username:
+                smtp.login(self.username, self.password or "")
+            for message in messages:
+                try:
+                    smtp.send_message(self._build(message))
+                    errors.append(None)
+                except smtplib.SMTPRecipientsRefused as e:
+                    errors.append(f"Recipient refused: {e.recipients}")
+                except smtplib.SMTPResponseException as e:
+                    errors.append(f"SMTP {e.smtp_code}: {e.smtp_error!r}")
+        except (OSError, smtplib.SMTPException) as e:
+            errors.extend([f"SMTP error: {e}"] * (len(messages) - len(errors)))
+        finally:
+            try:
+                smtp.quit()
+            except (OSError, smtplib.SMTPException):
+                smtp.close()
+        return errors
+
+
+def build_transport() -> Transport:
+    """Create the transport selected in settings"""
+    settings = get_settings()
+    kind = settings.notifications_transport.lower()
+    if kind == "smtp":
+        return SMTPTransport(
+            settings.smtp_host,
+            settings.smtp_port,
+            settings.notifications_from,
+            username=settings.smtp_username,
+            password=settings.smtp_password,
+            starttls=settings.smtp_starttls,
+            timeout=settings.smtp_timeout_seconds,
+        )
+    if kind == "none":
+        return NullTransport()
+    return ConsoleTransport()
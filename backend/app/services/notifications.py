@@ -0,0 +1,466 @@
+"""
+Notifications
+Tells lenders about new booking requests and borrowers about accepted or
+rejected ones.
+
+- Queueing: outbox handlers for booking events insert notifications rows in
+  the outbox worker's transaction (never in the request's)
+- Digests: a notification waits NOTIFICATIONS_DIGEST_SECONDS; when a user's
+  oldest pending row is due, all of that user's pending rows go out as one
+  message - a lender with 50 new requests gets one email
+- Dispatch: an asyncio task claims due users in batches (FOR UPDATE SKIP
+  LOCKED), marks their rows "sending" and commits, then hands the messages to
+  the transport (app/services/mailer.py) on its own NOTIFICATIONS_CONCURRENCY
+  thread pool, so slow SMTP never occupies request threads or holds locks
+- Failures are retried with backoff; rows left "sending" by a crashed
+  process are reclaimed after NOTIFICATIONS_LEASE_SECONDS (at-least-once)
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Optional
+import asyncio
+import logging
+import math
+import threading
+import time
+
+from sqlalchemy import func, update
+from sqlalchemy.orm import Session, aliased
+
+from app.config.settings import get_settings
+from app.models.booking import Booking
+from app.models.item import Item
+from app.models.notification import Notification, PENDING, SENDING, SENT, FAILED
+from app.models.outbox import OutboxEvent
+from app.models.user import User
+from app.services import outbox
+from app.services.booking_events import BOOKING_CREATED, BOOKING_STATUS_CHANGED
+from app.services.mailer import Message, Transport, build_transport
+
+logger = logging.getLogger("shareit.notifications")
+
+BOOKING_REQUESTED = "booking_requested"
+BOOKING_ACCEPTED = "booking_accepted"
+BOOKING_REJECTED = "booking_rejected"
+
+# kind -> (subject of a single message, line describing it)
+TEMPLATES = {
+    BOOKING_REQUESTED: (
+        "New booking request for '{item_title}'",
+        "{borrower_name} requested '{item_title}' from {start_date} to {end_date} "
+        "(deposit PKR {total_deposit}).",
+    ),
+    BOOKING_ACCEPTED: (
+        "Your booking for '{item_title}' was accepted",
+        "{lender_name} accepted your request for '{item_title}' ({start_date} to {end_date}). "
+        "The deposit of PKR {total_deposit} has been taken from your wallet.",
+    ),
+    BOOKING_REJECTED: (
+        "Your booking for '{item_title}' was declined",
+        "{lender_name} declined your request for '{item_title}' ({start_date} to {end_date}).",
+    ),
+}
+MAX_BACKOFF_SECONDS = 6 * 3600
+
+Lender = aliased(User)
+Borrower = aliased(User)
+
+
+# ============ Queueing (outbox handlers) ============
+
+def enqueue(db: Session, user_id: int, kind: str, payload: dict, now: Optional[datetime] = None):
+    """Queue a notification in the caller's transaction"""
+    now = now or datetime.utcnow()
+    db.add(Notification(
+        user_id=user_id,
+        kind=kind,
+        payload=payload,
+        status=PENDING,
+        attempts=0,
+        send_after=now + timedelta(seconds=get_settings().notifications_digest_seconds),
+        created_at=now,
+    ))
+
+
+def booking_details(db: Session, booking_id: int) -> Optional[dict]:
+    """What the messages show about a booking (JSON-safe), or None if it's gone"""
+    row = (
+        db.query(
+            Booking.start_date,
+            Booking.end_date,
+            Booking.total_deposit,
+            Item.title.label("item_title"),
+            Lender.full_name.label("lender_name"),
+            Borrower.full_name.label("borrower_name"),
+        )
+        .outerjoin(Item, Item.item_id == Booking.item_id)
+        .outerjoin(Lender, Lender.user_id == Booking.lender_id)
+        .outerjoin(Borrower, Borrower.user_id == Booking.borrower_id)
+        .filter(Booking.booking_id == booking_id)
+        .first()
+    )
+    if row is None:
+        return None
+    return {
+        "booking_id": booking_id,
+        "item_title": row.item_title or "an item",
+        "lender_name": row.lender_name or "The lender",
+        "borrower_name": row.borrower_name or "A borrower",
+        "start_date": row.start_date.isoformat(),
+        "end_date": row.end_date.isoformat(),
+        "total_deposit": str(row.total_deposit),
+    }
+
+
+@outbox.subscribe(BOOKING_CREATED)
+def queue_booking_requested(db: Session, event: OutboxEvent):
+    if not get_settings().notifications_enabled:
+        return
+    details = booking_details(db, event.payload["booking_id"])
+    if details is not None:
+        enqueue(db, event.payload["lender_id"], BOOKING_REQUESTED, details)
+
+
+@outbox.subscribe(BOOKING_STATUS_CHANGED)
+def queue_booking_decision(db: Session, event: OutboxEvent):
+    kind = {"accepted": BOOKING_ACCEPTED, "rejected": BOOKING_REJECTED}.get(event.payload["status"])
+    if kind is None or not get_settings().notifications_enabled:
+        return
+    details = booking_details(db, event.payload["booking_id"])
+    if details is not None:
+        enqueue(db, event.payload["borrower_id"], kind, details)
+
+
+# ============ Rendering ============
+
+def render(name: str, email: str, notifications: list[Notification]) -> Message:
+    """One message for all of a user's pending notifications"""
+    first_name = (name or "").split(" ")[0] or "there"
+    lines = [TEMPLATES[n.kind][1].format(**n.payload) for n in notifications]
+    if len(notifications) == 1:
+        subject = TEMPLATES[notifications[0].kind][0].format(**notifications[0].payload)
+        summary = lines[0]
+    else:
+        if all(n.kind == BOOKING_REQUESTED for n in notifications):
+            subject = f"{len(notifications)} new booking requests"
+        else:
+            subject = f"{len(notifications)} updates on your bookings"
+        summary = "\n".join(f"- {line}" for line in lines)
+    body = f"Hi {first_name},\n\n{summary}\n\nOpen your ShareIt dashboard to respond.\n"
+    return Message(to=email, subject=subject, body=body)
+
+
+# ============ Dispatch ============
+
+@dataclass
+class Digest:
+    user_id: int
+    notification_ids: list[int]
+    message: Message
+
+
+def claim_due(db: Session, max_users: int, now: Optional[datetime] = None) -> list[Digest]:
+    """
+    Claim every pending notification of up to max_users users whose oldest
+    pending notification is due; rows are marked "sending" and committed
+    """
+    now = now or datetime.utcnow()
+    try:
+        users = [
+            user_id for (user_id,) in
+            db.query(Notification.user_id)
+            .filter(Notification.status == PENDING, Notification.send_after <= now)
+            .group_by(Notification.user_id)
+            .order_by(func.min(Notification.send_after))
+            .limit(max_users)
+        ]
+        if not users:
+            db.rollback()
+            return []
+
+        rows = (
+            db.query(Notification)
+            .filter(Notification.user_id.in_(users), Notification.status == PENDING)
+            .order_by(Notification.user_id, Notification.notification_id)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+        recipients = {
+            row.user_id: row
+            for row in db.query(User.user_id, User.email, User.full_name).filter(User.user_id.in_(users))
+        }
+
+        grouped: dict[int, list[Notification]] = {}
+        for row in rows:
+            row.status = SENDING
+            row.claimed_at = now
+            row.attempts += 1
+            grouped.setdefault(row.user_id, []).append(row)
+
+        digests = []
+        for user_id, notifications in grouped.items():
+            recipient = recipients.get(user_id)
+            if recipient is None:
+                for n in notifications:
+                    n.status = FAILED
+                    n.last_error = "User not found"
+                continue
+            digests.append(Digest(
+                user_id=user_id,
+                notification_ids=[n.notification_id for n in notifications],
+                message=render(recipient.full_name, recipient.email, notifications),
+            ))
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return digests
+
+
+def record_results(db: Session, results: list[tuple[Digest, Optional[str]]],
+                   max_attempts: int, retry_base_seconds: float) -> dict:
+    """
+    Mark sent digests' rows sent; failed ones go back to pending with backoff,
+    or to failed after max_attempts
+
+    Returns:
+        Counts of messages and notifications sent and messages failed
+    """
+    now = datetime.utcnow()
+    counts = {"messages": 0, "notifications": 0, "failed": 0}
+    sent = []
+    try:
+        for digest, error in results:
+            if error is None:
+                sent.extend(digest.notification_ids)
+                counts["messages"] += 1
+                counts["notifications"] += len(digest.notification_ids)
+                continue
+            counts["failed"] += 1
+            logger.warning("Notification to user %s failed: %s", digest.user_id, error)
+            rows = (
+                db.query(Notification)
+                .filter(Notification.notification_id.in_(digest.notification_ids), Notification.status == SENDING)
+                .all()
+            )
+            for row in rows:
+                row.last_error = error[:2000]
+                if row.attempts >= max_attempts:
+                    row.status = FAILED
+                else:
+                    row.status = PENDING
+                    row.send_after = now + outbox.backoff(row.attempts, retry_base_seconds)
+        if sent:
+            db.execute(
+                update(Notification)
+                .where(Notification.notification_id.in_(sent), Notification.status == SENDING)
+                .values(status=SENT, sent_at=now, last_error=None)
+            )
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return counts
+
+
+def reclaim_stale(db: Session, lease_seconds: int) -> int:
+    """Return rows stuck in "sending" (dispatcher died mid-send) to the queue"""
+    cutoff = datetime.utcnow() - timedelta(seconds=lease_seconds)
+    try:
+        result = db.execute(
+            update(Notification)
+            .where(Notification.status == SENDING, Notification.claimed_at < cutoff)
+            .values(status=PENDING, send_after=datetime.utcnow())
+        )
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return result.rowcount or 0
+
+
+def send(transport: Transport, digests: list[Digest]) -> list[tuple[Digest, Optional[str]]]:
+    """Hand digests to the transport; a raising transport fails the whole chunk"""
+    try:
+        errors = transport.send_many([digest.message for digest in digests])
+    except Exception as e:
+        errors = [f"{e.__class__.__name__}: {e}"] * len(digests)
+    return list(zip(digests, errors))
+
+
+def queue_status(db: Session) -> dict:
+    """Notifications per status and the age of the oldest pending one"""
+    by_status = dict(db.query(Notification.status, func.count()).group_by(Notification.status).all())
+    oldest = db.query(func.min(Notification.created_at)).filter(Notification.status == PENDING).scalar()
+    return {
+        "pending": by_status.get(PENDING, 0),
+        "sending": by_status.get(SENDING, 0),
+        "sent": by_status.get(SENT, 0),
+        "failed": by_status.get(FAILED, 0),
+        "oldest_pending_seconds": round((datetime.utcnow() - oldest).total_seconds(), 1) if oldest else None,
+    }
+
+
+# ============ Dispatcher ============
+
+class NotificationDispatcher:
+    """
+    asyncio task sending due digests. Claiming and recording run in the
+    request thread pool (short transactions); transport calls run on the
+    dispatcher's own executor, at most `concurrency` at a time.
+    """
+
+    def __init__(self, transport: Transport, batch_size: int, concurrency: int, poll_interval: float,
+                 max_attempts: int, retry_base_seconds: float, lease_seconds: int):
+        self.transport = transport
+        self.batch_size = batch_size
+        self.concurrency = max(1, concurrency)
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self.lease_seconds = lease_seconds
+        self.counters = {"rounds": 0, "messages": 0, "notifications": 0, "failed": 0, "reclaimed": 0, "errors": 0}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._stopping = False
+        self._last_reclaim = 0.0
+        self._lock = threading.Lock()
+
+    def start(self):
+        self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="notifications")
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._task = asyncio.get_running_loop().create_task(self._run(), name="notification-dispatcher")
+
+    async def stop(self, timeout: float = 30.0):
+        """Finish the round in progress (claimed rows get recorded) and exit"""
+        if self._task is None:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        try:
+            await asyncio.wait_for(self._task, timeout)
+        except asyncio.TimeoutError:
+            self._task.cancel()  # Claimed rows are picked up again after the lease
+        self._task = None
+        self._executor.shutdown(wait=False)
+
+    def _claim(self) -> list[Digest]:
+        from app.config.database import SessionLocal
+
+        db = SessionLocal()
+        try:
+            if time.monotonic() - self._last_reclaim > self.lease_seconds / 2:
+                self._last_reclaim = time.monotonic()
+                reclaimed = reclaim_stale(db, self.lease_seconds)
+                if reclaimed:
+                    logger.warning("Reclaimed %s notifications stuck in sending", reclaimed)
+                    with self._lock:
+                        self.counters["reclaimed"] += reclaimed
+            return claim_due(db, self.batch_size)
+        finally:
+            db.close()
+
+    def _record(self, results: list[tuple[Digest, Optional[str]]]):
+        from app.config.database import SessionLocal
+
+        db = SessionLocal()
+        try:
+            counts = record_results(db, results, self.max_attempts, self.retry_base_seconds)
+        finally:
+            db.close()
+        with self._lock:
+            self.counters["rounds"] += 1
+            for name, value in counts.items():
+                self.counters[name] += value
+
+    async def dispatch_round(self) -> int:
+        """Claim, send and record one batch; returns the number of users claimed"""
+        from fastapi.concurrency import run_in_threadpool
+
+        digests = await run_in_threadpool(self._claim)
+        if not digests:
+            return 0
+        loop = asyncio.get_running_loop()
+        size = math.ceil(len(digests) / self.concurrency)
+        chunks = [digests[i:i + size] for i in range(0, len(digests), size)]
+        sent = await asyncio.gather(*(
+            loop.run_in_executor(self._executor, send, self.transport, chunk) for chunk in chunks
+        ))
+        await run_in_threadpool(self._record, [result for chunk in sent for result in chunk])
+        return len(digests)
+
+    async def _run(self):
+        while not self._stopping:
+            self._wakeup.clear()
+            try:
+                claimed = await self.dispatch_round()
+            except Exception:
+                with self._lock:
+                    self.counters["errors"] += 1
+                logger.exception("Notification dispatch round failed")
+                claimed = 0
+            if claimed >= self.batch_size:
+                continue  # Backlog: keep sending
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "running": self._task is not None,
+                "transport": self.transport.name,
+                "concurrency": self.concurrency,
+                **self.counters,
+                "coalesced": self.counters["notifications"] - self.counters["messages"],
+            }
+
+
+dispatcher: Optional[NotificationDispatcher] = None
+
+
+def start_dispatcher() -> Optional[NotificationDispatcher]:
+    """Start this process's dispatcher (from the app lifespan) if enabled"""
+    global dispatcher
+    settings = get_settings()
+    if not settings.notifications_enabled:
+        return None
+    dispatcher = NotificationDispatcher(
+        transport=build_transport(),
+        batch_size=settings.notifications_batch_size,
+        concurrency=settings.notifications_concurrency,
+        poll_interval=settings.notifications_poll_interval_seconds,
+        max_attempts=settings.notifications_max_attempts,
+        retry_base_seconds=settings.notifications_retry_base_seconds,
+        lease_seconds=settings.notifications_lease_seconds,
+    )
+    dispatcher.start()
+    return dispatcher
+
+
+async def stop_dispatcher():
+    global dispatcher
+    if dispatcher is not None:
+        await dispatcher.stop()
+        dispatcher = None
+
+
+def dispatch_due(db: Session) -> dict:
+    """Send everything that is due now, in batches (manage.py notifications dispatch)"""
+    settings = get_settings()
+    transport = build_transport()
+    totals = {"messages": 0, "notifications": 0, "failed": 0}
+    while True:
+        digests = claim_due(db, settings.notifications_batch_size)
+        if digests:
+            counts = record_results(db, send(transport, digests), settings.notifications_max_attempts,
+                                    settings.notifications_retry_base_seconds)
+            for name in totals:
+                totals[name] += counts[name]
+        if len(digests) < settings.notifications_batch_size:
+            return totals
@@ -0,0 +1,297 @@
+"""
+Transactional Outbox
+Side effects of a change (notifications, ...) are
+recorded as outbox_events rows in the same transaction as the change, then
+delivered by a background worker - so they never lengthen the request's
+transaction and are never lost when it commits, nor sent when it rolls back.
+
+- emit(db, ...) adds an event to the caller's session; commit as usual
+- Handlers subscribe to event types with @subscribe("booking.created") and
+  are called as handler(db, event) inside the worker's transaction
+- The worker claims due events in batches (SELECT ... FOR UPDATE SKIP LOCKED,
+  so every web worker process can run one), runs each event's handlers in a
+  SAVEPOINT and marks it done; a failing event is retried with exponential
+  backoff and marked failed after OUTBOX_MAX_ATTEMPTS
+- Delivery is at least once: handlers must be idempotent, since a crash
+  before the batch commits delivers the same events again. Database writes
+  made by a handler commit together with the event's "done" mark.
+
+Usage:
+    from app.services import outbox
+    outbox.emit(db, "booking.created", {"booking_id": 1}, aggregate_id=1)
+    db.commit()
+    outbox.notify()  # optional: wake the worker now instead of at the next poll
+"""
+
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+import asyncio
+import importlib
+import logging
+import threading
+import time
+
+from sqlalchemy import delete, func
+from sqlalchemy.orm import Session
+
+from app.config.settings import get_settings
+from app.models.outbox import OutboxEvent, PENDING, DONE, FAILED
+
+logger = logging.getLogger("shareit.outbox")
+
+# Modules whose @subscribe handlers the worker loads
+CONSUMERS = (
+    "app.services.notifications",
+)
+MAX_BACKOFF_SECONDS = 3600
+PURGE_EVERY_SECONDS = 300
+
+_handlers: dict[str, list[Callable]] = defaultdict(list)
+
+
+def subscribe(*event_types: str):
+    """Register the decorated handler(db, event) for these event types"""
+    def register(handler: Callable) -> Callable:
+        for event_type in event_types:
+            if handler not in _handlers[event_type]:
+                _handlers[event_type].append(handler)
+        return handler
+    return register
+
+
+def load_consumers():
+    for module in CONSUMERS:
+        importlib.import_module(module)
+
+
+def emit(db: Session, event_type: str, payload: dict, aggregate_id: Optional[int] = None) -> OutboxEvent:
+    """Queue an event in the caller's transaction (delivered only if it commits)"""
+    event = OutboxEvent(
+        event_type=event_type,
+        aggregate_id=aggregate_id,
+        payload=payload,
+        status=PENDING,
+        attempts=0,
+        available_at=datetime.utcnow(),
+    )
+    db.add(event)
+    return event
+
+
+def backoff(attempts: int, base_seconds: float) -> timedelta:
+    return timedelta(seconds=min(base_seconds * 2 ** (attempts - 1), MAX_BACKOFF_SECONDS))
+
+
+# ============ Delivery ============
+
+def deliver_batch(db: Session, batch_size: int, max_attempts: int, retry_base_seconds: float) -> dict:
+    """
+    Claim up to batch_size due events, run their handlers and commit
+
+    Returns:
+        Counts of events claimed, delivered, scheduled for retry and failed
+    """
+    now = datetime.utcnow()
+    counts = {"claimed": 0, "delivered": 0, "retried": 0, "failed": 0}
+    try:
+        events = (
+            db.query(OutboxEvent)
+            .filter(OutboxEvent.status == PENDING, OutboxEvent.available_at <= now)
+            .order_by(OutboxEvent.available_at, OutboxEvent.event_id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+        counts["claimed"] = len(events)
+
+        for event in events:
+            event.attempts += 1
+            try:
+                with db.begin_nested():
+                    for handler in _handlers.get(event.event_type, ()):
+                        handler(db, event)
+            except Exception as e:
+                event.last_error = f"{e.__class__.__name__}: {e}"[:2000]
+                if event.attempts >= max_attempts:
+                    event.status = FAILED
+                    event.processed_at = now
+                    counts["failed"] += 1
+                    logger.error("Outbox event %s (%s) failed after %s attempts: %s",
+                                 event.event_id, event.event_type, event.attempts, event.last_error)
+                else:
+                    event.available_at = now + backoff(event.attempts, retry_base_seconds)
+                    counts["retried"] += 1
+                    logger.warning("Outbox event %s (%s) attempt %s failed, retrying at %s: %s",
+                                   event.event_id, event.event_type, event.attempts,
+                                   event.available_at.isoformat(), event.last_error)
+            else:
+                event.status = DONE
+                event.processed_at = now
+                counts["delivered"] += 1
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return counts
+
+
+def purge_delivered(db: Session, retention_hours: int) -> int:
+    """Delete events delivered more than retention_hours ago"""
+    cutoff = datetime.utcnow() - timedelta(hours=retention_hours)
+    try:
+        result = db.execute(
+            delete(OutboxEvent).where(OutboxEvent.status == DONE, OutboxEvent.processed_at < cutoff)
+        )
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return result.rowcount or 0
+
+
+def backlog(db: Session) -> dict:
+    """Events per status and the age of the oldest pending one"""
+    by_status = dict(db.query(OutboxEvent.status, func.count()).group_by(OutboxEvent.status).all())
+    oldest = db.query(func.min(OutboxEvent.created_at)).filter(OutboxEvent.status == PENDING).scalar()
+    return {
+        "pending": by_status.get(PENDING, 0),
+        "done": by_status.get(DONE, 0),
+        "failed": by_status.get(FAILED, 0),
+        "oldest_pending_seconds": round((datetime.utcnow() - oldest).total_seconds(), 1) if oldest else None,
+    }
+
+
+# ============ Worker ============
+
+class OutboxWorker:
+    """
+    asyncio task draining the outbox; database work runs in a worker thread
+    so the event loop (and request handling) is never blocked
+    """
+
+    def __init__(self, batch_size: int, poll_interval: float, max_attempts: int,
+                 retry_base_seconds: float, retention_hours: int):
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self.retention_hours = retention_hours
+        self.counters = {"batches": 0, "delivered": 0, "retried": 0, "failed": 0, "errors": 0}
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._stopping = False
+        self._last_purge = 0.0
+        self._lock = threading.Lock()
+
+    def start(self):
+        load_consumers()
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._task = self._loop.create_task(self._run(), name="outbox-worker")
+
+    async def stop(self, timeout: float = 10.0):
+        """Finish the batch in progress (if any) and exit"""
+        if self._task is None:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        try:
+            await asyncio.wait_for(self._task, timeout)
+        except asyncio.TimeoutError:
+            self._task.cancel()
+        self._task = None
+
+    def notify(self):
+        """Wake the worker; safe to call from request threads"""
+        if self._loop is not None and self._wakeup is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def _drain_once(self) -> int:
+        from app.config.database import SessionLocal
+
+        db = SessionLocal()
+        try:
+            counts = deliver_batch(db, self.batch_size, self.max_attempts, self.retry_base_seconds)
+            if time.monotonic() - self._last_purge > PURGE_EVERY_SECONDS:
+                self._last_purge = time.monotonic()
+                purge_delivered(db, self.retention_hours)
+        finally:
+            db.close()
+        with self._lock:
+            self.counters["batches"] += 1 if counts["claimed"] else 0
+            for name in ("delivered", "retried", "failed"):
+                self.counters[name] += counts[name]
+        return counts["claimed"]
+
+    async def _run(self):
+        from fastapi.concurrency import run_in_threadpool
+
+        while not self._stopping:
+            self._wakeup.clear()
+            try:
+                claimed = await run_in_threadpool(self._drain_once)
+            except Exception:
+                with self._lock:
+                    self.counters["errors"] += 1
+                logger.exception("Outbox worker batch failed")
+                claimed = 0
+            if claimed >= self.batch_size:
+                continue  # Backlog: keep draining
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"running": self._task is not None, **self.counters}
+
+
+worker: Optional[OutboxWorker] = None
+
+
+def start_worker() -> Optional[OutboxWorker]:
+    """Start this process's worker (from the app lifespan) if enabled"""
+    global worker
+    settings = get_settings()
+    if not settings.outbox_worker_enabled:
+        return None
+    worker = OutboxWorker(
+        batch_size=settings.outbox_batch_size,
+        poll_interval=settings.outbox_poll_interval_seconds,
+        max_attempts=settings.outbox_max_attempts,
+        retry_base_seconds=settings.outbox_retry_base_seconds,
+        retention_hours=settings.outbox_retention_hours,
+    )
+    worker.start()
+    return worker
+
+
+async def stop_worker():
+    global worker
+    if worker is not None:
+        await worker.stop()
+        worker = None
+
+
+def notify():
+    """Wake this process's worker after committing events (no-op without one)"""
+    if worker is not None:
+        worker.notify()
+
+
+def drain(db: Session) -> dict:
+    """Deliver everything that is due now, in batches (manage.py outbox drain)"""
+    load_consumers()
+    settings = get_settings()
+    totals = {"claimed": 0, "delivered": 0, "retried": 0, "failed": 0}
+    while True:
+        counts = deliver_batch(db, settings.outbox_batch_size, settings.outbox_max_attempts,
+                               settings.outbox_retry_base_seconds)
+        for name in totals:
+            totals[name] += counts[name]
+        if counts["claimed"] < settings.outbox_batch_size:
+            return totals
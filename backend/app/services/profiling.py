@@ -0,0 +1,246 @@
+"""
+Request-Scoped SQL Profiling
+Records every statement a profiled request executes (with timings) and
+aggregates them per route and per statement, so a slow endpoint can be
+traced to its N+1 or its missing index.
+
+- A RequestProfile is attached to the request's context (ContextVar), so
+  statements run in the threadpool by sync routes are still attributed to it
+- Engine events record statements only while a profile is active; other
+  requests pay a single ContextVar lookup
+- Slow requests keep their statement list and an EXPLAIN of the slowest one
+"""
+
+from collections import OrderedDict, deque
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Optional
+import logging
+import re
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.config.settings import get_settings
+
+logger = logging.getLogger("shareit.profiling")
+
+MAX_STATEMENT_CHARS = 2000
+RECENT_SLOW_REQUESTS = 50
+
+# Bound parameter lists like IN (%(id_1)s, %(id_2)s, ...) collapse so they aggregate as one statement
+_PARAM_LIST = re.compile(r"\((?:\s*(?:%\(\w+\)s|\?|:\w+)\s*,)+\s*(?:%\(\w+\)s|\?|:\w+)\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_statement(statement: str) -> str:
+    statement = _WHITESPACE.sub(" ", statement).strip()
+    return _PARAM_LIST.sub("(...)", statement)[:MAX_STATEMENT_CHARS]
+
+
+@dataclass
+class QueryRecord:
+    statement: str
+    duration_ms: float
+    parameters: object = None
+    engine: Optional[Engine] = None
+
+
+@dataclass
+class RequestProfile:
+    method: str
+    path: str
+    route: Optional[str] = None
+    queries: list = field(default_factory=list)
+    started_at: float = field(default_factory=time.perf_counter)
+
+    @property
+    def sql_ms(self) -> float:
+        return sum(q.duration_ms for q in self.queries)
+
+    def slowest(self) -> Optional[QueryRecord]:
+        return max(self.queries, key=lambda q: q.duration_ms, default=None)
+
+
+current_profile: ContextVar[Optional[RequestProfile]] = ContextVar("current_profile", default=None)
+
+
+# ============ Engine events ============
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if current_profile.get() is not None:
+        conn.info.setdefault("profile_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = current_profile.get()
+    if profile is None:
+        return
+    starts = conn.info.get("profile_started")
+    if not starts:
+        return
+    duration_ms = (time.perf_counter() - starts.pop()) * 1000
+    profile.queries.append(QueryRecord(
+        statement=statement,
+        duration_ms=duration_ms,
+        parameters=None if executemany else parameters,
+        engine=conn.engine,
+    ))
+
+
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute; drop its start time
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("profile_started"):
+        conn.info["profile_started"].pop()
+
+
+_installed = False
+
+
+def install():
+    """Listen on every Engine (primary and replicas); safe to call more than once"""
+    global _installed
+    if _installed:
+        return
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(Engine, "handle_error", _handle_error)
+    _installed = True
+
+
+# ============ EXPLAIN ============
+
+def explain(record: QueryRecord) -> Optional[str]:
+    """Plan of a recorded SELECT, or None (writes are never re-run, even under EXPLAIN)"""
+    if record.engine is None or record.parameters is None:
+        return None
+    if not record.statement.lstrip().upper().startswith(("SELECT", "WITH")):
+        return None
+
+    dialect = record.engine.dialect.name
+    if dialect == "postgresql":
+        prefix = "EXPLAIN "
+    elif dialect == "sqlite":
+        prefix = "EXPLAIN QUERY PLAN "
+    else:
+        return None
+
+    try:
+        with record.engine.connect() as conn:
+            rows = conn.exec_driver_sql(prefix + record.statement, record.parameters).fetchall()
+    except Exception as e:
+        return f"EXPLAIN failed: {e.__class__.__name__}"
+    return "\n".join(" | ".join(str(value) for value in row) for row in rows)
+
+
+# ============ Aggregated stats ============
+
+class _Stat:
+    __slots__ = ("count", "total_ms", "max_ms", "slow", "queries")
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.slow = 0
+        self.queries = 0
+
+    def add(self, duration_ms: float, slow: bool = False, queries: int = 0):
+        self.count += 1
+        self.total_ms += duration_ms
+        self.max_ms = max(self.max_ms, duration_ms)
+        self.slow += int(slow)
+        self.queries += queries
+
+    def as_dict(self, key_name: str, key: str) -> dict:
+        return {
+            key_name: key,
+            "count": self.count,
+            "total_ms": round(self.total_ms, 2),
+            "avg_ms": round(self.total_ms / self.count, 2) if self.count else 0.0,
+            "max_ms": round(self.max_ms, 2),
+            "slow": self.slow,
+            "avg_queries": round(self.queries / self.count, 1) if self.count else 0.0,
+        }
+
+
+class ProfileStore:
+    """Per-route and per-statement totals (LRU-bounded) plus the most recent slow requests"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._routes = OrderedDict()
+        self._statements = OrderedDict()
+        self._slow = deque(maxlen=RECENT_SLOW_REQUESTS)
+        self._lock = threading.Lock()
+
+    def _stat(self, table: OrderedDict, key: str) -> _Stat:
+        stat = table.get(key)
+        if stat is None:
+            stat = table[key] = _Stat()
+            if len(table) > self.max_entries:
+                table.popitem(last=False)
+        else:
+            table.move_to_end(key)
+        return stat
+
+    def record(self, profile: RequestProfile, duration_ms: float, status: int, slow: bool,
+               plan: Optional[str] = None) -> Optional[dict]:
+        route = f"{profile.method} {profile.route or profile.path}"
+        with self._lock:
+            self._stat(self._routes, route).add(duration_ms, slow, len(profile.queries))
+            for query in profile.queries:
+                self._stat(self._statements, normalize_statement(query.statement)).add(query.duration_ms)
+            if not slow:
+                return None
+            entry = {
+                "route": route,
+                "path": profile.path,
+                "status": status,
+                "duration_ms": round(duration_ms, 2),
+                "sql_ms": round(profile.sql_ms, 2),
+                "queries": [
+                    {"statement": normalize_statement(q.statement), "duration_ms": round(q.duration_ms, 2)}
+                    for q in profile.queries
+                ],
+                "explain": plan,
+                "at": time.time(),
+            }
+            self._slow.appendleft(entry)
+            return entry
+
+    def top_routes(self, limit: int, order_by: str = "total_ms") -> list[dict]:
+        with self._lock:
+            rows = [stat.as_dict("route", key) for key, stat in self._routes.items()]
+        return sorted(rows, key=lambda row: row[order_by], reverse=True)[:limit]
+
+    def top_statements(self, limit: int, order_by: str = "total_ms") -> list[dict]:
+        with self._lock:
+            rows = [stat.as_dict("statement", key) for key, stat in self._statements.items()]
+        return sorted(rows, key=lambda row: row[order_by], reverse=True)[:limit]
+
+    def recent_slow(self, limit: int) -> list[dict]:
+        with self._lock:
+            return list(self._slow)[:limit]
+
+    def reset(self):
+        with self._lock:
+            self._routes.clear()
+            self._statements.clear()
+            self._slow.clear()
+
+
+profile_store = ProfileStore(get_settings().sql_profiling_max_entries)
+
+
+def log_slow_request(entry: dict):
+    lines = [f"Slow request {entry['route']} -> {entry['status']} in {entry['duration_ms']}ms "
+             f"({len(entry['queries'])} queries, {entry['sql_ms']}ms in SQL)"]
+    lines += [f"  {q['duration_ms']:8.2f}ms  {q['statement']}" for q in entry["queries"]]
+    if entry["explain"]:
+        lines.append("  EXPLAIN of slowest statement:")
+        lines += [f"    {line}" for line in entry["explain"].splitlines()]
+    logger.warning("\n".join(lines))
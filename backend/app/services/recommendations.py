@@ -0,0 +1,210 @@
+"""
+Item Rankings and Recommendations
+Batch job (`python manage.py rankings rebuild`, run from cron) that
+precomputes what GET /items/popular and GET /items/{id}/recommendations serve.
+
+Popularity, per item, over the last RANKINGS_WINDOW_DAYS of bookings:
+    score = sum(0.5 ** (booking_age_days / RANKINGS_HALF_LIFE_DAYS)) * acceptance
+    acceptance = (accepted + 1) / (accepted + rejected + 2)   (smoothed)
+
+"Borrowers who booked X also booked Y": cosine similarity of the sets of
+borrowers who rented each item, from the distinct (borrower, item) pairs of
+rented bookings; the top RECOMMENDATIONS_PER_ITEM neighbours are kept.
+
+Both are vectorized with NumPy (imported here only, so web workers never
+load it) and written in one transaction, replacing the previous results.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+from app.config.settings import get_settings
+from app.models.booking import Booking, BookingStatusEnum
+from app.models.ranking import ItemRanking, ItemRecommendation
+from app.services.cache import item_cache, ITEM_LIST_PREFIX
+
+FETCH_PARTITION = 100_000
+WRITE_BATCH = 5000
+
+ACCEPTED_STATUSES = (
+    BookingStatusEnum.ACCEPTED,
+    BookingStatusEnum.AWAITING_PICKUP,
+    BookingStatusEnum.PICKED_UP,
+    BookingStatusEnum.RETURN_PENDING,
+    BookingStatusEnum.RETURNED,
+)
+
+
+@dataclass
+class RankingConfig:
+    window_days: int
+    half_life_days: float
+    per_item: int
+    max_items_per_borrower: int
+    co_occurrence_days: int
+
+    @classmethod
+    def from_settings(cls) -> "RankingConfig":
+        settings = get_settings()
+        return cls(
+            window_days=settings.rankings_window_days,
+            half_life_days=settings.rankings_half_life_days,
+            per_item=settings.recommendations_per_item,
+            max_items_per_borrower=settings.recommendations_max_items_per_borrower,
+            co_occurrence_days=settings.recommendations_window_days,
+        )
+
+
+def _fetch_columns(db: Session, query, dtypes: list):
+    """Run `query` and return one NumPy array per column, fetched in partitions"""
+    import numpy as np
+
+    chunks = [[] for _ in dtypes]
+    for partition in db.execute(query.execution_options(yield_per=FETCH_PARTITION)).partitions():
+        columns = list(zip(*partition))
+        for i, dtype in enumerate(dtypes):
+            chunks[i].append(np.asarray(columns[i], dtype=dtype))
+    return [np.concatenate(parts) if parts else np.empty(0, dtype=dtype) for parts, dtype in zip(chunks, dtypes)]
+
+
+# ============ Computation (pure NumPy) ============
+
+def popularity(item_ids, accepted, rejected, age_days, half_life_days: float):
+    """
+    Per-item popularity from one row per booking
+
+    Returns:
+        (item_ids, scores, booking_counts, acceptance_rates) for each distinct item
+    """
+    import numpy as np
+
+    items, idx = np.unique(item_ids, return_inverse=True)
+    size = len(items)
+    counts = np.bincount(idx, minlength=size)
+    recency = np.bincount(idx, weights=np.exp2(-np.maximum(age_days, 0) / half_life_days), minlength=size)
+    accepted_n = np.bincount(idx, weights=accepted.astype(np.float64), minlength=size)
+    decided_n = np.bincount(idx, weights=(accepted | rejected).astype(np.float64), minlength=size)
+    acceptance = (accepted_n + 1.0) / (decided_n + 2.0)
+    return items, recency * acceptance, counts, acceptance
+
+
+def co_occurrence(borrower_ids, item_ids, per_item: int, max_items_per_borrower: int):
+    """
+    Top `per_item` neighbours of each item by cosine similarity of borrower sets
+
+    Returns:
+        (item_ids, recommended_item_ids, scores, ranks) - ranks start at 1
+    """
+    import numpy as np
+
+    empty = (np.empty(0, np.int64), np.empty(0, np.int64), np.empty(0), np.empty(0, np.int64))
+    if len(item_ids) == 0:
+        return empty
+
+    # Distinct (borrower, item) pairs, sorted by borrower
+    pairs = np.unique(np.stack([borrower_ids, item_ids], axis=1), axis=0)
+    items, item_idx = np.unique(pairs[:, 1], return_inverse=True)
+    n = len(items)
+    borrowers_per_item = np.bincount(item_idx, minlength=n)
+    _, starts, sizes = np.unique(pairs[:, 0], return_index=True, return_counts=True)
+
+    # Borrowers with the same number of items are expanded together: (groups x k) -> all ordered pairs
+    keys = []
+    for size in np.unique(sizes):
+        if size < 2:
+            continue
+        k = int(min(size, max_items_per_borrower))
+        group = item_idx[starts[sizes == size][:, None] + np.arange(k)]
+        left = np.repeat(group, k, axis=1)
+        right = np.tile(group, (1, k))
+        off_diagonal = left != right
+        keys.append(left[off_diagonal].astype(np.int64) * n + right[off_diagonal])
+    if not keys:
+        return empty
+
+    pair_keys, together = np.unique(np.concatenate(keys), return_counts=True)
+    source, target = pair_keys // n, pair_keys % n
+    scores = together / np.sqrt(borrowers_per_item[source] * borrowers_per_item[target].astype(np.float64))
+
+    # Rank neighbours within each source item (score desc, then item id for stable ties)
+    order = np.lexsort((target, -scores, source))
+    source, target, scores = source[order], target[order], scores[order]
+    first = np.r_[True, source[1:] != source[:-1]]
+    group_start = np.maximum.accumulate(np.where(first, np.arange(len(source)), 0))
+    ranks = np.arange(len(source)) - group_start + 1
+    keep = ranks <= per_item
+    return items[source[keep]], items[target[keep]], scores[keep], ranks[keep]
+
+
+# ============ Batch job ============
+
+def rebuild(db: Session, config: RankingConfig = None, now: datetime = None) -> dict:
+    """
+    Recompute rankings and recommendations and replace the stored ones
+
+    Returns:
+        Counts of rows written to each table
+    """
+    import numpy as np
+
+    config = config or RankingConfig.from_settings()
+    now = now or datetime.utcnow()
+
+    # Popularity: every booking in the window
+    since = now - timedelta(days=config.window_days)
+    item_ids, statuses, created = _fetch_columns(
+        db,
+        select(Booking.item_id, Booking.status, Booking.created_at).where(Booking.created_at >= since),
+        [np.int64, object, "datetime64[us]"],
+    )
+    accepted = np.fromiter((s in ACCEPTED_STATUSES for s in statuses), dtype=bool, count=len(statuses))
+    rejected = statuses == BookingStatusEnum.REJECTED
+    age_days = (np.datetime64(now, "us") - created) / np.timedelta64(1, "D")
+    ranked_items, scores, counts, acceptance = popularity(
+        item_ids, accepted, rejected, age_days, config.half_life_days
+    )
+
+    # Co-occurrence: who rented what over the longer window
+    borrowers, rented_items = _fetch_columns(
+        db,
+        select(Booking.borrower_id, Booking.item_id).where(
+            Booking.status.in_(ACCEPTED_STATUSES),
+            Booking.created_at >= now - timedelta(days=config.co_occurrence_days),
+        ),
+        [np.int64, np.int64],
+    )
+    sources, targets, similarity, ranks = co_occurrence(
+        borrowers, rented_items, config.per_item, config.max_items_per_borrower
+    )
+
+    ranking_rows = [
+        {"item_id": int(i), "score": float(s), "recent_bookings": int(c), "acceptance_rate": float(a),
+         "computed_at": now}
+        for i, s, c, a in zip(ranked_items, scores, counts, acceptance)
+    ]
+    recommendation_rows = [
+        {"item_id": int(i), "rank": int(r), "recommended_item_id": int(t), "score": float(s), "computed_at": now}
+        for i, t, s, r in zip(sources, targets, similarity, ranks)
+    ]
+
+    # Replace both tables at once; readers keep seeing the previous results until commit
+    try:
+        db.execute(delete(ItemRanking))
+        db.execute(delete(ItemRecommendation))
+        for start in range(0, len(ranking_rows), WRITE_BATCH):
+            db.execute(insert(ItemRanking), ranking_rows[start:start + WRITE_BATCH])
+        for start in range(0, len(recommendation_rows), WRITE_BATCH):
+            db.execute(insert(ItemRecommendation), recommendation_rows[start:start + WRITE_BATCH])
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return {"item_rankings": len(ranking_rows), "item_recommendations": len(recommendation_rows)}
+
+
+def publish():
+    """After a rebuild: drop cached popular/recommendation payloads (they live under the list prefix)"""
+    item_cache.delete_prefix(ITEM_LIST_PREFIX)
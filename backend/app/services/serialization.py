@@ -0,0 +1,45 @@
+"""
+Fast JSON Serialization Helpers
+
+List endpoints select only the columns a response schema needs and hand the
+SQL rows straight to a pydantic TypeAdapter. Rows are validated once (by
+attribute, so Row tuples work as-is) and dumped to JSON bytes in
+pydantic-core, skipping FastAPI's response_model re-validation and the
+stdlib json encoder.
+"""
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+
+def schema_columns(model, schema, **overrides) -> list:
+    """
+    Columns of `model` matching the fields of `schema`, labelled by field name
+
+    Args:
+        model: SQLAlchemy model class
+        schema: Pydantic response model
+        overrides: field name -> column expression for fields that are
+                   named differently or come from joined tables
+
+    Returns:
+        List of labelled column expressions for db.query(*columns)
+    """
+    columns = []
+    for field in schema.model_fields:
+        if field in overrides:
+            columns.append(overrides[field].label(field))
+        elif hasattr(model, field):
+            columns.append(getattr(model, field).label(field))
+    return columns
+
+
+def json_response(adapter: TypeAdapter, rows, status_code: int = 200) -> Response:
+    """
+    Validate `rows` once with `adapter` and return them as a JSON response
+    """
+    return Response(
+        content=adapter.dump_json(adapter.validate_python(rows, from_attributes=True)),
+        status_code=status_code,
+        media_type="application/json",
+    )
@@ -0,0 +1,278 @@
+"""
+Dispute Settlement
+Applies a dispute's outcome to the money and the rental in one locked
+transaction:
+
+- while a booking is active its deposit sits in the lender's wallet (moved
+  there when the booking was accepted); settling returns `deposit - penalty`
+  to the borrower and the lender keeps the penalty
+- when the deposit is no longer held (booking already returned), a penalty
+  is charged to the borrower's wallet and credited to the lender
+- the booking becomes RETURNED and the item AVAILABLE again
+- the dispute gets its final status, penalty_amount and settled_at
+
+Rows are locked (SELECT ... FOR UPDATE) in a fixed order - dispute, booking,
+item, then wallets by wallet_id - so concurrent settlements and booking
+updates can't deadlock or double-spend. Batches settle each dispute in a
+SAVEPOINT, so one failure doesn't undo the others.
+
+Usage:
+    from app.services.settlement import settle_one, settle_many
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from decimal import Decimal
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from app.models.booking import Booking, BookingStatusEnum
+from app.models.dispute import Dispute, DisputeStatusEnum
+from app.models.item import Item, ItemStatusEnum
+from app.models.transaction import Transaction, TransactionTypeEnum
+from app.models.wallet import Wallet
+from app.services import lender_stats
+from app.services.cache import invalidate_item
+from app.services.versioning import bump, bookings_key, wallet_key, lender_items_version_key, ALL_ITEMS_KEY
+
+# Booking states in which the deposit has been moved to the lender and not yet refunded
+DEPOSIT_HELD_STATUSES = {
+    BookingStatusEnum.ACCEPTED,
+    BookingStatusEnum.AWAITING_PICKUP,
+    BookingStatusEnum.PICKED_UP,
+    BookingStatusEnum.RETURN_PENDING,
+}
+COMMIT_EVERY = 100  # Batches commit (and release locks) after this many disputes
+CENT = Decimal("0.01")
+
+
+class SettlementError(Exception):
+    """A dispute that can't be settled; `status_code` is the HTTP status to report"""
+
+    def __init__(self, detail: str, status_code: int = 400):
+        super().__init__(detail)
+        self.detail = detail
+        self.status_code = status_code
+
+
+@dataclass
+class SettlementDecision:
+    dispute_id: int
+    status: Optional[DisputeStatusEnum] = None  # None = keep the outcome already recorded on the dispute
+    penalty_amount: Optional[Decimal] = None  # None = claimed cost for upheld lender claims, else 0
+    resolution_notes: Optional[str] = None
+
+
+@dataclass
+class SettlementResult:
+    dispute_id: int
+    settled: bool
+    status: Optional[str] = None
+    booking_id: Optional[int] = None
+    penalty: Decimal = Decimal("0")
+    refund: Decimal = Decimal("0")
+    error: Optional[str] = None
+    # For cache invalidation after commit
+    borrower_id: Optional[int] = field(default=None, repr=False)
+    lender_id: Optional[int] = field(default=None, repr=False)
+    item_id: Optional[int] = field(default=None, repr=False)
+
+
+def _money(value) -> Decimal:
+    return Decimal(str(value or 0)).quantize(CENT)
+
+
+def default_penalty(dispute: Dispute, booking: Booking, status: DisputeStatusEnum) -> Decimal:
+    """An upheld claim raised by the lender costs the borrower the claimed amount; anything else costs nothing"""
+    if status == DisputeStatusEnum.RESOLVED and dispute.raised_by == booking.lender_id:
+        return _money(dispute.estimated_cost)
+    return Decimal("0")
+
+
+def _ledger(db: Session, wallet: Wallet, booking: Booking, tx_type: TransactionTypeEnum,
+            amount: Decimal, description: str):
+    db.add(Transaction(
+        user_id=wallet.user_id,
+        wallet_id=wallet.wallet_id,
+        booking_id=booking.booking_id,
+        tx_type=tx_type,
+        amount=amount,
+        description=description,
+    ))
+
+
+def settle_dispute(db: Session, decision: SettlementDecision, now: Optional[datetime] = None) -> SettlementResult:
+    """
+    Settle one dispute inside the caller's transaction (no commit)
+
+    Raises:
+        SettlementError if the dispute is missing, undecided, already settled
+        or a wallet can't cover its side
+    """
+    now = now or datetime.utcnow()
+
+    dispute = db.query(Dispute).filter(Dispute.dispute_id == decision.dispute_id).with_for_update().first()
+    if not dispute:
+        raise SettlementError("Dispute not found", 404)
+    if dispute.settled_at is not None:
+        raise SettlementError("Dispute already settled", 409)
+
+    outcome = decision.status or dispute.status
+    if outcome not in (DisputeStatusEnum.RESOLVED, DisputeStatusEnum.REJECTED):
+        raise SettlementError("Settlement needs an outcome: resolved or rejected")
+
+    booking = db.query(Booking).filter(Booking.booking_id == dispute.booking_id).with_for_update().one()
+    item = db.query(Item).filter(Item.item_id == booking.item_id).with_for_update().first()
+    wallets = {
+        wallet.user_id: wallet
+        for wallet in db.query(Wallet)
+        .filter(Wallet.user_id.in_([booking.borrower_id, booking.lender_id]))
+        .order_by(Wallet.wallet_id)
+        .with_for_update()
+        .all()
+    }
+    borrower_wallet = wallets.get(booking.borrower_id)
+    lender_wallet = wallets.get(booking.lender_id)
+    if borrower_wallet is None or lender_wallet is None:
+        raise SettlementError("Borrower or lender wallet not found")
+
+    deposit = _money(booking.total_deposit)
+    penalty = (
+        _money(decision.penalty_amount) if decision.penalty_amount is not None
+        else default_penalty(dispute, booking, outcome)
+    )
+    if penalty < 0:
+        raise SettlementError("Penalty can't be negative")
+    penalty = min(penalty, deposit)
+    item_title = item.title if item else "Unknown"
+    held = booking.status in DEPOSIT_HELD_STATUSES
+    refund = Decimal("0")
+
+    if held:
+        # The lender holds the deposit: keep the penalty, return the rest
+        refund = deposit - penalty
+        if refund > 0:
+            if lender_wallet.balance < refund:
+                raise SettlementError(
+                    f"Lender wallet can't cover the refund. Required: ₹{refund}, Available: ₹{lender_wallet.balance}"
+                )
+            lender_wallet.balance = lender_wallet.balance - refund
+            borrower_wallet.balance = borrower_wallet.balance + refund
+            _ledger(db, lender_wallet, booking, TransactionTypeEnum.REFUND, refund,
+                    f"Deposit returned to borrower for '{item_title}' (dispute #{dispute.dispute_id})")
+            _ledger(db, borrower_wallet, booking, TransactionTypeEnum.REFUND, refund,
+                    f"Deposit refund for item '{item_title}' (dispute #{dispute.dispute_id})")
+        if penalty > 0:
+            _ledger(db, borrower_wallet, booking, TransactionTypeEnum.PENALTY, penalty,
+                    f"Penalty kept from deposit for '{item_title}' (dispute #{dispute.dispute_id})")
+        booking.status = BookingStatusEnum.RETURNED
+        lender_stats.record(db, booking.lender_id, completed_rental_count=1)
+        if item and item.status in (ItemStatusEnum.RENTED, ItemStatusEnum.DISPUTE):
+            item.status = ItemStatusEnum.AVAILABLE
+    elif penalty > 0:
+        # Deposit already refunded: charge the penalty directly
+        if borrower_wallet.balance < penalty:
+            raise SettlementError(
+                f"Borrower wallet can't cover the penalty. Required: ₹{penalty}, Available: ₹{borrower_wallet.balance}"
+            )
+        borrower_wallet.balance = borrower_wallet.balance - penalty
+        lender_wallet.balance = lender_wallet.balance + penalty
+        _ledger(db, borrower_wallet, booking, TransactionTypeEnum.PENALTY, penalty,
+                f"Damage penalty for '{item_title}' (dispute #{dispute.dispute_id})")
+        _ledger(db, lender_wallet, booking, TransactionTypeEnum.EARNING, penalty,
+                f"Damage compensation for '{item_title}' (dispute #{dispute.dispute_id})")
+        lender_stats.record(db, booking.lender_id, total_earnings=penalty)
+        if item and item.status == ItemStatusEnum.DISPUTE:
+            item.status = ItemStatusEnum.AVAILABLE
+
+    dispute.status = outcome
+    if decision.resolution_notes is not None:
+        dispute.resolution_notes = decision.resolution_notes
+    dispute.resolved_at = dispute.resolved_at or now
+    dispute.penalty_amount = penalty
+    dispute.settled_at = now
+    db.flush()
+
+    return SettlementResult(
+        dispute_id=dispute.dispute_id,
+        settled=True,
+        status=outcome.value,
+        booking_id=booking.booking_id,
+        penalty=penalty,
+        refund=refund,
+        borrower_id=booking.borrower_id,
+        lender_id=booking.lender_id,
+        item_id=booking.item_id,
+    )
+
+
+def publish_settlements(results: list[SettlementResult]):
+    """After commit: drop cached item payloads and bump the versions behind ETags"""
+    changed = set()
+    for result in results:
+        if not result.settled:
+            continue
+        invalidate_item(result.lender_id, result.item_id)
+        changed.update({
+            bookings_key(result.borrower_id), bookings_key(result.lender_id),
+            wallet_key(result.borrower_id), wallet_key(result.lender_id),
+            lender_items_version_key(result.lender_id),
+        })
+    if changed:
+        changed.add(ALL_ITEMS_KEY)
+        bump(*changed)
+
+
+def settle_one(db: Session, decision: SettlementDecision) -> SettlementResult:
+    """Settle and commit a single dispute (SettlementError propagates, nothing is written)"""
+    try:
+        result = settle_dispute(db, decision)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    publish_settlements([result])
+    return result
+
+
+def settle_many(db: Session, decisions: list[SettlementDecision]) -> list[SettlementResult]:
+    """
+    Settle many disputes; each runs in its own SAVEPOINT
+    A dispute that fails is reported and skipped, the rest still settle.
+    Disputes are processed in id order (consistent lock order across concurrent sweeps)
+    and committed every COMMIT_EVERY disputes so locks aren't held for the whole sweep.
+    """
+    results = []
+    pending = []
+    now = datetime.utcnow()
+    for n, decision in enumerate(sorted(decisions, key=lambda d: d.dispute_id), start=1):
+        try:
+            with db.begin_nested():
+                result = settle_dispute(db, decision, now)
+        except SettlementError as e:
+            result = SettlementResult(dispute_id=decision.dispute_id, settled=False, error=e.detail)
+        results.append(result)
+        pending.append(result)
+        if n % COMMIT_EVERY == 0:
+            db.commit()
+            publish_settlements(pending)
+            pending = []
+    db.commit()
+    publish_settlements(pending)
+    return results
+
+
+def unsettled_decisions(db: Session, limit: int) -> list[SettlementDecision]:
+    """Disputes already marked resolved/rejected whose money hasn't moved yet (the weekly sweep)"""
+    rows = (
+        db.query(Dispute.dispute_id)
+        .filter(
+            Dispute.status.in_([DisputeStatusEnum.RESOLVED, DisputeStatusEnum.REJECTED]),
+            Dispute.settled_at.is_(None),
+        )
+        .order_by(Dispute.dispute_id)
+        .limit(limit)
+        .all()
+    )
+    return [SettlementDecision(dispute_id=row.dispute_id) for row in rows]
@@ -0,0 +1,113 @@
+"""
+Single-flight Request Coalescing
+Concurrent identical reads share one execution: the first caller for a key
+runs the function, callers arriving while it is in flight wait for it and get
+the same result (or exception). Nothing is cached - the next call after it
+finishes runs again - so this complements the item cache on misses and when
+ITEM_CACHE_BACKEND=none.
+
+Sync routes run in the threadpool, so flights are coordinated with threading
+primitives. Coalescing is per process; each worker process runs at most one
+query per key at a time.
+
+Usage:
+    from app.services.singleflight import item_reads
+    payload = item_reads.do(f"items:detail:{item_id}", load)
+"""
+
+from typing import Callable, Optional
+import threading
+
+from app.config.settings import get_settings
+
+
+class _Flight:
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """One in-flight execution per key; counts executed and coalesced calls"""
+
+    def __init__(self, name: str, enabled: bool = True):
+        self.name = name
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._flights: dict[str, _Flight] = {}
+        self._counters = {"calls": 0, "executed": 0, "coalesced": 0, "errors": 0, "max_waiters": 0}
+
+    def do(self, key: str, fn: Callable):
+        """Return fn(), sharing the call with concurrent callers using the same key"""
+        if not self.enabled:
+            return fn()
+
+        with self._lock:
+            self._counters["calls"] += 1
+            flight = self._flights.get(key)
+            if flight is not None:
+                flight.waiters += 1
+                self._counters["coalesced"] += 1
+                self._counters["max_waiters"] = max(self._counters["max_waiters"], flight.waiters)
+                leader = False
+            else:
+                flight = self._flights[key] = _Flight()
+                self._counters["executed"] += 1
+                leader = True
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = fn()
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            with self._lock:
+                self._counters["errors"] += 1
+            raise
+        finally:
+            # Later callers start a new flight; waiters already holding this one get its outcome
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+    def stats(self) -> dict:
+        with self._lock:
+            counters = dict(self._counters)
+            in_flight = len(self._flights)
+        calls = counters["calls"]
+        return {
+            "name": self.name,
+            "enabled": self.enabled,
+            **counters,
+            "in_flight": in_flight,
+            "coalesced_ratio": round(counters["coalesced"] / calls, 4) if calls else 0.0,
+        }
+
+    def reset(self):
+        with self._lock:
+            for name in self._counters:
+                self._counters[name] = 0
+
+
+_enabled = get_settings().singleflight_enabled
+
+# Public item reads (detail, lists, popular) - keyed by their item cache key
+item_reads = SingleFlight("item_reads", _enabled)
+# GET /bookings/active-items - keyed by date
+booking_reads = SingleFlight("booking_reads", _enabled)
+
+GROUPS = (item_reads, booking_reads)
+
+
+def stats() -> list[dict]:
+    """Counters for every single-flight group"""
+    return [group.stats() for group in GROUPS]
@@ -0,0 +1,323 @@
+"""
+Lightweight Tracing
+Spans with the OpenTelemetry API shape (tracer.start_as_current_span,
+span.set_attribute / record_exception / set_status) and W3C trace context,
+without the OpenTelemetry SDK as a dependency.
+
+- The current span lives in a ContextVar, so spans opened in threadpool
+  code (sync routes, SQL) nest under the request's server span
+- Finished spans are queued and written by a background thread as OTLP-style
+  JSON lines (TRACING_EXPORTER=console for stdout, file for TRACING_FILE)
+- With TRACING_EXPORTER=none (the default) or an unsampled trace, spans are
+  no-ops that only carry the trace context
+
+Usage:
+    from app.services.tracing import tracer
+    with tracer.start_as_current_span("argon2.hash"):
+        ...
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+import json
+import os
+import queue
+import random
+import re
+import sys
+import threading
+import time
+
+from app.config.settings import get_settings
+
+# W3C traceparent: version-trace_id-parent_id-flags
+_TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+_INVALID_TRACE_ID = "0" * 32
+_INVALID_SPAN_ID = "0" * 16
+
+
+def _new_id(hex_chars: int) -> str:
+    return f"{random.getrandbits(hex_chars * 4):0{hex_chars}x}"
+
+
+class SpanContext:
+    __slots__ = ("trace_id", "span_id", "sampled")
+
+    def __init__(self, trace_id: str, span_id: str, sampled: bool):
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self.sampled = sampled
+
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+
+def parse_traceparent(header: Optional[str]) -> Optional[SpanContext]:
+    """Remote parent from an incoming `traceparent` header, or None if absent/invalid"""
+    match = _TRACEPARENT.match((header or "").strip().lower())
+    if not match:
+        return None
+    trace_id, span_id, flags = match.groups()
+    if trace_id == _INVALID_TRACE_ID or span_id == _INVALID_SPAN_ID:
+        return None
+    return SpanContext(trace_id, span_id, sampled=bool(int(flags, 16) & 1))
+
+
+class Span:
+    """A timed operation; attributes and events are only kept when sampled"""
+
+    __slots__ = ("name", "kind", "context", "parent_id", "attributes", "events",
+                 "status", "start_ns", "end_ns", "_exporter")
+
+    def __init__(self, name: str, kind: str, context: SpanContext, parent_id: Optional[str], exporter=None):
+        self.name = name
+        self.kind = kind
+        self.context = context
+        self.parent_id = parent_id
+        self.attributes = {}
+        self.events = []
+        self.status = "UNSET"
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self._exporter = exporter
+
+    def is_recording(self) -> bool:
+        return self.context.sampled and self._exporter is not None and self.end_ns is None
+
+    def get_span_context(self) -> SpanContext:
+        return self.context
+
+    def update_name(self, name: str):
+        self.name = name
+
+    def set_attribute(self, key: str, value):
+        if self.is_recording():
+            self.attributes[key] = value
+
+    def set_attributes(self, attributes: dict):
+        for key, value in attributes.items():
+            self.set_attribute(key, value)
+
+    def set_status(self, status: str, description: Optional[str] = None):
+        if self.is_recording():
+            self.status = status
+            if description:
+                self.attributes["status.description"] = description
+
+    def record_exception(self, exc: BaseException):
+        if self.is_recording():
+            self.events.append({
+                "name": "exception",
+                "time_unix_nano": time.time_ns(),
+                "attributes": {"exception.type": exc.__class__.__name__, "exception.message": str(exc)},
+            })
+
+    def end(self):
+        if self.end_ns is not None:
+            return
+        recording = self.is_recording()
+        self.end_ns = time.time_ns()
+        if recording:
+            self._exporter.export(self)
+
+    def to_dict(self) -> dict:
+        return {
+            "trace_id": self.context.trace_id,
+            "span_id": self.context.span_id,
+            "parent_span_id": self.parent_id,
+            "name": self.name,
+            "kind": self.kind,
+            "start_time_unix_nano": self.start_ns,
+            "end_time_unix_nano": self.end_ns,
+            "duration_ms": round((self.end_ns - self.start_ns) / 1e6, 3),
+            "attributes": self.attributes,
+            "events": self.events,
+            "status": self.status,
+            "service.name": "shareit-backend",
+        }
+
+
+current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+# ============ Exporter ============
+
+class JSONLinesExporter:
+    """Queues finished spans; a background thread (one per process) writes them out"""
+
+    def __init__(self, path: Optional[str]):
+        self.path = path  # None = stdout
+        self._queue = queue.SimpleQueue()
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _ensure_worker(self):
+        # Threads don't survive fork, so each worker process starts its own writer
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid != os.getpid():
+                threading.Thread(target=self._run, name="span-exporter", daemon=True).start()
+                self._pid = os.getpid()
+
+    def export(self, span: Span):
+        self._ensure_worker()
+        self._queue.put(span)
+
+    def _run(self):
+        out = open(self.path, "a", buffering=1) if self.path else sys.stdout
+        while True:
+            span = self._queue.get()
+            if span is None:
+                break
+            batch = [span]
+            while len(batch) < 512:
+                try:
+                    span = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if span is None:
+                    self._queue.put(None)
+                    break
+                batch.append(span)
+            out.write("".join(json.dumps(s.to_dict(), default=str) + "\n" for s in batch))
+            out.flush()
+        if out is not sys.stdout:
+            out.close()
+
+    def shutdown(self):
+        if self._pid == os.getpid():
+            self._queue.put(None)
+            self._pid = None
+
+
+def build_exporter() -> Optional[JSONLinesExporter]:
+    settings = get_settings()
+    kind = settings.tracing_exporter.lower()
+    if kind == "console":
+        return JSONLinesExporter(None)
+    if kind == "file":
+        return JSONLinesExporter(settings.tracing_file)
+    return None
+
+
+# ============ Tracer ============
+
+class Tracer:
+    def __init__(self, exporter: Optional[JSONLinesExporter], sample_rate: float):
+        self.exporter = exporter
+        self.sample_rate = sample_rate
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None
+
+    def start_span(self, name: str, kind: str = "INTERNAL", attributes: Optional[dict] = None,
+                   parent: Optional[SpanContext] = None) -> Span:
+        """
+        New span under `parent` (a remote context), else under the current span,
+        else as the root of a new trace. Only SERVER spans start traces: internal
+        work outside a request (e.g. the access log decoding a JWT) isn't recorded.
+        """
+        local_parent = current_span.get()
+        if parent is None and local_parent is not None:
+            parent = local_parent.context
+        if parent is not None:
+            context = SpanContext(parent.trace_id, _new_id(16), parent.sampled)
+            parent_id = parent.span_id
+        else:
+            sampled = self.enabled and kind == "SERVER" and random.random() < self.sample_rate
+            context = SpanContext(_new_id(32), _new_id(16), sampled)
+            parent_id = None
+        span = Span(name, kind, context, parent_id, self.exporter)
+        if attributes:
+            span.set_attributes(attributes)
+        return span
+
+    @contextmanager
+    def start_as_current_span(self, name: str, kind: str = "INTERNAL", attributes: Optional[dict] = None,
+                              parent: Optional[SpanContext] = None):
+        span = self.start_span(name, kind, attributes, parent)
+        token = current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.record_exception(e)
+            span.set_status("ERROR", e.__class__.__name__)
+            raise
+        finally:
+            current_span.reset(token)
+            span.end()
+
+    def shutdown(self):
+        if self.exporter is not None:
+            self.exporter.shutdown()
+
+
+def _build_tracer() -> Tracer:
+    settings = get_settings()
+    return Tracer(build_exporter(), settings.tracing_sample_rate)
+
+
+tracer = _build_tracer()
+
+
+def current_traceparent() -> Optional[str]:
+    """traceparent header value for outgoing calls made within the current span"""
+    span = current_span.get()
+    return span.context.traceparent() if span is not None else None
+
+
+# ============ SQL spans ============
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    parent = current_span.get()
+    if parent is None or not parent.is_recording():
+        return
+    span = tracer.start_span(
+        f"db.{statement.lstrip().split(None, 1)[0].upper()}" if statement.strip() else "db.query",
+        kind="CLIENT",
+        attributes={
+            "db.system": conn.dialect.name,
+            "db.statement": statement[:2000],
+            "db.executemany": executemany,
+        },
+    )
+    conn.info.setdefault("trace_spans", []).append(span)
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    spans = conn.info.get("trace_spans")
+    if spans:
+        span = spans.pop()
+        if cursor.rowcount is not None and cursor.rowcount >= 0:
+            span.set_attribute("db.rowcount", cursor.rowcount)
+        span.end()
+
+
+def _handle_error(exception_context):
+    conn = exception_context.connection
+    spans = conn.info.get("trace_spans") if conn is not None else None
+    if spans:
+        span = spans.pop()
+        span.record_exception(exception_context.original_exception)
+        span.set_status("ERROR", exception_context.original_exception.__class__.__name__)
+        span.end()
+
+
+_sql_instrumented = False
+
+
+def instrument_sql():
+    """Trace every statement on every Engine; safe to call more than once"""
+    global _sql_instrumented
+    if _sql_instrumented or not tracer.enabled:
+        return
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(Engine, "handle_error", _handle_error)
+    _sql_instrumented = True
@@ -0,0 +1,131 @@
+"""
+Per-User Version Counters
+Cheap counters bumped on every write that changes what a user's read
+endpoints return. The ETag middleware builds validators from them, so a
+conditional GET can be answered with 304 before any query runs.
+
+Counters live in process memory by default, which is only sound in a single
+process: a write handled by another worker never bumps this one's counters.
+serve.py reports its worker count through configure_worker(); with several
+workers and the memory store, validators_enabled() is False and the ETag
+middleware falls back to body hashes. Set VERSION_STORE_BACKEND=redis to
+share counters (and keep 304s without running the route) across workers.
+
+Each process gets a random epoch that is part of every validator, so ETags
+issued before a restart never match.
+"""
+
+from typing import Optional
+import threading
+import uuid
+
+from app.config.settings import get_settings
+
+
+class MemoryVersionStore:
+    """Counters in a plain dict - never evicted, so a validator can't be reused for different data"""
+
+    shared = False
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """New epoch and empty counters: every validator issued so far stops matching"""
+        with self._lock:
+            self.epoch = uuid.uuid4().hex[:8]
+            self._versions = {}
+
+    def bump(self, *keys: str):
+        with self._lock:
+            for key in keys:
+                self._versions[key] = self._versions.get(key, 0) + 1
+
+    def get_many(self, keys: list) -> list:
+        with self._lock:
+            return [self._versions.get(key, 0) for key in keys]
+
+
+class RedisVersionStore:
+    """Counters shared by all workers through INCR/MGET"""
+
+    shared = True
+
+    def __init__(self, url: Optional[str] = None, client=None, namespace: str = "shareit:version:"):
+        if client is None:
+            try:
+                import redis
+            except ImportError as e:
+                raise RuntimeError("VERSION_STORE_BACKEND=redis requires the 'redis' package") from e
+            client = redis.Redis.from_url(url or "redis://localhost:6379/0")
+        self.client = client
+        self.namespace = namespace
+        self.epoch = "shared"
+
+    def reset(self):
+        """Nothing to do: counters are shared, so validators stay valid across processes"""
+
+    def bump(self, *keys: str):
+        if keys:
+            pipe = self.client.pipeline(transaction=False)
+            for key in keys:
+                pipe.incr(self.namespace + key)
+            pipe.execute()
+
+    def get_many(self, keys: list) -> list:
+        values = self.client.mget([self.namespace + key for key in keys])
+        return [int(value) if value is not None else 0 for value in values]
+
+
+def build_version_store():
+    """Create the version store selected by VERSION_STORE_BACKEND"""
+    settings = get_settings()
+    if settings.version_store_backend.lower() == "redis":
+        return RedisVersionStore(url=settings.redis_url)
+    return MemoryVersionStore()
+
+
+version_store = build_version_store()
+
+
+_worker_count = 1
+
+
+def configure_worker(worker_count: int):
+    """
+    Called in every forked worker (serve.py post_fork): start a fresh store
+    (in place - the ETag middleware holds a reference) and record how many
+    processes serve requests
+    """
+    global _worker_count
+    _worker_count = worker_count
+    version_store.reset()
+
+
+def validators_enabled() -> bool:
+    """Counter-based ETags are only correct when this process sees every write"""
+    return version_store.shared or _worker_count <= 1
+
+
+# ============ Version Keys ============
+
+# Bumped when any item's title/location changes (booking lists embed them)
+ALL_ITEMS_KEY = "items:all"
+
+
+def bookings_key(user_id: int) -> str:
+    return f"bookings:{user_id}"
+
+
+def wallet_key(user_id: int) -> str:
+    return f"wallet:{user_id}"
+
+
+def lender_items_version_key(lender_id: int) -> str:
+    return f"items:{lender_id}"
+
+
+def bump(*keys: str):
+    """Record a committed write affecting the given keys"""
+    version_store.bump(*keys)
@@ -0,0 +1,2 @@
+# Benchmarks module
+# Standalone scripts, run from backend/ as: python -m benchmarks.<name>
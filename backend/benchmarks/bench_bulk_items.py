@@ -0,0 +1,104 @@
+"""
+Bulk Item Import Benchmark
+Compares one-request-per-item creation with the batched POST /items/bulk path.
+
+Runs against the database in DATABASE_URL. A throwaway lender is created and
+everything it owns is deleted afterwards.
+
+Usage (from backend/):
+    python -m benchmarks.bench_bulk_items --rows 10000
+"""
+
+import argparse
+import time
+import uuid
+
+from app.config.database import SessionLocal
+from app.models import User, Wallet, Item
+from app.routes.items import _bulk_insert_items
+
+
+def make_rows(count: int) -> list[dict]:
+    """Build `count` valid ItemCreate payloads"""
+    return [
+        {
+            "title": f"Bench item {i}",
+            "description": "Generated by bench_bulk_items",
+            "condition": ("New", "Good", "Used")[i % 3],
+            "estimated_price": 1000 + i % 500,
+            "min_days": 1,
+            "max_days": 14,
+            "daily_deposit": 50 + i % 20,
+            "images": [f"https://example.com/img/{i}.png"],
+            "location": "Lahore",
+        }
+        for i in range(count)
+    ]
+
+
+def create_lender(db) -> int:
+    """Create a throwaway lender and return its ID"""
+    lender = User(
+        full_name="Bench Lender",
+        email=f"bench-{uuid.uuid4().hex}@example.com",
+        password_hash="x",
+        role="lender",
+    )
+    db.add(lender)
+    db.commit()
+    db.add(Wallet(user_id=lender.user_id, balance=0))
+    db.commit()
+    return lender.user_id
+
+
+def one_by_one(db, lender_id: int, rows: list[dict]) -> float:
+    """Mimic POST /items/ per row: user lookup, add, commit, refresh"""
+    started = time.perf_counter()
+    for row in rows:
+        db.query(User).filter(User.user_id == lender_id).first()
+        item = Item(lender_id=lender_id, is_active=True, **row)
+        db.add(item)
+        db.commit()
+        db.refresh(item)
+    return time.perf_counter() - started
+
+
+def bulk(db, lender_id: int, rows: list[dict]) -> float:
+    """Run the same rows through the bulk import path"""
+    started = time.perf_counter()
+    result = _bulk_insert_items(db, lender_id, rows)
+    elapsed = time.perf_counter() - started
+    assert result["created"] == len(rows), result["errors"][:5]
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10000, help="Items to create with the bulk path")
+    parser.add_argument("--single-rows", type=int, default=1000,
+                        help="Items to create one by one (extrapolated to --rows)")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    lender_id = create_lender(db)
+    try:
+        single = one_by_one(db, lender_id, make_rows(args.single_rows))
+        batched = bulk(db, lender_id, make_rows(args.rows))
+
+        per_item_single = single / args.single_rows
+        per_item_bulk = batched / args.rows
+        print(f"one-by-one : {args.single_rows} items in {single:.2f}s "
+              f"({per_item_single * 1000:.3f} ms/item, ~{per_item_single * args.rows:.1f}s for {args.rows})")
+        print(f"bulk       : {args.rows} items in {batched:.2f}s ({per_item_bulk * 1000:.3f} ms/item)")
+        print(f"speedup    : {per_item_single / per_item_bulk:.1f}x")
+    finally:
+        db.rollback()
+        db.query(Item).filter(Item.lender_id == lender_id).delete(synchronize_session=False)
+        db.query(Wallet).filter(Wallet.user_id == lender_id).delete(synchronize_session=False)
+        db.query(User).filter(User.user_id == lender_id).delete(synchronize_session=False)
+        db.commit()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Worker Cold-Start Benchmark
+Wall time for a fresh interpreter to import the application, i.e. what
+every uvicorn worker pays before it can accept requests.
+
+--create-all adds the Base.metadata.create_all call that main.py used to
+run at import time, to compare against the migration-based startup.
+
+Usage (from backend/):
+    python -m benchmarks.bench_cold_start --runs 10
+    python -m benchmarks.bench_cold_start --runs 10 --create-all
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+IMPORT_APP = "import main; main.app"  # main.app is built on first access
+IMPORT_APP_WITH_CREATE_ALL = (
+    "import main; main.app; from app.config.database import Base, engine; Base.metadata.create_all(bind=engine)"
+)
+
+
+def time_import(code: str) -> float:
+    started = time.perf_counter()
+    subprocess.run([sys.executable, "-c", code], check=True)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--create-all", action="store_true", help="Also run create_all like the old main.py")
+    args = parser.parse_args()
+
+    code = IMPORT_APP_WITH_CREATE_ALL if args.create_all else IMPORT_APP
+    time_import(code)  # Warm the filesystem / bytecode caches
+    timings = [time_import(code) for _ in range(args.runs)]
+
+    print(f"{'create_all + import' if args.create_all else 'import'} over {args.runs} runs:")
+    print(f"  median {statistics.median(timings) * 1000:.1f} ms  "
+          f"min {min(timings) * 1000:.1f} ms  max {max(timings) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
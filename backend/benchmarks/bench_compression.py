@@ -0,0 +1,162 @@
+"""
+Compression Benchmark
+Bytes on the wire and CPU cost per request for payloads shaped like the
+largest list endpoints (/items/, /auth/users, /wallet/transactions).
+
+Uses the same encoders as CompressionMiddleware. No database needed.
+
+--check-streaming runs a streamed GET through the middleware stack in the
+order main.py registers it (compression outside ETag) and fails unless it
+comes back gzip-encoded, still chunked and intact.
+
+Usage (from backend/):
+    python -m benchmarks.bench_compression --rows 100 1000 --repeat 50
+    python -m benchmarks.bench_compression --check-streaming
+"""
+
+import argparse
+import asyncio
+import json
+import time
+import zlib
+from datetime import datetime, timedelta
+
+from app.middleware.compression import CompressionMiddleware, GzipStream, BrotliStream, brotli
+from app.middleware.etag import ETagMiddleware
+
+
+def items_payload(rows: int) -> bytes:
+    return json.dumps([
+        {
+            "item_id": i, "lender_id": i % 50, "title": f"Cordless drill {i}",
+            "description": "18V cordless drill with two batteries and a carry case",
+            "condition": ("New", "Good", "Used")[i % 3], "estimated_price": 12000.0 + i,
+            "min_days": 1, "max_days": 14, "daily_deposit": 250.0,
+            "images": [f"http://localhost:8000/uploads/{i:032x}.png"], "location": "Lahore",
+            "is_active": True, "status": "available",
+            "created_at": (datetime(2025, 1, 1) + timedelta(minutes=i)).isoformat(),
+        }
+        for i in range(rows)
+    ]).encode()
+
+
+def users_payload(rows: int) -> bytes:
+    return json.dumps([
+        {
+            "user_id": i, "full_name": f"User {i}", "email": f"user{i}@example.com",
+            "phone": f"+92300{i:07d}", "address": f"House {i}, Street {i % 40}, Lahore",
+            "role": ("borrower", "lender")[i % 2],
+            "created_at": (datetime(2025, 1, 1) + timedelta(minutes=i)).isoformat(),
+        }
+        for i in range(rows)
+    ]).encode()
+
+
+def transactions_payload(rows: int) -> bytes:
+    return json.dumps([
+        {
+            "transaction_id": i, "type": ("DEPOSIT", "REFUND", "TOPUP", "EARNING")[i % 4],
+            "amount": 500.0 + i % 300, "description": f"Deposit locked for item 'Cordless drill {i}'",
+            "created_at": (datetime(2025, 1, 1) + timedelta(minutes=i)).isoformat(),
+        }
+        for i in range(rows)
+    ]).encode()
+
+
+def encoders():
+    yield "gzip-1", lambda: GzipStream(1)
+    yield "gzip-6", lambda: GzipStream(6)
+    yield "gzip-9", lambda: GzipStream(9)
+    if brotli is not None:
+        yield "br-1", lambda: BrotliStream(1)
+        yield "br-4", lambda: BrotliStream(4)
+        yield "br-11", lambda: BrotliStream(11)
+
+
+def measure(payload: bytes, make_stream, repeat: int):
+    """Returns (compressed size, CPU seconds per request)"""
+    started = time.process_time()
+    for _ in range(repeat):
+        data = make_stream().finish(payload)
+    return len(data), (time.process_time() - started) / repeat
+
+
+async def streamed_get(chunks: list[bytes]) -> tuple[dict, list[dict]]:
+    """GET through CompressionMiddleware(ETagMiddleware(app)) where app streams `chunks`"""
+    async def app(scope, receive, send):
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-type", b"application/x-ndjson")],  # No content-length: streamed
+        })
+        for index, chunk in enumerate(chunks):
+            await send({"type": "http.response.body", "body": chunk, "more_body": index < len(chunks) - 1})
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/export",
+        "query_string": b"",
+        "headers": [(b"accept-encoding", b"gzip")],
+    }
+    await CompressionMiddleware(ETagMiddleware(app))(scope, receive, send)
+    return messages[0], messages[1:]
+
+
+def check_streaming() -> int:
+    chunks = [json.dumps({"row": i, "title": f"Cordless drill {i}"}).encode() + b"\n" for i in range(200)]
+    start, bodies = asyncio.run(streamed_get(chunks))
+    headers = {name.decode().lower(): value.decode() for name, value in start["headers"]}
+    body = b"".join(message.get("body", b"") for message in bodies)
+
+    problems = []
+    if headers.get("content-encoding") != "gzip":
+        problems.append(f"content-encoding is {headers.get('content-encoding')!r}, expected 'gzip'")
+    if "etag" in headers:
+        problems.append("streamed response was buffered and hashed (has an ETag)")
+    if len(bodies) < len(chunks):
+        problems.append(f"{len(chunks)} chunks came back as {len(bodies)} body message(s)")
+    if not problems and zlib.decompress(body, 31) != b"".join(chunks):
+        problems.append("decompressed body differs from what the app streamed")
+
+    for problem in problems:
+        print(f"FAIL: {problem}")
+    if not problems:
+        print(f"OK: {len(chunks)} chunks streamed gzip-encoded ({len(body):,} bytes on the wire)")
+    return 1 if problems else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--check-streaming", action="store_true",
+                        help="Verify a streamed GET is compressed chunk by chunk, then exit")
+    args = parser.parse_args()
+
+    if args.check_streaming:
+        raise SystemExit(check_streaming())
+
+    if brotli is None:
+        print("brotli not installed - only gzip is measured\n")
+
+    for name, build in (("items", items_payload), ("users", users_payload), ("transactions", transactions_payload)):
+        for rows in args.rows:
+            payload = build(rows)
+            print(f"{name} x{rows}: identity {len(payload):,} bytes")
+            for label, make_stream in encoders():
+                size, cpu = measure(payload, make_stream, args.repeat)
+                print(f"  {label:7s} {size:>10,} bytes ({size / len(payload):6.1%})  {cpu * 1000:7.3f} ms CPU")
+            print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Startup Import Profile
+Runs `python -X importtime` on the application factory and summarizes where
+worker start-up time goes, grouped by top-level package.
+
+Usage (from backend/):
+    python -m benchmarks.bench_importtime            # build the app like a worker does
+    python -m benchmarks.bench_importtime --top 25 --raw importtime.log
+    python -m benchmarks.bench_importtime --runs 7 --code "import main"
+
+--runs takes the median per package over several interpreters (importtime is
+noisy). The checked-in benchmarks/importtime_profile.md was captured with it;
+--code "import main" profiles a tree from before the app factory, where
+importing main built the app.
+"""
+
+import argparse
+import collections
+import statistics
+import subprocess
+import sys
+
+STARTUP_CODE = "from main import create_app; create_app()"
+
+
+def run_importtime(code: str) -> list[tuple[int, int, str]]:
+    """Return (self_us, cumulative_us, module) for every import, in import order"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, check=True,
+    )
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|")
+        entries.append((int(self_us), int(cumulative_us), module.rstrip()))
+    return entries
+
+
+def package_totals(entries: list[tuple[int, int, str]]) -> collections.Counter:
+    """Self time (us) per top-level package"""
+    by_package = collections.Counter()
+    for self_us, _, module in entries:
+        by_package[module.strip().split(".")[0]] += self_us
+    return by_package
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--top", type=int, default=15, help="Packages to list")
+    parser.add_argument("--raw", help="Also write the raw -X importtime lines (first run) to this file")
+    parser.add_argument("--code", default=STARTUP_CODE, help="Start-up code to profile")
+    parser.add_argument("--runs", type=int, default=1, help="Interpreters to run; per-package medians are shown")
+    args = parser.parse_args()
+
+    runs = [run_importtime(args.code) for _ in range(args.runs)]
+    if args.raw:
+        with open(args.raw, "w") as fh:
+            for self_us, cumulative_us, module in runs[0]:
+                fh.write(f"{self_us:>10} | {cumulative_us:>10} | {module}\n")
+
+    totals = [package_totals(entries) for entries in runs]
+    packages = set().union(*totals)
+    by_package = collections.Counter({
+        package: int(statistics.median(run.get(package, 0) for run in totals)) for package in packages
+    })
+
+    total = int(statistics.median(sum(run.values()) for run in totals))
+    print(f"Total import time: {total / 1000:.1f} ms across {len(runs[0])} modules"
+          f"{f' (median of {args.runs} runs)' if args.runs > 1 else ''}\n")
+    print(f"{'package':30s} {'ms':>8s} {'share':>7s}")
+    for package, self_us in by_package.most_common(args.top):
+        print(f"{package:30s} {self_us / 1000:8.1f} {self_us / total:7.1%}")
+
+
+if __name__ == "__main__":
+    main()
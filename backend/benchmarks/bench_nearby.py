@@ -0,0 +1,110 @@
+"""
+Proximity Search Benchmark
+Times GET /items/nearby's lookup (geohash range scans + exact distance) at
+several radii against a full scan that computes every item's distance.
+
+Runs read-only against the database in DATABASE_URL. Load it first with
+items that have coordinates, e.g. 1M items around the datagen cities:
+
+    python -m benchmarks.datagen --reset --users 100000 --items 1000000
+
+Usage (from backend/):
+    python -m benchmarks.bench_nearby --queries 200 --radii 1,5,25
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from app.config.database import SessionLocal
+from app.models import Item
+from app.routes.items import _nearest_items
+from app.services import geo
+from benchmarks.datagen import CITIES, CITY_SPREAD
+
+
+def random_point(rng: random.Random) -> tuple[float, float]:
+    lat, lng = CITIES[rng.choice(list(CITIES))]
+    return lat + rng.uniform(-CITY_SPREAD, CITY_SPREAD), lng + rng.uniform(-CITY_SPREAD, CITY_SPREAD)
+
+
+def full_scan(db, lat: float, lng: float, radius_km: float, count: int) -> list[tuple[float, int]]:
+    """Baseline: distance to every active item with coordinates"""
+    rows = db.query(Item.item_id, Item.latitude, Item.longitude).filter(
+        Item.is_active == True,
+        Item.latitude.isnot(None),
+    )
+    hits = sorted(
+        (distance, item_id)
+        for item_id, item_lat, item_lng in rows
+        if (distance := geo.haversine_km(lat, lng, item_lat, item_lng)) <= radius_km
+    )
+    return hits[:count]
+
+
+def timed(fn, *args) -> tuple[float, list]:
+    started = time.perf_counter()
+    result = fn(*args)
+    return (time.perf_counter() - started) * 1000, result
+
+
+def summary(label: str, samples: list[float]):
+    samples = sorted(samples)
+    p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+    print(f"{label:<28} p50 {statistics.median(samples):8.2f} ms   p95 {p95:8.2f} ms   max {samples[-1]:8.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--queries", type=int, default=200, help="Queries per radius")
+    parser.add_argument("--radii", default="1,5,25", help="Comma separated radii in km")
+    parser.add_argument("--limit", type=int, default=20, help="Page size")
+    parser.add_argument("--pages", type=int, default=5, help="Pages walked with the cursor per query")
+    parser.add_argument("--baseline-queries", type=int, default=5, help="Full-scan queries (slow) per radius")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    db = SessionLocal()
+    try:
+        total = db.query(Item).filter(Item.geohash.isnot(None)).count()
+        print(f"{total:,} items with coordinates")
+
+        for radius in (float(r) for r in args.radii.split(",")):
+            first_page, walk, found = [], [], []
+            for _ in range(args.queries):
+                lat, lng = random_point(rng)
+                ms, page = timed(_nearest_items, db, lat, lng, radius, args.limit)
+                first_page.append(ms)
+                found.append(len(page))
+
+                # Follow the keyset cursor the way clients page through results
+                started = time.perf_counter()
+                after = page[-1] if page else None
+                for _ in range(args.pages - 1):
+                    if after is None:
+                        break
+                    page = _nearest_items(db, lat, lng, radius, args.limit, after)
+                    after = page[-1] if len(page) == args.limit else None
+                walk.append((time.perf_counter() - started) * 1000)
+
+            print(f"\nradius {radius:g} km ({len(geo.covering_cells(31.52, 74.36, radius))} cells, "
+                  f"avg {statistics.mean(found):.1f} results on page 1)")
+            summary("geohash, first page", first_page)
+            summary(f"geohash, next {args.pages - 1} pages", walk)
+
+            baseline = []
+            for _ in range(args.baseline_queries):
+                lat, lng = random_point(rng)
+                ms, expected = timed(full_scan, db, lat, lng, radius, args.limit)
+                baseline.append(ms)
+                assert _nearest_items(db, lat, lng, radius, args.limit) == expected, "results differ from full scan"
+            if baseline:
+                summary("full scan", baseline)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Serialization Benchmark
+Time to turn booking rows into JSON bytes, per 1,000 rows.
+
+Paths compared:
+- dicts   : build a dict per row, validate through BookingResponse (what
+            response_model does), jsonable_encoder + stdlib json
+- orjson  : same validation, encoded with ORJSONResponse (FAST_JSON_RESPONSES)
+- adapter : Row tuples validated once by TypeAdapter and dumped by pydantic-core
+            (the path used by the list endpoints)
+
+No database needed - rows are synthetic sqlalchemy Row objects.
+
+Usage (from backend/):
+    python -m benchmarks.bench_serialization --rows 1000 --repeat 50
+"""
+
+import argparse
+import json
+import time
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
+from sqlalchemy.engine.result import SimpleResultMetaData
+from sqlalchemy.engine.row import Row
+
+from app.models.booking import BookingStatusEnum
+from app.schemas.booking import BookingResponse
+
+FIELDS = list(BookingResponse.model_fields)
+
+
+def make_rows(count: int) -> list:
+    """Build Row objects shaped like bookings.BOOKING_COLUMNS results"""
+    metadata = SimpleResultMetaData(FIELDS)
+    statuses = list(BookingStatusEnum)
+    rows = []
+    for i in range(count):
+        values = (
+            i, i % 500, i % 97, i % 89,
+            date(2025, 1, 1) + timedelta(days=i % 300),
+            date(2025, 1, 8) + timedelta(days=i % 300),
+            Decimal("350.00") + i % 40,
+            statuses[i % len(statuses)],
+            "Need it for a weekend trip",
+            datetime(2025, 1, 1, 12, 0) + timedelta(minutes=i),
+            f"Item {i % 500}", "Lahore", f"Lender {i % 89}", f"Borrower {i % 97}",
+        )
+        rows.append(Row(metadata, None, metadata._key_to_index, values))
+    return rows
+
+
+def via_dicts(rows) -> bytes:
+    dicts = [
+        {**row._asdict(), "status": row.status.value}
+        for row in rows
+    ]
+    validated = [BookingResponse.model_validate(d) for d in dicts]
+    return json.dumps(jsonable_encoder(validated)).encode("utf-8")
+
+
+def via_orjson(rows) -> bytes:
+    dicts = [
+        {**row._asdict(), "status": row.status.value}
+        for row in rows
+    ]
+    validated = [BookingResponse.model_validate(d) for d in dicts]
+    return ORJSONResponse(jsonable_encoder(validated)).body
+
+
+adapter = TypeAdapter(list[BookingResponse])
+
+
+def via_adapter(rows) -> bytes:
+    return adapter.dump_json(adapter.validate_python(rows, from_attributes=True))
+
+
+def timed(fn, rows, repeat: int) -> float:
+    fn(rows)  # warm up
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn(rows)
+    return (time.perf_counter() - started) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    scale = 1000 / args.rows
+    baseline = None
+    for name, fn in (("dicts", via_dicts), ("orjson", via_orjson), ("adapter", via_adapter)):
+        elapsed = timed(fn, rows, args.repeat) * scale
+        baseline = baseline or elapsed
+        print(f"{name:8s}: {elapsed * 1000:7.2f} ms per 1,000 rows ({baseline / elapsed:4.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,402 @@
+"""
+Synthetic Data Generator
+Bulk-loads millions of consistent users, wallets, items, bookings,
+transactions and disputes for scale testing.
+
+- Deterministic: every row is a pure function of (--seed, table, row id),
+  so the same arguments always produce the same data, whatever --workers is
+- Parallel: each table is split into fixed-size chunks generated and
+  loaded by a process pool (tables are loaded in foreign-key order)
+- Fast: PostgreSQL chunks go through COPY ... FROM STDIN (CSV); other
+  databases fall back to batched executemany INSERTs
+
+Each booking yields ~1.65 transactions on average (deposit + earning once
+paid, plus a refund once returned), plus --topups-per-user topups.
+Passing --transactions picks the booking count that reaches that total.
+
+Every user can log in as user{id}@datagen.example.com with the load test's
+BENCH_PASSWORD.
+
+Usage (from backend/):
+    python -m benchmarks.datagen --database-url postgresql://... --reset \\
+        --users 1000000 --items 2000000 --transactions 10000000 --workers 8
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+import argparse
+import csv
+import enum
+import io
+import math
+import os
+import time
+
+from functools import lru_cache
+
+from app.services.geo import encode as geohash_encode
+
+CHUNK_ROWS = 200_000
+TX_SLOTS_PER_BOOKING = 3  # deposit, earning, refund - tx ids are derived from booking ids
+BASE_TIME = datetime(2025, 1, 1)
+BASE_DATE = date(2025, 1, 1)
+WALLET_BALANCE = Decimal("500000.00")
+EMAIL_DOMAIN = "datagen.example.com"  # Must pass EmailStr on /auth/login (.local does not)
+
+
+# City name -> (lat, lng) of its centre; items are scattered up to ~CITY_SPREAD degrees around it
+CITIES = {
+    "Lahore": (31.5204, 74.3587),
+    "Karachi": (24.8607, 67.0011),
+    "Islamabad": (33.6844, 73.0479),
+    "Rawalpindi": (33.5651, 73.0169),
+    "Faisalabad": (31.4504, 73.1350),
+}
+CITY_NAMES = list(CITIES)
+CITY_SPREAD = 0.25
+
+TABLE_TAGS = {"users": 1, "items": 2, "bookings": 3, "disputes": 4, "topups": 5}
+
+
+# ============ Booking status mix ============
+
+@lru_cache(maxsize=None)
+def booking_mix():
+    """
+    The load test's booking status weights, as cumulative thresholds
+    Imported lazily: seed pulls in app.models, which builds the engine from
+    DATABASE_URL - only set once main() has parsed --database-url.
+
+    Returns:
+        (thresholds [(cumulative weight, status)], total weight, paid statuses, active statuses)
+    """
+    from benchmarks.loadtest.seed import BOOKING_STATUS_WEIGHTS, PAID_STATUSES, ACTIVE_STATUSES
+
+    thresholds = []
+    running = 0
+    for status, weight in BOOKING_STATUS_WEIGHTS.items():
+        running += weight
+        thresholds.append((running, status))
+    return thresholds, running, PAID_STATUSES, ACTIVE_STATUSES
+
+
+# ============ Deterministic randomness ============
+
+def mix(*values: int) -> int:
+    """splitmix64 over the inputs - a fast, well-distributed hash used instead of per-row RNGs"""
+    h = 0x9E3779B97F4A7C15
+    for value in values:
+        h = (h ^ (value & 0xFFFFFFFFFFFFFFFF)) * 0xBF58476D1CE4E5B9 & 0xFFFFFFFFFFFFFFFF
+        h = (h ^ (h >> 27)) * 0x94D049BB133111EB & 0xFFFFFFFFFFFFFFFF
+        h ^= h >> 31
+    return h
+
+
+# Roles are fixed by user_id: 1 = admin, last digit 1-3 = lender, others borrower
+def role_of(user_id: int) -> str:
+    if user_id == 1:
+        return "ADMIN"
+    return "LENDER" if user_id % 10 in (1, 2, 3) else "BORROWER"
+
+
+def pick_lender(h: int, users: int) -> int:
+    tens = (h >> 8) % max(users // 10, 1)
+    lender = tens * 10 + 1 + h % 3
+    return lender if lender <= users and lender != 1 else 11
+
+
+def pick_borrower(h: int, users: int) -> int:
+    tens = (h >> 8) % max(users // 10, 1)
+    borrower = tens * 10 + (4, 5, 6, 7, 8, 9, 0)[h % 7]
+    return borrower if 2 <= borrower <= users else 4
+
+
+def item_attrs(seed: int, item_id: int, users: int) -> dict:
+    """Everything bookings need to know about an item, recomputed instead of looked up"""
+    h = mix(seed, TABLE_TAGS["items"], item_id)
+    min_days = 1 + h % 3
+    return {
+        "lender_id": pick_lender(h, users),
+        "daily_deposit": 50 + (h >> 16) % 451,
+        "min_days": min_days,
+        "max_days": min_days + 3 + (h >> 24) % 18,
+        "title": f"Item {item_id}",
+    }
+
+
+# ============ Row generators (one chunk of ids each) ============
+
+USER_COLUMNS = ["user_id", "full_name", "email", "password_hash", "phone", "address", "role", "created_at"]
+WALLET_COLUMNS = ["wallet_id", "user_id", "balance", "created_at"]
+ITEM_COLUMNS = ["item_id", "lender_id", "title", "description", "condition", "estimated_price", "min_days",
+                "max_days", "daily_deposit", "images", "location", "latitude", "longitude", "geohash",
+                "is_active", "status", "created_at"]
+BOOKING_COLUMNS = ["booking_id", "item_id", "borrower_id", "lender_id", "start_date", "end_date",
+                   "total_deposit", "status", "reason", "created_at"]
+TX_COLUMNS = ["tx_id", "user_id", "wallet_id", "booking_id", "amount", "tx_type", "description", "created_at"]
+DISPUTE_COLUMNS = ["dispute_id", "booking_id", "raised_by", "description", "estimated_cost", "status",
+                   "resolution_notes", "created_at", "resolved_at"]
+
+
+def gen_users(cfg: dict, first: int, last: int):
+    users, wallets = [], []
+    for user_id in range(first, last + 1):
+        h = mix(cfg["seed"], TABLE_TAGS["users"], user_id)
+        created_at = BASE_TIME - timedelta(minutes=h % 525_600)
+        users.append((user_id, f"User {user_id}", f"user{user_id}@{EMAIL_DOMAIN}", cfg["password_hash"],
+                      f"+92300{user_id % 10_000_000:07d}", f"Street {h % 500}", role_of(user_id), created_at))
+        wallets.append((user_id, user_id, WALLET_BALANCE, created_at))
+    return [("users", USER_COLUMNS, users), ("wallet", WALLET_COLUMNS, wallets)]
+
+
+def gen_items(cfg: dict, first: int, last: int):
+    rows = []
+    for item_id in range(first, last + 1):
+        attrs = item_attrs(cfg["seed"], item_id, cfg["users"])
+        h = mix(cfg["seed"], TABLE_TAGS["items"], item_id, 1)
+        city = CITY_NAMES[(h >> 12) % len(CITY_NAMES)]
+        g = mix(cfg["seed"], TABLE_TAGS["items"], item_id, 2)
+        lat = round(CITIES[city][0] + ((g & 0xFFFFFFFF) / 0xFFFFFFFF * 2 - 1) * CITY_SPREAD, 6)
+        lng = round(CITIES[city][1] + ((g >> 32) / 0xFFFFFFFF * 2 - 1) * CITY_SPREAD, 6)
+        rows.append((item_id, attrs["lender_id"], attrs["title"], "Generated item", ("New", "Good", "Used")[h % 3],
+                     Decimal(1000 + (h >> 4) % 49000), attrs["min_days"], attrs["max_days"],
+                     Decimal(attrs["daily_deposit"]), [f"https://example.com/items/{item_id}.png"],
+                     city, lat, lng, geohash_encode(lat, lng),
+                     (h >> 20) % 20 != 0, "AVAILABLE", BASE_TIME - timedelta(minutes=(h >> 24) % 525_600)))
+    return [("items", ITEM_COLUMNS, rows)]
+
+
+def gen_bookings(cfg: dict, first: int, last: int):
+    bookings, transactions, disputes = [], [], []
+    seed, users = cfg["seed"], cfg["users"]
+    status_thresholds, status_total, paid_statuses, _ = booking_mix()
+    for booking_id in range(first, last + 1):
+        h = mix(seed, TABLE_TAGS["bookings"], booking_id)
+        item_id = 1 + h % cfg["items"]
+        item = item_attrs(seed, item_id, users)
+        roll = (h >> 20) % status_total
+        status = next(s for threshold, s in status_thresholds if roll < threshold)
+        days = item["min_days"] + (h >> 28) % (item["max_days"] - item["min_days"] + 1)
+        start = BASE_DATE + timedelta(days=(h >> 36) % 400 - 200)
+        deposit = Decimal(item["daily_deposit"] * days)
+        borrower_id = pick_borrower(mix(seed, TABLE_TAGS["bookings"], booking_id, 1), users)
+        created_at = BASE_TIME - timedelta(minutes=(h >> 44) % 259_200)
+        bookings.append((booking_id, item_id, borrower_id, item["lender_id"], start, start + timedelta(days=days),
+                         deposit, status.name, "Generated booking", created_at))
+
+        tx_base = (booking_id - 1) * TX_SLOTS_PER_BOOKING
+        if status in paid_statuses:
+            transactions.append((tx_base + 1, borrower_id, borrower_id, booking_id, deposit, "DEPOSIT",
+                                 f"Deposit locked for item '{item['title']}'", created_at))
+            transactions.append((tx_base + 2, item["lender_id"], item["lender_id"], booking_id, deposit, "EARNING",
+                                 f"Earning from renting '{item['title']}'", created_at))
+            dispute_roll = mix(seed, TABLE_TAGS["disputes"], booking_id)
+            if dispute_roll % 1000 < cfg["dispute_per_mille"]:
+                dispute_status = ("OPEN", "RESOLVED", "REJECTED")[(dispute_roll >> 10) % 3]
+                opened_at = created_at + timedelta(days=days)
+                disputes.append((booking_id, booking_id, (borrower_id, item["lender_id"])[(dispute_roll >> 12) % 2],
+                                 "Item returned damaged", Decimal(100 + (dispute_roll >> 14) % 4900), dispute_status,
+                                 None if dispute_status == "OPEN" else "Reviewed by admin", opened_at,
+                                 None if dispute_status == "OPEN" else opened_at + timedelta(days=3)))
+        if status.name == "RETURNED":
+            transactions.append((tx_base + 3, borrower_id, borrower_id, None, deposit, "REFUND",
+                                 f"Deposit refund for item '{item['title']}'", created_at))
+    return [("bookings", BOOKING_COLUMNS, bookings), ("transactions", TX_COLUMNS, transactions),
+            ("disputes", DISPUTE_COLUMNS, disputes)]
+
+
+def gen_topups(cfg: dict, first: int, last: int):
+    """Topups for users first..last; tx ids start after the booking-derived range"""
+    rows = []
+    per_user = cfg["topups_per_user"]
+    offset = cfg["bookings"] * TX_SLOTS_PER_BOOKING
+    for user_id in range(first, last + 1):
+        for n in range(per_user):
+            h = mix(cfg["seed"], TABLE_TAGS["topups"], user_id, n)
+            rows.append((offset + (user_id - 1) * per_user + n + 1, user_id, user_id, None,
+                         Decimal(100 + h % 20000), "TOPUP", "Wallet topup via credit_card",
+                         BASE_TIME - timedelta(minutes=h % 525_600)))
+    return [("transactions", TX_COLUMNS, rows)]
+
+
+GENERATORS = {"users": gen_users, "items": gen_items, "bookings": gen_bookings, "topups": gen_topups}
+
+
+# ============ Loading ============
+
+def _copy_value(value):
+    """Python value -> PostgreSQL CSV text (None stays empty, which COPY reads as NULL)"""
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, enum.Enum):
+        return value.name
+    if isinstance(value, list):
+        return "{" + ",".join('"' + str(v).replace('"', '\\"') + '"' for v in value) + "}"
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def copy_rows(engine, table: str, columns: list, rows: list):
+    raw = engine.raw_connection()
+    try:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow([_copy_value(value) for value in row])
+        buffer.seek(0)
+        with raw.cursor() as cursor:
+            cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+        raw.commit()
+    finally:
+        raw.close()
+
+
+def insert_rows(engine, table: str, columns: list, rows: list, batch: int = 5000):
+    """Fallback for databases without COPY - executemany through the model tables"""
+    from app.config.database import Base
+    import app.models  # noqa: F401 - registers the tables
+
+    target = Base.metadata.tables[table]
+    enum_columns = {column.name: column.type.enum_class for column in target.columns
+                    if getattr(column.type, "enum_class", None) is not None}
+    with engine.begin() as conn:
+        for start in range(0, len(rows), batch):
+            dicts = []
+            for row in rows[start:start + batch]:
+                record = dict(zip(columns, row))
+                for name, enum_class in enum_columns.items():
+                    if isinstance(record[name], str):
+                        record[name] = enum_class[record[name]]
+                dicts.append(record)
+            conn.execute(target.insert(), dicts)
+
+
+def run_chunk(task: tuple) -> dict:
+    """Worker entry point: generate one chunk and load it"""
+    database_url, kind, cfg, first, last = task
+    from sqlalchemy import create_engine
+
+    engine = create_engine(database_url, future=True)
+    counts = {}
+    try:
+        for table, columns, rows in GENERATORS[kind](cfg, first, last):
+            if not rows:
+                continue
+            if engine.dialect.name == "postgresql":
+                copy_rows(engine, table, columns, rows)
+            else:
+                insert_rows(engine, table, columns, rows)
+            counts[table] = counts.get(table, 0) + len(rows)
+    finally:
+        engine.dispose()
+    return counts
+
+
+def chunks(total: int, size: int):
+    for first in range(1, total + 1, size):
+        yield first, min(first + size - 1, total)
+
+
+def finalize(engine):
+    """Derived state that needs the whole data set, then sequences and statistics"""
+    from sqlalchemy import text
+
+    active = ", ".join(f"'{status.name}'" for status in booking_mix()[3])
+    with engine.begin() as conn:
+        conn.execute(text(
+            f"UPDATE items SET status = 'RENTED' WHERE item_id IN "
+            f"(SELECT item_id FROM bookings WHERE status IN ({active}))"
+        ))
+        if conn.dialect.name == "postgresql":
+            for table, column in (("users", "user_id"), ("wallet", "wallet_id"), ("items", "item_id"),
+                                  ("bookings", "booking_id"), ("transactions", "tx_id"), ("disputes", "dispute_id")):
+                conn.execute(text(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', '{column}'), "
+                    f"COALESCE((SELECT MAX({column}) FROM {table}), 0) + 1, false)"
+                ))
+    # Rows were loaded directly, so derive the denormalized counters once
+    from sqlalchemy.orm import Session
+    from app.services import lender_stats
+    with Session(engine) as session:
+        lender_stats.rebuild(session)
+
+    if engine.dialect.name == "postgresql":
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(text("ANALYZE"))
+
+
+def bookings_for_transactions(target: int, users: int, topups_per_user: int) -> int:
+    thresholds, total, paid_statuses, _ = booking_mix()
+    weights, previous = {}, 0
+    for threshold, status in thresholds:
+        weights[status], previous = threshold - previous, threshold
+    paid = sum(w for s, w in weights.items() if s in paid_statuses) / total
+    returned = sum(w for s, w in weights.items() if s.name == "RETURNED") / total
+    per_booking = 2 * paid + returned
+    return max(0, math.ceil((target - users * topups_per_user) / per_booking))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", required=True)
+    parser.add_argument("--reset", action="store_true", help="Drop everything and migrate before loading")
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--items", type=int, default=200_000)
+    parser.add_argument("--bookings", type=int, help="Defaults to what --transactions needs")
+    parser.add_argument("--transactions", type=int, default=1_000_000, help="Approximate transactions to produce")
+    parser.add_argument("--topups-per-user", type=int, default=2)
+    parser.add_argument("--dispute-per-mille", type=int, default=50, help="Disputes per 1000 paid bookings")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    # Set before anything imports app.config.database (workers inherit it too)
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ.setdefault("DB_ECHO", "false")
+    from sqlalchemy import create_engine
+    from app.routes.auth import hash_password
+    from benchmarks.loadtest.seed import BENCH_PASSWORD
+
+    engine = create_engine(args.database_url, future=True)
+    if args.reset:
+        from benchmarks.loadtest.seed import reset_database
+        reset_database(engine)
+
+    bookings = args.bookings if args.bookings is not None else bookings_for_transactions(
+        args.transactions, args.users, args.topups_per_user)
+    cfg = {
+        "seed": args.seed, "users": args.users, "items": args.items, "bookings": bookings,
+        "topups_per_user": args.topups_per_user, "dispute_per_mille": args.dispute_per_mille,
+        "password_hash": hash_password(BENCH_PASSWORD),
+    }
+    print(f"Generating {args.users:,} users, {args.items:,} items, {bookings:,} bookings "
+          f"with {args.workers} workers")
+
+    # Foreign-key order: users/wallets -> items -> bookings (+ their transactions/disputes) -> topups
+    phases = [("users", args.users), ("items", args.items), ("bookings", bookings), ("topups", args.users)]
+    totals = {}
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        for kind, total in phases:
+            phase_started = time.perf_counter()
+            tasks = [(args.database_url, kind, cfg, first, last) for first, last in chunks(total, args.chunk_rows)]
+            for counts in pool.map(run_chunk, tasks):
+                for table, count in counts.items():
+                    totals[table] = totals.get(table, 0) + count
+            print(f"  {kind:9s} done in {time.perf_counter() - phase_started:7.1f}s")
+
+    finalize(engine)
+    engine.dispose()
+    elapsed = time.perf_counter() - started
+    for table, count in totals.items():
+        print(f"  {table:13s} {count:>12,} rows")
+    print(f"Loaded {sum(totals.values()):,} rows in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
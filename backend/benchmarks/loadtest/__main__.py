@@ -0,0 +1,119 @@
+"""
+Load test entry point - see benchmarks/loadtest/__init__.py
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+from datetime import timedelta
+
+
+def parse_mix(raw: str, scenarios: dict) -> dict:
+    """"browse=50,book=10" -> weights; unknown names are rejected"""
+    if not raw:
+        return {name: weight for name, (_, weight) in scenarios.items()}
+    weights = {}
+    for part in raw.split(","):
+        name, _, weight = part.partition("=")
+        if name not in scenarios:
+            raise SystemExit(f"Unknown scenario '{name}'. Choose from: {', '.join(scenarios)}")
+        weights[name] = float(weight or 1)
+    return weights
+
+
+async def drive(app, seed, args, count_sql: bool) -> dict:
+    import httpx
+
+    from app.routes.auth import create_access_token
+    from benchmarks.loadtest.metrics import Recorder
+    from benchmarks.loadtest.scenarios import BenchClient, SCENARIOS
+
+    weights = parse_mix(args.mix, SCENARIOS)
+    names = list(weights)
+    user_ids = [seed.admin_id] + seed.lender_ids + seed.borrower_ids
+    tokens = {
+        user_id: create_access_token({"sub": str(user_id)}, expires_delta=timedelta(hours=12))
+        for user_id in user_ids
+    }
+
+    recorder = Recorder()
+    transport = httpx.ASGITransport(app=app) if app is not None else None
+    async with httpx.AsyncClient(transport=transport, base_url=args.base_url or "http://loadtest",
+                                 timeout=60) as http:
+        client = BenchClient(http, recorder, tokens, count_sql)
+        deadline = time.monotonic() + args.duration
+
+        async def virtual_user(index: int):
+            rng = random.Random(args.seed + index)
+            while time.monotonic() < deadline:
+                name = rng.choices(names, [weights[n] for n in names])[0]
+                await SCENARIOS[name][0](client, seed, rng)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(virtual_user(i) for i in range(args.concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return recorder.summary(elapsed)
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.loadtest")
+    parser.add_argument("--database-url", required=True, help="Throwaway database - it is wiped unless --no-seed")
+    parser.add_argument("--base-url", help="Drive a running server instead of the in-process app (no SQL counts)")
+    parser.add_argument("--no-seed", action="store_true", help="Reuse data from a previous run")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--bookings", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=16, help="Virtual users running scenarios in parallel")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds to run")
+    parser.add_argument("--mix", default="", help="Scenario weights, e.g. browse=50,book=10,accept=10")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--keep-rate-limits", action="store_true", help="Leave rate limiting on")
+    parser.add_argument("--json", help="Also write the summary to this file")
+    args = parser.parse_args()
+
+    database_url = args.database_url
+    if database_url.startswith("sqlite") and "check_same_thread" not in database_url:
+        database_url += ("&" if "?" in database_url else "?") + "check_same_thread=false"
+
+    # Settings are read once, on first import of the app - configure before importing it
+    os.environ["DATABASE_URL"] = database_url
+    os.environ.setdefault("DB_ECHO", "false")
+    if not args.keep_rate_limits:
+        os.environ["RATE_LIMIT_ENABLED"] = "false"
+
+    from app.config.database import engine, replica_router
+    from benchmarks.loadtest.metrics import count_statements, print_summary
+    from benchmarks.loadtest.seed import reset_database, seed_database, load_existing
+
+    if args.no_seed:
+        seed = load_existing(engine)
+    else:
+        print("Seeding...")
+        reset_database(engine)
+        seed = seed_database(engine, users=args.users, items=args.items, bookings=args.bookings, seed=args.seed)
+    print(f"Data: {seed.counts}")
+
+    async def run():
+        if args.base_url:
+            return await drive(None, seed, args, count_sql=False)
+        from main import create_app
+
+        for counted_engine in [engine] + replica_router.engines:
+            count_statements(counted_engine)
+        app = create_app()
+        async with app.router.lifespan_context(app):
+            return await drive(app, seed, args, count_sql=True)
+
+    summary = asyncio.run(run())
+    print_summary(summary)
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump(summary, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
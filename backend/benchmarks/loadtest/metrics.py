@@ -0,0 +1,81 @@
+"""
+Load Test Metrics
+Latency samples and SQL statement counts, grouped by endpoint label.
+"""
+
+from contextvars import ContextVar
+from typing import Optional
+import collections
+
+from sqlalchemy import event
+
+# Statement counter for the request currently being driven (a one-element list)
+current_statement_count: ContextVar[Optional[list]] = ContextVar("current_statement_count", default=None)
+
+
+def count_statements(engine):
+    """Count every statement executed on `engine` against the active request"""
+    @event.listens_for(engine, "before_cursor_execute")
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        counter = current_statement_count.get()
+        if counter is not None:
+            counter[0] += 1
+
+
+def percentile(sorted_values: list, pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class Recorder:
+    """Collects one sample per request"""
+
+    def __init__(self):
+        self.latencies = collections.defaultdict(list)  # label -> seconds
+        self.statements = collections.defaultdict(list)  # label -> SQL statement counts
+        self.errors = collections.Counter()  # label -> unexpected responses
+        self.statuses = collections.defaultdict(collections.Counter)  # label -> status -> count
+
+    def add(self, label: str, seconds: float, status: int, statements: Optional[int], ok: bool):
+        self.latencies[label].append(seconds)
+        self.statuses[label][status] += 1
+        if statements is not None:
+            self.statements[label].append(statements)
+        if not ok:
+            self.errors[label] += 1
+
+    def summary(self, elapsed: float) -> dict:
+        endpoints = {}
+        for label, samples in sorted(self.latencies.items()):
+            ordered = sorted(samples)
+            statements = self.statements.get(label)
+            endpoints[label] = {
+                "requests": len(samples),
+                "errors": self.errors[label],
+                "statuses": dict(self.statuses[label]),
+                "rps": round(len(samples) / elapsed, 2),
+                "p50_ms": round(percentile(ordered, 50) * 1000, 2),
+                "p95_ms": round(percentile(ordered, 95) * 1000, 2),
+                "p99_ms": round(percentile(ordered, 99) * 1000, 2),
+                "sql_per_request": round(sum(statements) / len(statements), 2) if statements else None,
+            }
+        total = sum(len(samples) for samples in self.latencies.values())
+        return {
+            "elapsed_s": round(elapsed, 2),
+            "requests": total,
+            "throughput_rps": round(total / elapsed, 2) if elapsed else 0.0,
+            "errors": sum(self.errors.values()),
+            "endpoints": endpoints,
+        }
+
+
+def print_summary(summary: dict):
+    print(f"\n{summary['requests']} requests in {summary['elapsed_s']}s "
+          f"({summary['throughput_rps']} req/s, {summary['errors']} errors)\n")
+    print(f"{'endpoint':40s} {'reqs':>6s} {'err':>5s} {'rps':>8s} {'p50':>8s} {'p95':>8s} {'p99':>8s} {'sql':>6s}")
+    for label, stats in summary["endpoints"].items():
+        sql = "-" if stats["sql_per_request"] is None else f"{stats['sql_per_request']:.1f}"
+        print(f"{label:40s} {stats['requests']:6d} {stats['errors']:5d} {stats['rps']:8.1f} "
+              f"{stats['p50_ms']:8.1f} {stats['p95_ms']:8.1f} {stats['p99_ms']:8.1f} {sql:>6s}")
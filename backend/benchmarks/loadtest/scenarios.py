@@ -0,0 +1,140 @@
+"""
+Load Test Scenarios
+Each scenario is one user journey made of several requests. Labels use the
+route template so results group by endpoint, not by ID.
+"""
+
+from datetime import date, timedelta
+from time import perf_counter
+
+from benchmarks.loadtest.metrics import current_statement_count
+
+
+class BenchClient:
+    """Wraps httpx.AsyncClient, timing each request and counting its SQL statements"""
+
+    def __init__(self, http, recorder, tokens: dict, count_sql: bool):
+        self.http = http
+        self.recorder = recorder
+        self.tokens = tokens
+        self.count_sql = count_sql
+
+    async def call(self, label: str, method: str, url: str, user_id: int = None, expect=(200,), **kwargs):
+        headers = kwargs.pop("headers", {})
+        if user_id is not None:
+            headers["Authorization"] = f"Bearer {self.tokens[user_id]}"
+        counter = [0]
+        token = current_statement_count.set(counter) if self.count_sql else None
+        started = perf_counter()
+        try:
+            response = await self.http.request(method, url, headers=headers, **kwargs)
+        finally:
+            elapsed = perf_counter() - started
+            if token is not None:
+                current_statement_count.reset(token)
+        self.recorder.add(label, elapsed, response.status_code,
+                          counter[0] if self.count_sql else None, response.status_code in expect)
+        return response
+
+
+async def browse_items(client, seed, rng):
+    """Anonymous visitor: listing, item detail, lender's other items, availability"""
+    await client.call("GET /items/", "GET", "/items/", params={"skip": rng.randrange(0, 500, 20), "limit": 20})
+    item_id = rng.choice(seed.item_ids)
+    response = await client.call("GET /items/{item_id}", "GET", f"/items/{item_id}")
+    if response.status_code == 200:
+        lender_id = response.json()["lender_id"]
+        await client.call("GET /items/lender/{lender_id}", "GET", f"/items/lender/{lender_id}")
+    await client.call("GET /bookings/active-items", "GET", "/bookings/active-items")
+
+
+async def create_booking(client, seed, rng):
+    """Borrower requests an item for its minimum rental period"""
+    borrower_id = rng.choice(seed.borrower_ids)
+    item_id = rng.choice(seed.item_ids)
+    response = await client.call("GET /items/{item_id}", "GET", f"/items/{item_id}")
+    if response.status_code != 200:
+        return
+    item = response.json()
+    start = date.today() + timedelta(days=rng.randint(1, 60))
+    await client.call(
+        "POST /bookings/", "POST", "/bookings/", user_id=borrower_id, expect=(201, 400),
+        json={"item_id": item_id, "start_date": start.isoformat(),
+              "end_date": (start + timedelta(days=item["min_days"])).isoformat(), "reason": "Load test"},
+    )
+
+
+async def lender_decides(client, seed, rng):
+    """Lender opens pending requests and accepts (or sometimes rejects) the oldest"""
+    lender_id = rng.choice(seed.lender_ids)
+    response = await client.call("GET /bookings/pending", "GET", "/bookings/pending", user_id=lender_id)
+    pending = response.json() if response.status_code == 200 else []
+    if pending:
+        decision = "rejected" if rng.random() < 0.2 else "accepted"
+        await client.call("PATCH /bookings/{booking_id}", "PATCH", f"/bookings/{pending[0]['booking_id']}",
+                          user_id=lender_id, expect=(200, 400), json={"status": decision})
+
+
+async def return_item(client, seed, rng):
+    """Borrower starts a return and the lender confirms it"""
+    borrower_id = rng.choice(seed.borrower_ids)
+    response = await client.call("GET /bookings/", "GET", "/bookings/", user_id=borrower_id)
+    bookings = response.json() if response.status_code == 200 else []
+    active = [b for b in bookings if b["borrower_id"] == borrower_id and b["status"] == "accepted"]
+    if not active:
+        return
+    booking = rng.choice(active)
+    response = await client.call("PATCH /bookings/{booking_id}", "PATCH", f"/bookings/{booking['booking_id']}",
+                                 user_id=borrower_id, expect=(200, 400), json={"status": "return_pending"})
+    if response.status_code == 200:
+        await client.call("PATCH /bookings/{booking_id}", "PATCH", f"/bookings/{booking['booking_id']}",
+                          user_id=booking["lender_id"], expect=(200, 400), json={"status": "returned"})
+
+
+async def wallet_topup(client, seed, rng):
+    """User tops up and checks balance and history"""
+    user_id = rng.choice(seed.borrower_ids)
+    await client.call("POST /wallet/topup", "POST", "/wallet/topup", user_id=user_id,
+                      json={"amount": rng.randint(100, 5000), "payment_method": "credit_card"})
+    await client.call("GET /wallet/balance", "GET", "/wallet/balance", user_id=user_id)
+    await client.call("GET /wallet/transactions", "GET", "/wallet/transactions", user_id=user_id)
+
+
+async def raise_dispute(client, seed, rng):
+    """Borrower disputes one of their bookings and lists their disputes"""
+    borrower_id = rng.choice(seed.borrower_ids)
+    response = await client.call("GET /bookings/", "GET", "/bookings/", user_id=borrower_id)
+    bookings = response.json() if response.status_code == 200 else []
+    if bookings:
+        booking = rng.choice(bookings)
+        await client.call("POST /disputes/", "POST", "/disputes/", user_id=borrower_id, expect=(201, 400),
+                          json={"booking_id": booking["booking_id"], "description": "Load test dispute",
+                                "estimated_cost": rng.randint(100, 2000)})
+    await client.call("GET /disputes/", "GET", "/disputes/", user_id=borrower_id)
+
+
+async def login(client, seed, rng):
+    """Password login (argon2 verification)"""
+    from benchmarks.loadtest.seed import BENCH_PASSWORD, bench_email
+
+    user_id = rng.choice(seed.borrower_ids + seed.lender_ids)
+    await client.call("POST /auth/login", "POST", "/auth/login",
+                      json={"email": bench_email(user_id), "password": BENCH_PASSWORD})
+
+
+async def admin_reads(client, seed, rng):
+    """Admin dashboard reads"""
+    await client.call("GET /auth/users", "GET", "/auth/users", user_id=seed.admin_id)
+
+
+# name -> (scenario, default weight)
+SCENARIOS = {
+    "browse": (browse_items, 40),
+    "book": (create_booking, 15),
+    "accept": (lender_decides, 12),
+    "return": (return_item, 8),
+    "topup": (wallet_topup, 10),
+    "dispute": (raise_dispute, 5),
+    "login": (login, 5),
+    "admin": (admin_reads, 5),
+}
@@ -0,0 +1,225 @@
+"""
+Load Test Seeding
+Deterministic users, wallets, items, bookings (every BookingStatusEnum
+state), transactions and disputes, inserted in batches with Core
+executemany. Primary keys are assigned here so scenarios know what exists.
+"""
+
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+import random
+
+from sqlalchemy import MetaData, text
+
+from app import migrations
+from app.models import User, Wallet, Item, Booking, Transaction, Dispute
+from app.models.user import RoleEnum
+from app.models.item import ItemStatusEnum
+from app.models.booking import BookingStatusEnum
+from app.models.transaction import TransactionTypeEnum
+from app.models.dispute import DisputeStatusEnum
+from app.routes.auth import hash_password
+
+BENCH_PASSWORD = "benchpass"
+INSERT_BATCH = 5000
+
+# Share of bookings in each state
+BOOKING_STATUS_WEIGHTS = {
+    BookingStatusEnum.PENDING: 20,
+    BookingStatusEnum.ACCEPTED: 20,
+    BookingStatusEnum.REJECTED: 10,
+    BookingStatusEnum.AWAITING_PICKUP: 5,
+    BookingStatusEnum.PICKED_UP: 10,
+    BookingStatusEnum.RETURN_PENDING: 10,
+    BookingStatusEnum.RETURNED: 25,
+}
+# States in which the deposit has moved from borrower to lender
+PAID_STATUSES = {
+    BookingStatusEnum.ACCEPTED,
+    BookingStatusEnum.AWAITING_PICKUP,
+    BookingStatusEnum.PICKED_UP,
+    BookingStatusEnum.RETURN_PENDING,
+    BookingStatusEnum.RETURNED,
+}
+ACTIVE_STATUSES = {BookingStatusEnum.ACCEPTED, BookingStatusEnum.AWAITING_PICKUP, BookingStatusEnum.PICKED_UP}
+
+
+def bench_email(user_id: int) -> str:
+    """Login address of a seeded user (must pass EmailStr - special-use domains like .local don't)"""
+    return f"user{user_id}@bench.example.com"
+
+
+@dataclass
+class SeedResult:
+    """What scenarios need to know about the seeded data"""
+    admin_id: int = 0
+    lender_ids: list = field(default_factory=list)
+    borrower_ids: list = field(default_factory=list)
+    item_ids: list = field(default_factory=list)
+    counts: dict = field(default_factory=dict)
+
+
+def reset_database(engine):
+    """Drop every table (including schema_migrations) and migrate from scratch"""
+    reflected = MetaData()
+    reflected.reflect(bind=engine)
+    reflected.drop_all(bind=engine)
+    if engine.dialect.name == "postgresql":
+        with engine.begin() as conn:
+            for enum_name in ("roleenum", "itemstatusenum", "bookingstatusenum",
+                              "transactiontypeenum", "disputestatusenum"):
+                conn.execute(text(f"DROP TYPE IF EXISTS {enum_name}"))
+    migrations.upgrade(engine, log=lambda message: None)
+
+
+def _insert(conn, model, rows: list):
+    for start in range(0, len(rows), INSERT_BATCH):
+        conn.execute(model.__table__.insert(), rows[start:start + INSERT_BATCH])
+
+
+def _reset_sequences(conn):
+    """Move PostgreSQL serial sequences past the explicitly assigned IDs"""
+    if conn.dialect.name != "postgresql":
+        return
+    for table, column in (("users", "user_id"), ("wallet", "wallet_id"), ("items", "item_id"),
+                          ("bookings", "booking_id"), ("transactions", "tx_id"), ("disputes", "dispute_id")):
+        conn.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{table}', '{column}'), "
+            f"COALESCE((SELECT MAX({column}) FROM {table}), 0) + 1, false)"
+        ))
+
+
+def seed_database(engine, users: int = 200, items: int = 1000, bookings: int = 5000,
+                  dispute_rate: float = 0.05, seed: int = 42) -> SeedResult:
+    """Insert a consistent data set and return the IDs scenarios draw from"""
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    today = date.today()
+    password_hash = hash_password(BENCH_PASSWORD)  # One argon2 hash shared by every user
+    result = SeedResult()
+
+    # Users: one admin, ~30% lenders, the rest borrowers
+    user_rows = []
+    for user_id in range(1, users + 1):
+        if user_id == 1:
+            role = RoleEnum.ADMIN
+            result.admin_id = user_id
+        elif rng.random() < 0.3:
+            role = RoleEnum.LENDER
+            result.lender_ids.append(user_id)
+        else:
+            role = RoleEnum.BORROWER
+            result.borrower_ids.append(user_id)
+        user_rows.append({
+            "user_id": user_id, "full_name": f"Bench User {user_id}", "email": bench_email(user_id),
+            "password_hash": password_hash, "phone": f"+92300{user_id:07d}", "address": f"Street {user_id % 50}",
+            "role": role, "created_at": now - timedelta(days=rng.randint(0, 365)),
+        })
+    wallet_rows = [
+        {"wallet_id": user_id, "user_id": user_id, "balance": Decimal("500000.00"), "created_at": now}
+        for user_id in range(1, users + 1)
+    ]
+
+    # Items
+    item_rows = []
+    item_lender = {}
+    for item_id in range(1, items + 1):
+        lender_id = rng.choice(result.lender_ids)
+        item_lender[item_id] = lender_id
+        min_days = rng.randint(1, 3)
+        item_rows.append({
+            "item_id": item_id, "lender_id": lender_id, "title": f"Bench item {item_id}",
+            "description": "Seeded by the load test", "condition": rng.choice(["New", "Good", "Used"]),
+            "estimated_price": Decimal(rng.randint(1000, 50000)), "min_days": min_days,
+            "max_days": min_days + rng.randint(3, 20), "daily_deposit": Decimal(rng.randint(50, 500)),
+            "images": [f"https://example.com/items/{item_id}.png"], "location": rng.choice(["Lahore", "Karachi", "Islamabad"]),
+            "is_active": rng.random() > 0.05, "status": ItemStatusEnum.AVAILABLE, "created_at": now - timedelta(days=rng.randint(0, 365)),
+        })
+    result.item_ids = [row["item_id"] for row in item_rows]
+
+    # Bookings, their transactions and disputes
+    statuses = list(BOOKING_STATUS_WEIGHTS)
+    weights = list(BOOKING_STATUS_WEIGHTS.values())
+    booking_rows, tx_rows, dispute_rows = [], [], []
+    for booking_id in range(1, bookings + 1):
+        item = item_rows[rng.randrange(len(item_rows))]
+        status = rng.choices(statuses, weights)[0]
+        days = rng.randint(item["min_days"], item["max_days"])
+        start = today + timedelta(days=rng.randint(-90, 30))
+        deposit = item["daily_deposit"] * days
+        borrower_id = rng.choice(result.borrower_ids)
+        created_at = now - timedelta(days=rng.randint(0, 120), minutes=rng.randint(0, 1440))
+        booking_rows.append({
+            "booking_id": booking_id, "item_id": item["item_id"], "borrower_id": borrower_id,
+            "lender_id": item["lender_id"], "start_date": start, "end_date": start + timedelta(days=days),
+            "total_deposit": deposit, "status": status, "reason": "Load test", "created_at": created_at,
+        })
+        if status in ACTIVE_STATUSES:
+            item["status"] = ItemStatusEnum.RENTED
+        if status in PAID_STATUSES:
+            tx_rows.append({"user_id": borrower_id, "wallet_id": borrower_id, "booking_id": booking_id,
+                            "amount": deposit, "tx_type": TransactionTypeEnum.DEPOSIT,
+                            "description": f"Deposit locked for item '{item['title']}'", "created_at": created_at})
+            tx_rows.append({"user_id": item["lender_id"], "wallet_id": item["lender_id"], "booking_id": booking_id,
+                            "amount": deposit, "tx_type": TransactionTypeEnum.EARNING,
+                            "description": f"Earning from renting '{item['title']}'", "created_at": created_at})
+            if rng.random() < dispute_rate:
+                dispute_status = rng.choice(list(DisputeStatusEnum))
+                dispute_rows.append({
+                    "booking_id": booking_id, "raised_by": rng.choice([borrower_id, item["lender_id"]]),
+                    "description": "Item returned damaged", "estimated_cost": Decimal(rng.randint(100, 5000)),
+                    "status": dispute_status, "created_at": created_at + timedelta(days=days),
+                    "resolved_at": None if dispute_status == DisputeStatusEnum.OPEN else created_at + timedelta(days=days + 3),
+                })
+                if dispute_status == DisputeStatusEnum.OPEN and status in ACTIVE_STATUSES:
+                    item["status"] = ItemStatusEnum.DISPUTE
+        if status == BookingStatusEnum.RETURNED:
+            tx_rows.append({"user_id": borrower_id, "wallet_id": borrower_id, "booking_id": None,
+                            "amount": deposit, "tx_type": TransactionTypeEnum.REFUND,
+                            "description": f"Deposit refund for item '{item['title']}'", "created_at": created_at})
+    for user_id in range(1, users + 1):
+        tx_rows.append({"user_id": user_id, "wallet_id": user_id, "booking_id": None,
+                        "amount": Decimal("500000.00"), "tx_type": TransactionTypeEnum.TOPUP,
+                        "description": "Wallet topup via credit_card", "created_at": now - timedelta(days=400)})
+    for tx_id, row in enumerate(tx_rows, start=1):
+        row["tx_id"] = tx_id
+    for dispute_id, row in enumerate(dispute_rows, start=1):
+        row["dispute_id"] = dispute_id
+
+    with engine.begin() as conn:
+        _insert(conn, User, user_rows)
+        _insert(conn, Wallet, wallet_rows)
+        _insert(conn, Item, item_rows)
+        _insert(conn, Booking, booking_rows)
+        _insert(conn, Transaction, tx_rows)
+        _insert(conn, Dispute, dispute_rows)
+        _reset_sequences(conn)
+
+    # Rows were inserted directly, so derive the denormalized counters once
+    from sqlalchemy.orm import Session
+    from app.services import lender_stats
+    with Session(engine) as session:
+        lender_stats.rebuild(session)
+
+    result.counts = {
+        "users": len(user_rows), "items": len(item_rows), "bookings": len(booking_rows),
+        "transactions": len(tx_rows), "disputes": len(dispute_rows),
+    }
+    return result
+
+
+def load_existing(engine) -> SeedResult:
+    """Rebuild a SeedResult from a database seeded earlier (--no-seed)"""
+    result = SeedResult()
+    with engine.connect() as conn:
+        for user_id, role in conn.execute(User.__table__.select().with_only_columns(User.user_id, User.role)):
+            if role == RoleEnum.ADMIN:
+                result.admin_id = user_id
+            elif role == RoleEnum.LENDER:
+                result.lender_ids.append(user_id)
+            else:
+                result.borrower_ids.append(user_id)
+        result.item_ids = [row[0] for row in conn.execute(Item.__table__.select().with_only_columns(Item.item_id))]
+    result.counts = {"users": 1 + len(result.lender_ids) + len(result.borrower_ids), "items": len(result.item_ids)}
+    return result
@@ -1,70 +1,221 @@
 """
 Main FastAPI Application
 Entry point for ShareIt backend API
+
+    uvicorn main:app                     # module-level app, single process (development)
+    uvicorn main:create_app --factory    # build a fresh app per worker
+    python serve.py                      # production: N preloaded workers (see serve.py)
+
+Importing main builds nothing: `main.app` is created on first access, so the
+factory form builds exactly one app.
 """
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
-from fastapi.staticfiles import StaticFiles
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from app.config.database import Base, engine
-from app.routes import auth, items, bookings, disputes, wallet
-from app.routes import uploads
-# Import all models to register them with SQLAlchemy
-from app.models import User, Wallet, Item, Booking, Transaction, Dispute
-
-# Create all database tables
-Base.metadata.create_all(bind=engine)
-
-# Create FastAPI app instance
-app = FastAPI(
-    title="ShareIt API",
-    description="Community-based borrow & lend system API",
-    version="1.0.0"
-)
-
-# ============ CORS Configuration ============
-# Allow frontend to communicate with backend
-# IMPORTANT: This must be added BEFORE route handlers
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # Allow all origins for development
-    allow_credentials=False,  # Set to False when using wildcard origin
-    allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
-    allow_headers=["*"],
-    expose_headers=["*"],
-)
-
-# ============ Route Registration ============
-app.include_router(auth.router)
-app.include_router(items.router)
-app.include_router(bookings.router)
-app.include_router(disputes.router)
-app.include_router(wallet.router)
-app.include_router(uploads.router)
-
-# ============ Health Check Routes ============
-
-@app.get("/")
-def read_root():
-    """Root endpoint - API status"""
-    return {"message": "ShareIt API is running ✓"}
-
-
-@app.get("/health")
-def health_check():
-    """Health check endpoint"""
-    return {"status": "healthy"}
-
-# ============ Static Files (Uploads) ============
-# Serve files saved by the uploads endpoint from /uploads/*
-try:
-    app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
-except Exception:
-    # Directory may not exist at import; uploads router ensures creation on first use
-    pass
+from fastapi.responses import JSONResponse, Response
+from fastapi.staticfiles import StaticFiles
+from sqlalchemy import text
+
+from app.config.logging_config import configure_logging, stop_logging
+from app.config.settings import get_settings
+
+# Schema changes are applied by `python manage.py migrate upgrade`, not at startup
+
+
+def warm_up_database(connections: int):
+    """Open pooled connections up front so the first requests don't pay for the TCP/auth handshake"""
+    from app.config.database import engine
+
+    opened = []
+    try:
+        for _ in range(connections):
+            conn = engine.connect()
+            opened.append(conn)
+            conn.execute(text("SELECT 1"))
+    finally:
+        for conn in opened:
+            conn.close()  # Back to the pool, still open
+
+
+def check_database():
+    """Round trip to the database through the pool"""
+    from app.config.database import engine
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Per-worker initialization and cleanup
+    On SIGTERM the server stops accepting connections and waits for in-flight
+    requests; the code after `yield` then runs and closes pooled connections.
+    """
+    settings = get_settings()
+    configure_logging()  # Starts this worker's log listener thread (a forked worker needs its own)
+    app.state.draining = False
+    if settings.db_warmup_connections > 0:
+        await run_in_threadpool(warm_up_database, settings.db_warmup_connections)
+    from app.services import outbox
+    from app.services import notifications
+    outbox.start_worker()  # Delivers side effects of booking events (one per worker process)
+    notifications.start_dispatcher()  # Sends the notifications those events queue
+    yield
+    app.state.draining = True
+    await outbox.stop_worker()
+    await notifications.stop_dispatcher()
+    from app.config.database import dispose_engines
+    from app.services.tracing import tracer
+    dispose_engines()
+    tracer.shutdown()
+    stop_logging()
+
+
+def create_app() -> FastAPI:
+    """
+    Build the FastAPI application
+    Routers and middleware are imported here rather than at module load.
+    """
+    from app.routes import auth, items, bookings, disputes, wallet, uploads, admin, dashboard
+    from app.middleware.etag import ETagMiddleware
+    from app.middleware.compression import CompressionMiddleware
+    from app.middleware.replica import ReadYourWritesMiddleware
+    from app.middleware.rate_limit import RateLimitMiddleware
+    from app.middleware.profiling import SQLProfilingMiddleware
+    from app.middleware.access_log import AccessLogMiddleware
+    from app.middleware.tracing import TracingMiddleware
+
+    settings = get_settings()
+    configure_logging()
+
+    # Opt-in orjson encoding for every response (FAST_JSON_RESPONSES=true, needs orjson)
+    if settings.fast_json_responses:
+        from fastapi.responses import ORJSONResponse
+        response_class = ORJSONResponse
+    else:
+        response_class = JSONResponse
+
+    # Create FastAPI app instance
+    app = FastAPI(
+        title="ShareIt API",
+        description="Community-based borrow & lend system API",
+        version="1.0.0",
+        default_response_class=response_class,
+        lifespan=lifespan,
+    )
+
+    # ============ SQL Profiling ============
+    # Innermost, so only time spent in the routes is attributed to them
+    app.add_middleware(SQLProfilingMiddleware)
+
+    # ============ Read-your-writes (replica routing) ============
+    app.add_middleware(ReadYourWritesMiddleware)
+
+    # ============ Conditional GET (ETag) ============
+    # Registered before CORS so CORS stays outermost and 304s get CORS headers too
+    app.add_middleware(ETagMiddleware)
+
+    # ============ Compression (gzip / brotli) ============
+    # Wraps the ETag middleware so validators are computed on the uncompressed body
+    app.add_middleware(CompressionMiddleware)
+
+    # ============ Rate Limiting ============
+    # Just inside CORS so 429 responses still carry CORS headers
+    app.add_middleware(RateLimitMiddleware)
+
+    # ============ CORS Configuration ============
+    # Allow frontend to communicate with backend
+    # IMPORTANT: This must be added BEFORE route handlers
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],  # Allow all origins for development
+        allow_credentials=False,  # Set to False when using wildcard origin
+        allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
+        allow_headers=["*"],
+        expose_headers=["*"],
+    )
+
+    # ============ Tracing ============
+    # Server span around everything except the access log, so spans from rate limiting,
+    # compression and the routes all share the request's trace
+    app.add_middleware(TracingMiddleware)
+
+    # ============ Access Log ============
+    # Outermost, so request IDs cover everything (429s and CORS preflights included)
+    # and latency is measured end to end
+    app.add_middleware(AccessLogMiddleware)
+
+    # ============ Route Registration ============
+    app.include_router(auth.router)
+    app.include_router(items.router)
+    app.include_router(bookings.router)
+    app.include_router(disputes.router)
+    app.include_router(wallet.router)
+    app.include_router(uploads.router)
+    app.include_router(admin.router)
+    app.include_router(dashboard.router)
+
+    # ============ Health Check Routes ============
+
+    @app.get("/")
+    def read_root():
+        """Root endpoint - API status"""
+        return {"message": "ShareIt API is running ✓"}
+
+    @app.get("/health")
+    def health_check():
+        """Health check endpoint (liveness - the process is up)"""
+        return {"status": "healthy"}
+
+    @app.get("/ready")
+    async def readiness_check(response: Response):
+        """
+        Readiness endpoint - 503 while shutting down, when the connection pool
+        is exhausted, or when the database can't be reached
+        """
+        from app.config.database import pool_status
+
+        if getattr(app.state, "draining", False):
+            response.status_code = 503
+            return {"status": "draining"}
+
+        pool = pool_status()
+        if not pool["available"]:
+            response.status_code = 503
+            return {"status": "pool exhausted", "pool": pool}
+
+        try:
+            await run_in_threadpool(check_database)
+        except Exception as e:
+            response.status_code = 503
+            return {"status": "database unavailable", "error": e.__class__.__name__, "pool": pool}
+
+        return {"status": "ready", "pool": pool}
+
+    # ============ Static Files (Uploads) ============
+    # Serve files saved by the uploads endpoint from /uploads/*
+    try:
+        app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
+    except Exception:
+        # Directory may not exist at import; uploads router ensures creation on first use
+        pass
+
+    return app
+
+
+def __getattr__(name: str):
+    """Build the module-level `app` on first access (uvicorn main:app, serve.py)"""
+    if name == "app":
+        app = globals()["app"] = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # ============ Run the app ============
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    uvicorn.run(create_app(), host="0.0.0.0", port=8000, access_log=False)
@@ -0,0 +1,140 @@
+"""
+Management CLI
+Operational commands that must not run inside the web workers.
+
+Usage (from backend/):
+    python manage.py migrate upgrade [--target 0002]
+    python manage.py migrate current
+    python manage.py migrate history
+    python manage.py stats rebuild [--lender-id 42]
+    python manage.py rankings rebuild [--window-days 30]
+    python manage.py outbox drain
+    python manage.py outbox status
+    python manage.py notifications dispatch
+    python manage.py notifications status
+"""
+
+import argparse
+import sys
+
+
+def cmd_migrate(args):
+    from app.config.database import engine
+    from app import migrations
+
+    if args.action == "upgrade":
+        applied = migrations.upgrade(engine, target=args.target)
+        print(f"Applied {len(applied)} migration(s)" if applied else "Database is up to date")
+    elif args.action == "current":
+        done = sorted(migrations.applied_revisions(engine))
+        print(done[-1] if done else "No migrations applied")
+        pending = migrations.pending_revisions(engine)
+        if pending:
+            print(f"Pending: {', '.join(pending)}")
+    elif args.action == "history":
+        done = migrations.applied_revisions(engine)
+        for migration in migrations.load_migrations():
+            marker = "x" if migration.revision in done else " "
+            print(f"[{marker}] {migration.revision}  {migration.description}")
+
+
+def cmd_stats(args):
+    from app.config.database import SessionLocal
+    from app.services import lender_stats
+
+    db = SessionLocal()
+    try:
+        written = lender_stats.rebuild(db, lender_id=args.lender_id)
+    finally:
+        db.close()
+    print(f"Rebuilt lender stats for {written} lender(s)")
+
+
+def cmd_rankings(args):
+    from app.config.database import SessionLocal
+    from app.services import recommendations
+
+    config = recommendations.RankingConfig.from_settings()
+    if args.window_days is not None:
+        config.window_days = args.window_days
+    db = SessionLocal()
+    try:
+        written = recommendations.rebuild(db, config)
+    finally:
+        db.close()
+    recommendations.publish()
+    print(f"Ranked {written['item_rankings']} item(s), "
+          f"wrote {written['item_recommendations']} recommendation(s)")
+
+
+def cmd_outbox(args):
+    from app.config.database import SessionLocal
+    from app.services import outbox
+
+    db = SessionLocal()
+    try:
+        if args.action == "drain":
+            totals = outbox.drain(db)
+            print(f"Delivered {totals['delivered']} event(s), {totals['retried']} to retry, "
+                  f"{totals['failed']} failed")
+        elif args.action == "status":
+            for name, value in outbox.backlog(db).items():
+                print(f"{name}: {value}")
+    finally:
+        db.close()
+
+
+def cmd_notifications(args):
+    from app.config.database import SessionLocal
+    from app.services import notifications
+
+    db = SessionLocal()
+    try:
+        if args.action == "dispatch":
+            totals = notifications.dispatch_due(db)
+            print(f"Sent {totals['messages']} message(s) covering {totals['notifications']} "
+                  f"notification(s), {totals['failed']} failed")
+        elif args.action == "status":
+            for name, value in notifications.queue_status(db).items():
+                print(f"{name}: {value}")
+    finally:
+        db.close()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="manage.py", description="ShareIt management commands")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    migrate = commands.add_parser("migrate", help="Apply or inspect schema migrations")
+    migrate.add_argument("action", choices=["upgrade", "current", "history"])
+    migrate.add_argument("--target", help="Stop after this revision (upgrade only)")
+    migrate.set_defaults(func=cmd_migrate)
+
+    stats = commands.add_parser("stats", help="Maintain denormalized lender statistics")
+    stats.add_argument("action", choices=["rebuild"])
+    stats.add_argument("--lender-id", type=int, help="Rebuild a single lender (default: all)")
+    stats.set_defaults(func=cmd_stats)
+
+    rankings = commands.add_parser("rankings", help="Precompute popular items and recommendations")
+    rankings.add_argument("action", choices=["rebuild"])
+    rankings.add_argument("--window-days", type=int, help="Popularity window (default: RANKINGS_WINDOW_DAYS)")
+    rankings.set_defaults(func=cmd_rankings)
+
+    outbox = commands.add_parser("outbox", help="Deliver or inspect outbox events")
+    outbox.add_argument("action", choices=["drain", "status"])
+    outbox.set_defaults(func=cmd_outbox)
+
+    notifications = commands.add_parser("notifications", help="Send due notifications or inspect the queue")
+    notifications.add_argument("action", choices=["dispatch", "status"])
+    notifications.set_defaults(func=cmd_notifications)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
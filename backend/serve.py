@@ -0,0 +1,91 @@
+"""
+Production Server
+Runs the app under gunicorn with uvicorn workers:
+
+- WEB_WORKERS workers (default: one per CPU core)
+- the app is imported once in the master (preload) and forked, so workers
+  start without re-importing everything
+- each forked worker drops the pool inherited from the master, so no
+  database socket is ever shared between processes, and starts a fresh
+  version store; with several workers, counter-based ETags need
+  VERSION_STORE_BACKEND=redis (the memory store falls back to body hashes)
+- with read replicas and several workers, REPLICA_STICKY_BACKEND=redis is
+  required so read-your-writes holds whichever worker serves the next read
+- SIGTERM: workers stop accepting connections, finish in-flight requests
+  within WEB_GRACEFUL_TIMEOUT, then the FastAPI lifespan closes the pool
+
+Liveness: GET /health    Readiness: GET /ready
+
+Usage (from backend/):
+    python serve.py
+"""
+
+import logging
+import os
+
+from gunicorn.app.base import BaseApplication
+
+from app.config.settings import get_settings
+
+
+def post_fork(server, worker):
+    """
+    Discard pooled connections copied from the master without closing the
+    master's sockets, and set up the worker's version store
+    """
+    from app.config.database import dispose_engines
+    from app.services.versioning import configure_worker
+    dispose_engines(close=False)
+    configure_worker(server.cfg.workers)
+
+
+def worker_count(configured: int) -> int:
+    return configured if configured > 0 else (os.cpu_count() or 1)
+
+
+class ShareItServer(BaseApplication):
+    """Gunicorn application configured from Settings instead of a config file"""
+
+    def __init__(self, options: dict):
+        self.options = options
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        from main import app
+        return app
+
+
+def main():
+    settings = get_settings()
+    workers = worker_count(settings.web_workers)
+    if (workers > 1 and settings.database_replica_urls.strip()
+            and settings.replica_sticky_backend.lower() != "redis"):
+        # Read-your-writes would only hold when the next request hits the same worker
+        raise SystemExit(
+            f"DATABASE_REPLICA_URLS with {workers} workers needs REPLICA_STICKY_BACKEND=redis "
+            "(or WEB_WORKERS=1)"
+        )
+    if workers > 1 and settings.version_store_backend.lower() != "redis":
+        logging.getLogger("shareit.serve").warning(
+            "%s workers with VERSION_STORE_BACKEND=memory: versioned ETags fall back to body hashes "
+            "(set VERSION_STORE_BACKEND=redis to keep them)", workers
+        )
+    options = {
+        "bind": settings.web_bind,
+        "workers": workers,
+        "worker_class": "uvicorn.workers.UvicornWorker",
+        "preload_app": True,
+        "post_fork": post_fork,
+        "timeout": settings.web_timeout,
+        "graceful_timeout": settings.web_graceful_timeout,
+        "keepalive": settings.web_keepalive,
+    }
+    ShareItServer(options).run()
+
+
+if __name__ == "__main__":
+    main()
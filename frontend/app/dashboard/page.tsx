@@ -9,8 +9,7 @@ import ProfileDropdown from "../components/ProfileDropdown";
 interface Item {
   item_id: number;
   title: string;
-  description?: string;
-  images?: string[];
+  image?: string | null;
   daily_deposit: number;
   is_active: boolean;
 }
@@ -18,16 +17,17 @@ interface Item {
 interface Booking {
   booking_id: number;
   item_id: number;
-  borrower_id: number;
-  lender_id: number;
+  counterpart_id: number;
+  counterpart_name?: string | null;
   start_date: string;
   end_date: string;
   total_deposit: number;
   status: string;
-  item_title?: string;
-  borrower_name?: string;
+  item_title?: string | null;
 }
 
+type Section = "wallet" | "items" | "pending" | "rentals" | "lended";
+
 export default function Dashboard() {
   const { user, token, isLoggedIn, isLoading } = useAuth();
   const router = useRouter();
@@ -45,27 +45,25 @@ export default function Dashboard() {
     }
   }, [isLoading, isLoggedIn, router]);
 
+  // One request for everything; after an action only the affected sections are refetched
+  const refresh = async (sections?: Section[]) => {
+    if (!token) return;
+    const query = sections ? `?sections=${sections.join(",")}` : "";
+    const res = await fetch(`http://localhost:8000/dashboard${query}`, { headers: { Authorization: `Bearer ${token}` } });
+    if (!res.ok) return;
+    const data = await res.json();
+    if (data.items) setMyItems(data.items);
+    if (data.pending_requests) setPendingBookings(data.pending_requests);
+    if (data.rentals) setMyRentals(data.rentals);
+    if (data.lended) setMyLended(data.lended);
+    if (data.wallet_balance !== null && data.wallet_balance !== undefined) setWalletBalance(Number(data.wallet_balance));
+  };
+
   useEffect(() => {
     const load = async () => {
       if (!token || !user?.id) return;
       try {
-        const [itemsRes, pendRes, allBookingsRes, walletRes] = await Promise.all([
-          fetch(`http://localhost:8000/items/lender/${user.id}`),
-          fetch("http://localhost:8000/bookings/pending", { headers: { Authorization: `Bearer ${token}` } }),
-          fetch("http://localhost:8000/bookings", { headers: { Authorization: `Bearer ${token}` } }),
-          fetch("http://localhost:8000/wallet/balance", { headers: { Authorization: `Bearer ${token}` } }),
-        ]);
-        if (itemsRes.ok) setMyItems(await itemsRes.json());
-        if (pendRes.ok) setPendingBookings(await pendRes.json());
-        if (allBookingsRes.ok) {
-          const all = await allBookingsRes.json();
-          setMyRentals(all.filter((b: Booking) => b.borrower_id === user.id && (b.status?.toUpperCase() === "ACCEPTED" || b.status?.toUpperCase() === "RETURN_PENDING")));
-          setMyLended(all.filter((b: Booking) => b.lender_id === user.id && (b.status?.toUpperCase() === "ACCEPTED" || b.status?.toUpperCase() === "RETURN_PENDING")));
-        }
-        if (walletRes.ok) {
-          const w = await walletRes.json();
-          setWalletBalance(Number(w.balance));
-        }
+        await refresh();
       } catch (e) {
         console.error("Error loading dashboard data", e);
       } finally {
@@ -238,9 +236,9 @@ export default function Dashboard() {
                   {myItems.map((it) => (
                     <div key={it.item_id} className="border border-primary-surface-light/30 rounded-xl overflow-hidden">
                       <div className="h-32 bg-primary-surface-light/10 flex items-center justify-center">
-                        {it.images && it.images.length ? (
+                        {it.image ? (
                           // eslint-disable-next-line @next/next/no-img-element
-                          <img src={it.images[0]} alt={it.title} className="h-full w-full object-cover" />
+                          <img src={it.image} alt={it.title} className="h-full w-full object-cover" />
                         ) : (
                           <span className="text-4xl">📦</span>
                         )}
@@ -271,7 +269,7 @@ export default function Dashboard() {
                       <div className="flex items-center justify-between mb-3">
                         <div>
                           <div className="text-white font-semibold">{b.item_title || b.item_id}</div>
-                          <div className="text-muted text-sm">Lender: {b.borrower_name || b.borrower_id}</div>
+                          <div className="text-muted text-sm">Lender: {b.counterpart_name || b.counterpart_id}</div>
                           <div className="text-muted text-sm">Total Deposit: PKR {Number(b.total_deposit)}</div>
                         </div>
                         <div className="text-xs px-2 py-1 rounded-full bg-primary-400/20 text-primary-400 whitespace-nowrap">
@@ -289,11 +287,7 @@ export default function Dashboard() {
                               });
                               if (res.ok) {
                                 alert("Return request sent to lender!");
-                                const all = await fetch("http://localhost:8000/bookings", { headers: { Authorization: `Bearer ${token}` } });
-                                if (all.ok) {
-                                  const data = await all.json();
-                                  setMyRentals(data.filter((bb: Booking) => bb.borrower_id === user!.id && (bb.status?.toUpperCase() === "ACCEPTED" || bb.status?.toUpperCase() === "RETURN_PENDING")));
-                                }
+                                await refresh(["rentals"]);
                               } else {
                                 const data = await res.json();
                                 alert(`Failed: ${data.detail || "Unknown error"}`);
@@ -346,7 +340,7 @@ export default function Dashboard() {
                     <div key={b.booking_id} className="border border-primary-surface-light/30 rounded-xl p-4 flex items-center justify-between">
                       <div>
                         <div className="text-white font-semibold">{b.item_title}</div>
-                        <div className="text-muted text-sm">Borrower: {b.borrower_name || b.borrower_id}</div>
+                        <div className="text-muted text-sm">Borrower: {b.counterpart_name || b.counterpart_id}</div>
                         <div className="text-muted text-sm">Requested deposit: PKR {Number(b.total_deposit)}</div>
                       </div>
                       <div className="flex gap-2">
@@ -359,13 +353,7 @@ export default function Dashboard() {
                             });
                             if (res.ok) {
                               alert("Booking accepted.");
-                              const pend = await fetch("http://localhost:8000/bookings/pending", { headers: { Authorization: `Bearer ${token}` } });
-                              if (pend.ok) setPendingBookings(await pend.json());
-                              const all = await fetch("http://localhost:8000/bookings", { headers: { Authorization: `Bearer ${token}` } });
-                              if (all.ok) {
-                                const data = await all.json();
-                                setMyLended(data.filter((bb: Booking) => bb.lender_id === user!.id && bb.status === "accepted"));
-                              }
+                              await refresh(["pending", "lended", "wallet"]);
                             } else {
                               const txt = await res.text();
                               alert(`Failed to accept: ${txt}`);
@@ -384,8 +372,7 @@ export default function Dashboard() {
                             });
                             if (res.ok) {
                               alert("Booking rejected.");
-                              const pend = await fetch("http://localhost:8000/bookings/pending", { headers: { Authorization: `Bearer ${token}` } });
-                              if (pend.ok) setPendingBookings(await pend.json());
+                              await refresh(["pending"]);
                             } else {
                               const txt = await res.text();
                               alert(`Failed to reject: ${txt}`);
@@ -417,7 +404,7 @@ export default function Dashboard() {
                       <div className="flex items-center justify-between mb-3">
                         <div>
                           <div className="text-white font-semibold">{b.item_title || b.item_id}</div>
-                          <div className="text-muted text-sm">Borrower: {b.borrower_name || b.borrower_id}</div>
+                          <div className="text-muted text-sm">Borrower: {b.counterpart_name || b.counterpart_id}</div>
                           <div className="text-muted text-sm">Days left: {daysLeft(b)}</div>
                         </div>
                         <div className="text-xs px-2 py-1 rounded-full bg-primary-400/20 text-primary-400 whitespace-nowrap">
@@ -435,11 +422,7 @@ export default function Dashboard() {
                               });
                               if (res.ok) {
                                 alert("Return accepted! Deposit refunded to borrower.");
-                                const all = await fetch("http://localhost:8000/bookings", { headers: { Authorization: `Bearer ${token}` } });
-                                if (all.ok) {
-                                  const data = await all.json();
-                                  setMyLended(data.filter((bb: Booking) => bb.lender_id === user!.id && (bb.status?.toUpperCase() === "ACCEPTED" || bb.status?.toUpperCase() === "RETURN_PENDING")));
-                                }
+                                await refresh(["lended", "items", "wallet"]);
                               } else {
                                 const data = await res.json();
                                 alert(`Failed: ${data.detail || "Unknown error"}`);